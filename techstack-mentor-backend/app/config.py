@@ -10,28 +10,139 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free pooled connection
+    db_pool_recycle: int = 1800  # Recycle connections older than this (seconds)
 
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_password: str = ""
     redis_db: int = 0
+    redis_max_connections: int = 50  # Shared async connection pool size per process
+    redis_pool_timeout: float = 5.0  # Seconds to wait for a free pooled connection
+    redis_socket_timeout: float = 5.0
+    redis_socket_connect_timeout: float = 5.0
+    redis_health_check_interval: int = 30
 
     # App Settings
     session_ttl: int = 1800  # 30 minutes
     max_questions_per_interview: int = 5
+    transcription_wait_timeout: float = 30.0  # Max seconds /end waits for background transcriptions
+    session_events_backend: str = "local"  # "local" (single process) or "redis" (pub/sub across workers)
     backend_port: int = 8000
+    web_concurrency: int = 1  # API worker processes (uvicorn reads it too); >1 with in-API consumers needs redis events
     frontend_url: str = "http://localhost:5173"
     environment: str = "development"
 
+    # LLM Settings
+    llm_timeout_seconds: float = 60.0  # Per-call timeout for async LLM requests
+    llm_structured_output: bool = True  # Constrain JSON replies with a response_format schema (always validated)
+    incremental_evaluation_enabled: bool = True  # Score each answer in the background; /end only aggregates
+    evaluation_transcript_token_budget: int = 6000  # Max Q&A tokens in the evaluation prompt; long answers trimmed
+    evaluation_answer_min_tokens: int = 150  # Answers are never trimmed below this
+    llm_log_token_usage: bool = True  # Log prompt section sizes and per-call token usage
+
+    # LLM Response Cache
+    llm_cache_enabled: bool = True  # Cache follow-up question responses by prompt
+    llm_cache_ttl: int = 60 * 60 * 24  # Seconds a cached response stays valid
+    llm_cache_max_entries: int = 1000  # Per call site; least recently used entries are evicted
+    llm_cache_semantic_enabled: bool = False  # Also match near-identical prompts by embedding similarity
+    llm_cache_similarity_threshold: float = 0.95  # Minimum cosine similarity for a semantic hit
+    llm_cache_embedding_model: str = "text-embedding-3-small"
+    llm_cache_embedding_dimensions: int = 256  # Small vectors keep the similarity scan cheap
+    llm_cache_semantic_candidates: int = 100  # Most recently used entries compared on a semantic lookup
+
+    # LLM Router
+    llm_default_chain: str = "openai:gpt-4o-mini"  # provider:model list (openai, anthropic, fake), tried in order
+    llm_questions_chain: str = ""  # Chain for question generation (empty = default chain)
+    llm_followup_chain: str = ""  # Chain for follow-up questions (empty = default chain)
+    llm_evaluation_chain: str = ""  # Chain for answer and interview evaluation (empty = default chain)
+    llm_temperature: float = 0.7
+    llm_router_window: int = 200  # Recent calls per model used for p50/p95 latency and error rate
+    llm_router_max_sample_age: int = 300  # Seconds before a sample stops counting, so unhealthy models get retried
+    llm_router_min_samples: int = 20  # Calls needed before latency failover and health checks apply
+    llm_router_max_error_rate: float = 0.5  # Models above this error rate are tried last
+    llm_failover_p95_multiplier: float = 2.0  # Fail over once a call runs this many times the model's p95
+    llm_failover_min_seconds: float = 10.0  # Never fail over for slowness sooner than this
+    llm_fake_latency_ms: int = 0  # Simulated latency of the fake provider
+    llm_fake_error_rate: float = 0.0  # Simulated failure rate of the fake provider
+
+    # Hedged Requests
+    llm_hedging_enabled: bool = False  # Send a second identical LLM request when the first is unusually slow
+    transcription_hedging_enabled: bool = False  # Same for Whisper transcription requests
+    hedge_percentile: float = 95.0  # Hedge once a request runs longer than this percentile of recent latencies
+    hedge_min_delay_seconds: float = 1.0  # Never hedge sooner than this
+    hedge_min_samples: int = 20  # Latencies needed before hedging starts
+    hedge_window: int = 200  # Recent latencies kept per kind of call
+    hedge_max_sample_age: int = 600  # Seconds before a latency sample stops counting
+    hedge_budget_per_minute: int = 30  # Max hedge requests per minute per process (LLM and Whisper combined)
+
+    # OpenAI Rate Limiting
+    openai_governor_backend: str = "local"  # "local" (quotas per process) or "redis" (quotas shared by all workers)
+    openai_chat_rpm: int = 500  # Chat completion requests per minute (0 = no rate limit)
+    openai_chat_max_concurrency: int = 20  # Max in-flight chat requests
+    openai_tts_rpm: int = 500  # TTS requests per minute (concurrency: tts_max_concurrency)
+    openai_whisper_rpm: int = 500  # Whisper requests per minute
+    openai_whisper_max_concurrency: int = 10  # Max in-flight Whisper requests
+    openai_embeddings_rpm: int = 500  # Embedding requests per minute (semantic LLM cache)
+    openai_embeddings_max_concurrency: int = 10  # Max in-flight embedding requests
+    openai_rate_limit_burst: int = 10  # Requests allowed back to back before the per-minute rate applies
+    openai_max_retries: int = 3  # Retries after 429, 5xx and connection errors
+    openai_retry_base_seconds: float = 1.0  # Backoff base when the response has no Retry-After
+    openai_retry_max_seconds: float = 30.0  # Longest wait before a retry; a longer Retry-After fails the call
+    openai_governor_lease_seconds: int = 180  # Redis backend: in-flight slots of crashed workers free up after this
+
+    # Question Bank
+    question_bank_enabled: bool = True  # Draw questions from a pre-generated pool instead of calling the LLM on /start
+    question_bank_target_size: int = 60  # Questions to keep per tech stack
+    question_bank_min_size: int = 20  # Refill in the background below this many
+    question_bank_batch_size: int = 10  # Questions generated per LLM call when refilling
+    question_bank_seen_ttl: int = 60 * 60 * 24 * 90  # How long a user's asked questions are remembered (seconds)
+
     # Audio Settings
     audio_recordings_dir: str = "audio_files/recordings"
     audio_responses_dir: str = "audio_files/responses"
     max_audio_file_size_mb: int = 10  # 10 MB
+    audio_cache_max_age: int = 60 * 60 * 24 * 365  # Browser cache lifetime for content-addressed audio (seconds)
+    audio_upload_chunk_size: int = 64 * 1024  # Bytes read per chunk when copying uploads to disk
     supported_audio_formats: list = [".mp3", ".wav", ".webm", ".m4a", ".ogg"]
     openai_tts_model: str = "tts-1"  # options: tts-1, tts-1-hd
     openai_tts_voice: str = "alloy"  # options: alloy, echo, fable, onyx, nova, shimmer
     openai_whisper_model: str = "whisper-1"
+    audio_preprocess_enabled: bool = True  # Trim silence, downmix and compress recordings before Whisper
+    audio_preprocess_workers: int = 2  # Processes in the preprocessing pool
+    audio_preprocess_sample_rate: int = 16000  # Whisper works at 16kHz mono
+    audio_preprocess_format: str = "ogg"  # Container for preprocessed audio (must be accepted by Whisper)
+    audio_preprocess_codec: str = "libopus"  # ffmpeg codec; empty for the format's default
+    audio_preprocess_bitrate: str = "24k"
+    audio_silence_threshold_db: float = -45.0  # dBFS below which audio counts as silence
+    audio_silence_padding_ms: int = 200  # Silence kept around speech after trimming
+    transcription_chunking_enabled: bool = True  # Split long answers at silences and transcribe segments in parallel
+    transcription_segment_seconds: float = 30.0  # Target segment length; segments are cut at the nearest pause
+    transcription_min_silence_ms: int = 500  # Shortest pause treated as a segment boundary
+    transcription_max_parallel_segments: int = 4  # Max concurrent Whisper calls per recording
+    transcription_workers_in_api: int = 2  # Transcription consumers in each API process (0 = dedicated workers only)
+    transcription_worker_concurrency: int = 4  # Consumers per dedicated worker process (python -m app.worker)
+    transcription_job_max_attempts: int = 4  # Attempts per transcription job before the answer is given up on
+    evaluation_workers_in_api: int = 2  # Answer evaluation consumers in each API process (0 = dedicated workers only)
+    evaluation_worker_concurrency: int = 4  # Evaluation consumers per dedicated worker process
+    evaluation_job_max_attempts: int = 3  # Attempts per evaluation job before /end scores the answer itself
+    transcription_job_retry_base_seconds: float = 2.0  # Backoff before the first retry; doubles per attempt
+    transcription_job_retry_max_seconds: float = 60.0
+    transcription_job_visibility_timeout: int = 120  # Seconds without a heartbeat before any job is taken over
+    audio_storage_quota_mb: int = 1024  # Disk quota for recordings + responses; LRU eviction above it
+    audio_file_ttl: int = 3600  # Delete per-session audio not accessed for this long (seconds)
+    audio_shared_file_ttl: int = 60 * 60 * 24 * 7  # Same, for shared cached TTS audio
+    audio_gc_interval_seconds: int = 60
+    audio_gc_batch_size: int = 200  # Max files deleted per GC pass
+    audio_gc_min_age_seconds: int = 300  # Files younger than this are never evicted for quota
+    audio_temp_file_grace_seconds: int = 3600  # Leftover temp (dot) files older than this are deleted by GC
+    tts_max_concurrency: int = 5  # Max in-flight TTS requests (per process, or in total with the redis governor)
+    tts_cache_enabled: bool = True  # Store TTS audio once per (text, voice, model) and share it across sessions
+    tts_stream_chunk_size: int = 4096  # Bytes per chunk when streaming TTS to the client
+    stream_question_audio: bool = True  # Return after question 1's TTS, synthesize the rest in background
 
     @property
     def audio_recordings_path(self) -> Path:
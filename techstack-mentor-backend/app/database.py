@@ -1,19 +1,39 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
+pool_options = dict(
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle
 )
 
+
+def get_async_database_url(database_url: str) -> str:
+    """Swap a sync PostgreSQL driver (psycopg2) for asyncpg"""
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+# Sync engine, kept for scripts and migrations
+engine = create_engine(settings.database_url, **pool_options)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API so queries never block the event loop
+async_engine = create_async_engine(get_async_database_url(settings.database_url), **pool_options)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -25,8 +45,14 @@ def get_db():
         db.close()
 
 
-def init_db():
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def init_db():
     """Initialize database tables"""
     import app.models.user_results
     import app.models.user_suggestions
-    Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
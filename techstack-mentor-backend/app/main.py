@@ -3,7 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import get_settings
-from app.database import init_db
+from app.database import init_db, async_engine
+from app.utils.cache_manager import cache_manager
+from app.utils.question_bank import question_bank
+from app.utils.audio_storage import audio_storage
+from app.utils.audio_preprocessing import audio_preprocessor
+from app.utils.transcription_queue import transcription_queue, evaluation_queue
+from app.utils.session_events import session_events
+from app.utils.upload_limit import UploadSizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
 from app.routers import interview_router, results_router, suggestions_router
 
 settings = get_settings()
@@ -11,13 +18,37 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    in_api_consumers = settings.transcription_workers_in_api or (
+        settings.incremental_evaluation_enabled and settings.evaluation_workers_in_api
+    )
+    if settings.web_concurrency > 1 and in_api_consumers and settings.session_events_backend != "redis":
+        # A job finished by one process would never wake an /end request waiting in another
+        raise RuntimeError("Set SESSION_EVENTS_BACKEND=redis to run queue consumers in more than one API worker "
+                           "(WEB_CONCURRENCY > 1), so /end requests are woken when answers are processed")
+
     # Startup: Initialize database
     print("Initializing database...")
-    init_db()
+    await init_db()
     print("Database initialized successfully!")
+    if settings.question_bank_enabled:
+        # Fill the question pools in the background; startup does not wait for the LLM
+        question_bank.warm()
+    audio_storage.start()
+    if settings.transcription_workers_in_api:
+        await transcription_queue.start(settings.transcription_workers_in_api)
+    if settings.incremental_evaluation_enabled and settings.evaluation_workers_in_api:
+        await evaluation_queue.start(settings.evaluation_workers_in_api)
     yield
     # Shutdown: cleanup if needed
     print("Shutting down...")
+    await question_bank.close()
+    await transcription_queue.stop()
+    await evaluation_queue.stop()
+    await session_events.close()
+    await audio_storage.stop()
+    audio_preprocessor.shutdown()
+    await cache_manager.close()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -27,7 +58,16 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS middleware - Must be added before routes
+# Reject oversize recordings before Starlette spools the multipart body.
+# Added before CORS so CORS wraps it and the 413 carries the CORS headers.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=["/api/interview/audio/upload"],
+    max_body_bytes=settings.max_audio_file_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES,
+    detail=f"Audio file too large. Maximum size: {settings.max_audio_file_size_mb}MB"
+)
+
+# CORS middleware - Must be added before routes (and after other middleware, so it is outermost)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins for development
@@ -67,5 +107,6 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=settings.backend_port,
+        workers=settings.web_concurrency,
         reload=True if settings.environment == "development" else False
     )
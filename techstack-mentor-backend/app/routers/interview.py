@@ -1,6 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from typing import Any, AsyncIterator, Dict, List, Optional
+from contextlib import aclosing
+import asyncio
+import json
 import uuid
 from pathlib import Path
 
@@ -13,9 +19,19 @@ from app.schemas.interview import (
     InterviewStatus
 )
 from app.utils.cache_manager import cache_manager
-from app.utils.llm_service import llm_service
-from app.utils.audio_service import audio_service
-from app.database import get_db
+from app.utils.llm_service import llm_service, LLMOutputError
+from app.utils.audio_service import audio_service, AudioFileTooLargeError
+from app.utils.audio_storage import audio_storage
+from app.utils.audio_serving import serve_audio_file
+from app.utils.session_events import session_events
+from app.utils.question_bank import question_bank
+from app.utils.llm_cache import llm_cache
+from app.utils.llm_router import llm_router
+from app.utils.hedging import hedge_budget, llm_hedger, transcription_hedger
+from app.utils.rate_limiter import openai_governor
+from app.utils.answer_processing import evaluate_answer_background, fail_transcription
+from app.utils.transcription_queue import transcription_queue, evaluation_queue
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.user_results import UserResult
 from app.models.user_suggestions import UserSuggestion
 from app.config import get_settings
@@ -23,38 +39,260 @@ from app.config import get_settings
 router = APIRouter(prefix="/api/interview", tags=["interview"])
 settings = get_settings()
 
+# Idle time after which the /end stream sends a comment so proxies keep it open
+SSE_KEEPALIVE_SECONDS = 15
+# Reconnect delay advertised to EventSource clients
+SSE_RETRY_MS = 5000
 
-async def transcribe_audio_background(file_path: str, session_id: str, answer_index: int):
+
+async def collect_answer_evaluations(session: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
     """
-    Background task to transcribe audio and store the answer.
-    This runs asynchronously without blocking the response.
-    Note: Index is already incremented before this task runs.
+    Per-answer evaluations for every answered question, in question order.
+    Each carries its "question_index", since unanswered questions are skipped.
+    Answers whose background evaluation is missing or failed are scored now,
+    concurrently. Returns None if any of those still fails.
     """
+    questions = session["questions"]
+    answers = session["answers"]
+    evaluations = session.get("answer_evaluations", [])
+
+    answered = [i for i in range(min(len(questions), len(answers))) if answers[i] is not None]
+    collected = {
+        i: evaluations[i] for i in answered
+        if i < len(evaluations) and evaluations[i] is not None and "error" not in evaluations[i]
+    }
+    missing = [i for i in answered if i not in collected]
+
+    if missing:
+        print(f"Evaluating {len(missing)} answers inline for session with incomplete background evaluation")
+        results = await asyncio.gather(
+            *[
+                llm_service.aevaluate_answer(
+                    tech_stack=session["tech_stack"],
+                    question=questions[i],
+                    answer=answers[i]
+                )
+                for i in missing
+            ],
+            return_exceptions=True
+        )
+        for i, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                print(f"Inline evaluation failed for answer {i}: {result}")
+                return None
+            collected[i] = result
+
+    return [{**collected[i], "question_index": i} for i in answered]
+
+
+async def generate_question_audio_background(session_id: str, questions: List[str], start_number: int = 2):
+    """
+    Background task to synthesize question audio from start_number onwards.
+    Each URL is written to the session as soon as its TTS finishes, so
+    /audio/upload can report ready/pending/failed without waiting.
+    Synthesis is streamed, so /audio/stream can play a question that is still
+    being generated from its first chunk.
+    """
+    async def generate(question_number: int, question: str):
+        audio_url = await audio_service.generate_question_audio(
+            question_text=audio_service.format_question_text(question_number, question),
+            session_id=session_id,
+            question_number=question_number,
+            stream=True
+        )
+        await cache_manager.set_question_audio(session_id, question_number - 1, audio_url)
+
+    await asyncio.gather(*[
+        generate(question_number, question)
+        for question_number, question in enumerate(questions, start=1)
+        if question_number >= start_number
+    ])
+    print(f"Background question audio complete for session {session_id}")
+
+
+async def get_saved_result(db: AsyncSession, session_id: str) -> Optional[EndInterviewResponse]:
+    """The response for an interview whose result is already stored, or None"""
+    result = (await db.execute(
+        select(UserResult).where(UserResult.session_id == session_id)
+    )).scalar_one_or_none()
+    if result is None:
+        return None
+
+    suggestion = (await db.execute(
+        select(UserSuggestion).where(
+            UserSuggestion.session_id == session_id
+        ).order_by(UserSuggestion.id).limit(1)
+    )).scalar_one_or_none()
+
+    return EndInterviewResponse(
+        session_id=session_id,
+        score=result.score,
+        feedback=result.feedback or "",
+        missed_topics=(suggestion.missed_topics or []) if suggestion else [],
+        improvement_areas=(suggestion.improvement_areas or "") if suggestion else "",
+        total_questions=result.total_questions,
+        created_at=result.created_at
+    )
+
+
+async def save_interview_result(db: AsyncSession, session_id: str, session: Dict[str, Any],
+                                evaluation: Dict[str, Any], total_questions: int) -> Optional[UserResult]:
+    """
+    Persist the interview result and the suggestions derived from it.
+    Returns None (and stores nothing) if the session already has a result,
+    e.g. from a concurrent /end request.
+    """
+    result = UserResult(
+        user_id=session["user_id"],
+        session_id=session_id,
+        tech_stack=session["tech_stack"],
+        score=evaluation["score"],
+        feedback=evaluation["feedback"],
+        total_questions=total_questions,
+        correct_answers=evaluation.get("correct_count", 0)
+    )
+    db.add(result)
+
+    # Save suggestions
+    suggestion = UserSuggestion(
+        user_id=session["user_id"],
+        session_id=session_id,
+        tech_stack=session["tech_stack"],
+        missed_topics=evaluation["missed_topics"],
+        improvement_areas=evaluation["improvement_areas"]
+    )
+    db.add(suggestion)
+
     try:
-        # Transcribe audio to text
-        transcribed_text = await audio_service.transcribe_audio(file_path)
+        # session_id is unique on user_results, so a second result for the session is rejected
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return None
+    await db.refresh(result)
+    return result
+
+
+async def store_end_response(db: AsyncSession, session_id: str, session: Dict[str, Any],
+                             evaluation: Dict[str, Any], total_questions: int) -> EndInterviewResponse:
+    """Save the result and build the response, or return the result another request already saved"""
+    result = await save_interview_result(db, session_id, session, evaluation, total_questions)
+    if result is None:
+        return await get_saved_result(db, session_id)
+    return build_end_response(session_id, evaluation, total_questions, result)
+
+
+def build_end_response(session_id: str, evaluation: Dict[str, Any], total_questions: int,
+                       result: UserResult) -> EndInterviewResponse:
+    return EndInterviewResponse(
+        session_id=session_id,
+        score=evaluation["score"],
+        feedback=evaluation["feedback"],
+        missed_topics=evaluation["missed_topics"],
+        improvement_areas=evaluation["improvement_areas"],
+        total_questions=total_questions,
+        created_at=result.created_at
+    )
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-        # Store the transcribed answer (without incrementing index, already done)
-        cache_manager.add_answer_no_increment(session_id, transcribed_text)
 
-        # Mark this transcription as complete
-        cache_manager.mark_transcription_complete(session_id, answer_index)
+async def end_interview_events(session_id: str, session: Dict[str, Any]) -> AsyncIterator[str]:
+    """Event stream behind /end/{session_id}/stream (see that endpoint for the event types)"""
+    yield f"retry: {SSE_RETRY_MS}\n\n"
+    async for message in evaluate_interview_events(session_id, session):
+        yield message
+    # Terminal event: without it EventSource reconnects once the response ends
+    yield format_sse("done", {})
 
-        print(f"Background transcription complete for session {session_id}, answer {answer_index}: {transcribed_text[:50]}...")
+
+async def evaluate_interview_events(session_id: str, session: Dict[str, Any]) -> AsyncIterator[str]:
+    """Progress, evaluation and result (or error) events; failures never escape as exceptions"""
+    incremental = settings.incremental_evaluation_enabled
+    try:
+        # A reconnecting client gets the stored result instead of a second evaluation
+        async with AsyncSessionLocal() as db:
+            saved = await get_saved_result(db, session_id)
+        if saved is not None:
+            yield format_sse("result", saved.model_dump(mode="json"))
+            return
+
+        # Report progress on every background notification until everything is ready
+        last_progress = None
+        sent_evaluations = set()
+        changes = session_events.changes(
+            session_id, settings.transcription_wait_timeout, heartbeat=SSE_KEEPALIVE_SECONDS
+        )
+        async with aclosing(changes):
+            async for _ in changes:
+                sent = False
+                progress = await cache_manager.get_transcription_progress(session_id)
+                if progress != last_progress:
+                    last_progress = progress
+                    sent = True
+                    yield format_sse("transcription", progress)
+
+                if incremental:
+                    session = await cache_manager.get_session(session_id) or session
+                    for i, answer_evaluation in enumerate(session["answer_evaluations"]):
+                        if answer_evaluation and "error" not in answer_evaluation and i not in sent_evaluations:
+                            sent_evaluations.add(i)
+                            sent = True
+                            yield format_sse("answer_evaluation", {"question_number": i + 1, **answer_evaluation})
+                    if await cache_manager.are_all_evaluations_complete(session_id):
+                        break
+                elif await cache_manager.are_all_transcriptions_complete(session_id):
+                    break
+
+                if not sent:
+                    yield ": keep-alive\n\n"
+
+        qa_pairs = await cache_manager.get_qa_pairs(session_id)
+        if not qa_pairs:
+            yield format_sse("error", {"status_code": 400, "detail": "No answers found in this session"})
+            return
+
+        evaluation = None
+        if incremental:
+            session = await cache_manager.get_session(session_id) or session
+            answer_evaluations = await collect_answer_evaluations(session)
+            if answer_evaluations:
+                evaluation = llm_service.aggregate_evaluations(answer_evaluations)
+                for field, value in evaluation.items():
+                    yield format_sse("evaluation", {"field": field, "value": value})
+
+        if evaluation is None:
+            evaluation = {}
+            async for field, value in llm_service.astream_evaluate_interview(session["tech_stack"], qa_pairs):
+                evaluation[field] = value
+                yield format_sse("evaluation", {"field": field, "value": value})
+
+        # The request's DB dependency is gone by the time a streamed body runs
+        async with AsyncSessionLocal() as db:
+            response = await store_end_response(db, session_id, session, evaluation, len(qa_pairs))
+
+        yield format_sse("result", response.model_dump(mode="json"))
+    except asyncio.TimeoutError:
+        yield format_sse("error", {"status_code": 504, "detail": "Timed out evaluating the interview"})
+    except LLMOutputError as e:
+        print(f"Streaming evaluation failed for session {session_id}: {e}")
+        yield format_sse("error", {"status_code": 502, "detail": "The evaluation model returned invalid output"})
     except Exception as e:
-        print(f"Background transcription failed for session {session_id}, answer {answer_index}: {str(e)}")
-        # Still mark as complete (but with empty/failed answer) to not block evaluation
-        cache_manager.mark_transcription_complete(session_id, answer_index)
+        print(f"Streaming evaluation failed for session {session_id}: {e}")
+        yield format_sse("error", {"status_code": 500, "detail": "Failed to evaluate the interview"})
 
 
 @router.post("/start", response_model=StartInterviewResponse)
-async def start_interview(request: StartInterviewRequest):
+async def start_interview(request: StartInterviewRequest, background_tasks: BackgroundTasks):
     """Start a new mock interview session with pre-generated questions and audio"""
     # Generate unique session ID
     session_id = str(uuid.uuid4())
 
     # Create session in cache
-    success = cache_manager.create_session(
+    success = await cache_manager.create_session(
         session_id=session_id,
         user_id=request.user_id,
         tech_stack=request.tech_stack.value
@@ -63,40 +301,50 @@ async def start_interview(request: StartInterviewRequest):
     if not success:
         raise HTTPException(status_code=500, detail="Failed to create interview session")
 
-    # Generate ALL questions upfront
-    questions = llm_service.generate_questions(
-        tech_stack=request.tech_stack.value,
-        num_questions=settings.max_questions_per_interview
-    )
+    # Get ALL questions upfront (from the question bank when enabled, so no LLM call is needed)
+    try:
+        if settings.question_bank_enabled:
+            questions = await question_bank.get_questions(
+                user_id=request.user_id,
+                tech_stack=request.tech_stack.value,
+                num_questions=settings.max_questions_per_interview
+            )
+        else:
+            questions = await llm_service.agenerate_questions(
+                tech_stack=request.tech_stack.value,
+                num_questions=settings.max_questions_per_interview
+            )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out generating questions")
+    except LLMOutputError as e:
+        print(f"Question generation failed: {e}")
+        raise HTTPException(status_code=502, detail="The question model returned invalid output")
 
     if not questions:
         raise HTTPException(status_code=500, detail="Failed to generate questions")
 
     # Store ALL questions in cache
     for question in questions:
-        cache_manager.add_question(session_id, question)
+        await cache_manager.add_question(session_id, question)
 
-    # Pre-generate TTS for ALL questions
-    audio_urls = []
-    for idx, question in enumerate(questions, start=1):
-        try:
-            # Create audio version of question
-            question_text = f"Question {idx}: {question}"
-            tts_audio = await audio_service.text_to_speech(question_text)
-            audio_file_path = await audio_service.save_ai_response_audio(
-                audio_data=tts_audio,
-                session_id=session_id,
-                question_number=idx
-            )
-            audio_url = audio_service.get_audio_url(audio_file_path)
-            audio_urls.append(audio_url)
-        except Exception as e:
-            print(f"TTS generation failed for question {idx}: {str(e)}")
-            # Add None to maintain index alignment
-            audio_urls.append(None)
+    if settings.stream_question_audio:
+        # Only question 1 is synthesized before responding; the rest stream in the background
+        first_audio_url = await audio_service.generate_question_audio(
+            question_text=audio_service.format_question_text(1, questions[0]),
+            session_id=session_id,
+            question_number=1
+        )
+        audio_urls = [first_audio_url] + [None] * (len(questions) - 1)
+        audio_status = ["ready" if first_audio_url else "failed"] + ["pending"] * (len(questions) - 1)
+        await cache_manager.set_audio_urls(session_id, audio_urls, audio_status)
+
+        background_tasks.add_task(generate_question_audio_background, session_id, questions)
+    else:
+        # Pre-generate TTS for ALL questions concurrently (order is preserved)
+        audio_urls = await audio_service.generate_questions_audio(questions, session_id)
 
-    # Store all audio URLs in cache
-    cache_manager.set_audio_urls(session_id, audio_urls)
+        # Store all audio URLs in cache
+        await cache_manager.set_audio_urls(session_id, audio_urls)
 
     # Prepare welcome message (audio-only, no text display needed)
     welcome_message = f"""Welcome to your {request.tech_stack.value} mock interview!
@@ -115,10 +363,10 @@ Listen to the first question and record your answer."""
 
 
 @router.post("/message", response_model=SendMessageResponse)
-async def send_message(request: SendMessageRequest):
+async def send_message(request: SendMessageRequest, background_tasks: BackgroundTasks):
     """Send a message (answer) and get the next question"""
     # Get session from cache
-    session = cache_manager.get_session(request.session_id)
+    session = await cache_manager.get_session(request.session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Interview session not found or expired")
@@ -127,14 +375,19 @@ async def send_message(request: SendMessageRequest):
         raise HTTPException(status_code=400, detail="Interview already completed")
 
     # Store user's answer
-    cache_manager.add_answer(request.session_id, request.user_message)
+    await cache_manager.add_answer(request.session_id, request.user_message)
+
+    if settings.incremental_evaluation_enabled:
+        background_tasks.add_task(
+            evaluate_answer_background, request.session_id, session["current_index"], request.user_message
+        )
 
-    current_count = cache_manager.get_current_question_count(request.session_id)
+    current_count = await cache_manager.get_current_question_count(request.session_id)
     total_questions = settings.max_questions_per_interview
 
     # Check if interview is complete
     if current_count >= total_questions:
-        cache_manager.mark_complete(request.session_id)
+        await cache_manager.mark_complete(request.session_id)
 
         return SendMessageResponse(
             ai_message="Thank you for completing the interview! Let me evaluate your responses...",
@@ -144,18 +397,22 @@ async def send_message(request: SendMessageRequest):
         )
 
     # Get Q&A pairs for context
-    qa_pairs = cache_manager.get_qa_pairs(request.session_id)
+    qa_pairs = await cache_manager.get_qa_pairs(request.session_id)
 
     # Generate next question
-    next_question = llm_service.get_next_question(
-        tech_stack=session["tech_stack"],
-        current_index=current_count,
-        total_questions=total_questions,
-        previous_qa=qa_pairs
-    )
+    try:
+        next_question = await llm_service.aget_next_question(
+            tech_stack=session["tech_stack"],
+            current_index=current_count,
+            total_questions=total_questions,
+            previous_qa=qa_pairs,
+            bypass_cache=request.bypass_cache
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out generating the next question")
 
     # Store next question
-    cache_manager.add_question(request.session_id, next_question)
+    await cache_manager.add_question(request.session_id, next_question)
 
     # Prepare response message
     response_message = f"""**Question {current_count + 1}:** {next_question}
@@ -171,90 +428,110 @@ Please type your answer below."""
 
 
 @router.post("/end/{session_id}", response_model=EndInterviewResponse)
-async def end_interview(session_id: str, db: Session = Depends(get_db)):
+async def end_interview(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """End the interview and get evaluation results"""
-    import asyncio
-
     # Get session from cache
-    session = cache_manager.get_session(session_id)
+    session = await cache_manager.get_session(session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Interview session not found")
 
-    # CRITICAL: Wait for all transcriptions to complete (max 30 seconds)
+    # A retried request gets the stored result instead of a second evaluation
+    saved = await get_saved_result(db, session_id)
+    if saved is not None:
+        return saved
+
+    # CRITICAL: Wait for all transcriptions (and, in incremental mode, the per-answer
+    # evaluations) to complete. The check re-runs only when a background task
+    # signals completion, so there is no polling.
     print(f"Waiting for transcriptions to complete for session {session_id}...")
-    max_wait_time = 30  # seconds
-    wait_interval = 0.5  # seconds
-    elapsed_time = 0
 
-    while not cache_manager.are_all_transcriptions_complete(session_id) and elapsed_time < max_wait_time:
-        progress = cache_manager.get_transcription_progress(session_id)
-        print(f"Transcription progress: {progress['completed']}/{progress['total']}")
-        await asyncio.sleep(wait_interval)
-        elapsed_time += wait_interval
+    def is_ready():
+        if settings.incremental_evaluation_enabled:
+            return cache_manager.are_all_evaluations_complete(session_id)
+        return cache_manager.are_all_transcriptions_complete(session_id)
+
+    all_complete = await session_events.wait_for(
+        session_id,
+        is_ready,
+        timeout=settings.transcription_wait_timeout
+    )
 
     # Check final status
-    if cache_manager.are_all_transcriptions_complete(session_id):
+    if all_complete:
         print(f"All transcriptions complete for session {session_id}")
     else:
-        progress = cache_manager.get_transcription_progress(session_id)
+        progress = await cache_manager.get_transcription_progress(session_id)
         print(f"WARNING: Timeout waiting for transcriptions. Progress: {progress['completed']}/{progress['total']}")
 
     # Get Q&A pairs
-    qa_pairs = cache_manager.get_qa_pairs(session_id)
+    qa_pairs = await cache_manager.get_qa_pairs(session_id)
 
     if not qa_pairs:
         raise HTTPException(status_code=400, detail="No answers found in this session")
 
-    # Evaluate using LLM
-    evaluation = llm_service.evaluate_interview(
-        tech_stack=session["tech_stack"],
-        qa_pairs=qa_pairs
-    )
+    try:
+        evaluation = None
+        if settings.incremental_evaluation_enabled:
+            # Answers were scored as they came in; only a cheap aggregation is left
+            session = await cache_manager.get_session(session_id) or session
+            answer_evaluations = await collect_answer_evaluations(session)
+            if answer_evaluations:
+                evaluation = llm_service.aggregate_evaluations(answer_evaluations)
+
+        if evaluation is None:
+            # Evaluate the whole transcript in one LLM call
+            evaluation = await llm_service.aevaluate_interview(
+                tech_stack=session["tech_stack"],
+                qa_pairs=qa_pairs
+            )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out evaluating the interview")
+    except LLMOutputError as e:
+        # Nothing is stored: a made-up default score would be worse than no result
+        print(f"Evaluation failed for session {session_id}: {e}")
+        raise HTTPException(status_code=502, detail="The evaluation model returned invalid output")
 
     # Save to database
-    result = UserResult(
-        user_id=session["user_id"],
-        session_id=session_id,
-        tech_stack=session["tech_stack"],
-        score=evaluation["score"],
-        feedback=evaluation["feedback"],
-        total_questions=len(qa_pairs),
-        correct_answers=evaluation.get("correct_count", 0)
-    )
-    db.add(result)
-
-    # Save suggestions
-    suggestion = UserSuggestion(
-        user_id=session["user_id"],
-        session_id=session_id,
-        tech_stack=session["tech_stack"],
-        missed_topics=evaluation["missed_topics"],
-        improvement_areas=evaluation["improvement_areas"]
-    )
-    db.add(suggestion)
-
-    db.commit()
-    db.refresh(result)
+    response = await store_end_response(db, session_id, session, evaluation, len(qa_pairs))
 
     # Clean up cache (optional - let TTL handle it)
     # cache_manager.delete_session(session_id)
 
-    return EndInterviewResponse(
-        session_id=session_id,
-        score=evaluation["score"],
-        feedback=evaluation["feedback"],
-        missed_topics=evaluation["missed_topics"],
-        improvement_areas=evaluation["improvement_areas"],
-        total_questions=len(qa_pairs),
-        created_at=result.created_at
+    return response
+
+
+@router.get("/end/{session_id}/stream")
+async def end_interview_stream(session_id: str):
+    """
+    End the interview and stream progress as Server-Sent Events.
+
+    Events: "transcription" ({completed, total}) whenever it changes,
+    "answer_evaluation" for each per-answer score as it is stored,
+    "evaluation" ({field, value}) for each evaluation field as soon as it is
+    generated, then "result" with the persisted EndInterviewResponse.
+    Failures are reported as an "error" event ({status_code, detail}).
+    The stream always ends with a "done" event; clients should close the
+    EventSource on it. A reconnect after the result was saved replays it
+    without evaluating again, and ": keep-alive" comments are sent while
+    waiting for background work.
+    """
+    session = await cache_manager.get_session(session_id)
+
+    if not session:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+
+    return StreamingResponse(
+        end_interview_events(session_id, session),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
 @router.get("/status/{session_id}", response_model=InterviewStatus)
 async def get_interview_status(session_id: str):
     """Get the current status of an interview session"""
-    session = cache_manager.get_session(session_id)
+    session = await cache_manager.get_session(session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Interview session not found")
@@ -266,14 +543,57 @@ async def get_interview_status(session_id: str):
         total_questions=settings.max_questions_per_interview,
         is_complete=session.get("is_complete", False),
         questions=session.get("questions", []),
-        answers=session.get("answers", [])
+        answers=session.get("answers", []),
+        audio_urls=session.get("audio_urls", []),
+        audio_status=session.get("audio_status", [])
     )
 
 
+@router.get("/llm/cache")
+async def get_llm_cache_stats():
+    """LLM response cache hit/miss metrics per call site"""
+    return llm_cache.get_stats()
+
+
+@router.get("/llm/router")
+async def get_llm_router_stats():
+    """Model chains per call type and rolling p50/p95 latency and error rate per model"""
+    return llm_router.get_stats()
+
+
+@router.get("/hedging")
+async def get_hedging_stats():
+    """Hedged request counters and current hedge delays for LLM and Whisper calls"""
+    return {
+        "budget_per_minute": hedge_budget.per_minute,
+        "budget_used": hedge_budget.used,
+        "llm": llm_hedger.get_stats(),
+        "transcription": transcription_hedger.get_stats()
+    }
+
+
+@router.get("/openai/limits")
+async def get_openai_limit_stats():
+    """OpenAI quotas, retries, 429s and queue times per endpoint (chat, tts, whisper)"""
+    return openai_governor.get_stats()
+
+
+@router.get("/transcription/queue")
+async def get_transcription_queue_stats():
+    """Transcription job queue depth, jobs in progress, delayed retries and failures"""
+    return await transcription_queue.get_stats()
+
+
+@router.get("/evaluation/queue")
+async def get_evaluation_queue_stats():
+    """Answer evaluation job queue depth, jobs in progress, delayed retries and failures"""
+    return await evaluation_queue.get_stats()
+
+
 @router.get("/health")
 async def health_check():
     """Check if interview service is healthy"""
-    redis_status = cache_manager.ping()
+    redis_status = await cache_manager.ping()
 
     return {
         "status": "healthy" if redis_status else "unhealthy",
@@ -283,17 +603,17 @@ async def health_check():
 
 @router.post("/audio/upload")
 async def upload_audio(
-    background_tasks: BackgroundTasks,
     session_id: str,
     audio_file: UploadFile = File(...)
 ):
     """
     FAST audio upload with immediate response.
-    Returns next pre-generated question instantly while transcribing in background.
+    Returns next pre-generated question instantly; the answer is transcribed by
+    the transcription queue workers.
     """
     try:
         # Validate session
-        session = cache_manager.get_session(session_id)
+        session = await cache_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Interview session not found or expired")
 
@@ -307,70 +627,70 @@ async def upload_audio(
                 detail=f"Unsupported audio format. Supported formats: {settings.supported_audio_formats}"
             )
 
-        # Read file content
-        file_content = await audio_file.read()
-
-        # Validate file size
-        if not audio_service.validate_audio_file_size(len(file_content)):
+        # Copy the upload to disk (no transcription yet); oversize bodies were already rejected by middleware
+        file_extension = Path(audio_file.filename).suffix
+        try:
+            saved_file_path = await audio_service.save_uploaded_stream(
+                upload_file=audio_file,
+                session_id=session_id,
+                extension=file_extension
+            )
+        except AudioFileTooLargeError:
             raise HTTPException(
                 status_code=400,
                 detail=f"Audio file too large. Maximum size: {settings.max_audio_file_size_mb}MB"
             )
 
-        # Save uploaded file IMMEDIATELY (no transcription yet)
-        file_extension = Path(audio_file.filename).suffix
-        saved_file_path = await audio_service.save_uploaded_file(
-            file_data=file_content,
-            session_id=session_id,
-            extension=file_extension
-        )
-
-        # Mark transcription as pending (before increment)
-        answer_index = session.get("current_index", 0)  # Get current index before increment
-        cache_manager.mark_transcription_pending(session_id)
-
-        # Increment index BEFORE returning next question
-        cache_manager.increment_index(session_id)
+        # Claim this question's answer slot: increments the index and marks the
+        # transcription pending in one atomic step
+        answer_index = await cache_manager.reserve_answer_slot(session_id)
+        if answer_index is None:
+            raise HTTPException(status_code=500, detail="Failed to update session")
 
-        # REFRESH session data after increment (get fresh data from Redis)
-        session = cache_manager.get_session(session_id)
-        if not session:
-            raise HTTPException(status_code=500, detail="Failed to refresh session")
+        # Queue the transcription (durable: survives restarts and is retried on failure)
+        try:
+            await transcription_queue.enqueue(saved_file_path, session_id, answer_index)
+        except Exception as e:
+            print(f"Failed to queue transcription for session {session_id}, answer {answer_index}: {e}")
+            # Release the slot so /end does not wait on a transcription that will never run
+            await fail_transcription(session_id, answer_index)
+            raise HTTPException(status_code=503, detail="Failed to queue transcription, please try again")
 
-        # Get CURRENT state after increment (now using fresh data)
-        current_index = session.get("current_index", 0)
+        current_index = answer_index + 1
         total_questions = settings.max_questions_per_interview
 
         # Check if interview is complete (all questions answered)
         if current_index >= total_questions:
-            cache_manager.mark_complete(session_id)
-
-            # Start background transcription for last answer
-            background_tasks.add_task(transcribe_audio_background, saved_file_path, session_id, answer_index)
+            await cache_manager.mark_complete(session_id)
 
             completion_message = "Thank you for completing the interview! Processing your final answer..."
 
             return {
                 "ai_message": completion_message,
                 "audio_url": None,  # No more questions
+                "audio_status": None,
                 "is_complete": True,
                 "question_number": current_index,
                 "total_questions": total_questions
             }
 
         # Get next question and audio from cache (INSTANT!)
-        next_q_data = cache_manager.get_next_question_data(session_id)
+        next_q_data = await cache_manager.get_next_question_data(session_id)
 
         if not next_q_data:
             raise HTTPException(status_code=500, detail="Failed to get next question")
 
-        # Start background transcription task (non-blocking)
-        background_tasks.add_task(transcribe_audio_background, saved_file_path, session_id, answer_index)
+        # Audio still being synthesized in the background: point the client at the
+        # streaming endpoint so playback starts with the first TTS chunk
+        audio_url = next_q_data["audio_url"]
+        if next_q_data["audio_status"] == "pending":
+            audio_url = f"/api/interview/audio/stream/{session_id}/{next_q_data['question_number']}"
 
-        # Return IMMEDIATELY with pre-generated question and audio
+        # Return IMMEDIATELY with pre-generated question and audio (audio may still be pending)
         return {
             "ai_message": f"Question {next_q_data['question_number']}: {next_q_data['question']}",
-            "audio_url": next_q_data["audio_url"],
+            "audio_url": audio_url,
+            "audio_status": next_q_data["audio_status"],
             "is_complete": False,
             "question_number": next_q_data["question_number"],
             "total_questions": total_questions
@@ -383,30 +703,69 @@ async def upload_audio(
 
 
 @router.get("/audio/recordings/{filename}")
-async def get_recording(filename: str):
-    """Serve user recording audio files"""
+async def get_recording(filename: str, request: Request):
+    """Serve user recording audio files (supports Range and conditional requests)"""
     file_path = Path(settings.audio_recordings_dir) / filename
 
-    if not file_path.exists():
+    if Path(filename).name != filename or not file_path.is_file():
         raise HTTPException(status_code=404, detail="Audio file not found")
 
-    return FileResponse(
-        path=file_path,
-        media_type="audio/webm",
-        filename=filename
-    )
+    audio_storage.touch(str(file_path))
+    return await serve_audio_file(request, file_path)
 
 
 @router.get("/audio/responses/{filename}")
-async def get_response_audio(filename: str):
-    """Serve AI response audio files"""
+async def get_response_audio(filename: str, request: Request):
+    """Serve AI response audio files (supports Range and conditional requests)"""
     file_path = Path(settings.audio_responses_dir) / filename
 
-    if not file_path.exists():
+    if Path(filename).name != filename or not file_path.is_file():
         raise HTTPException(status_code=404, detail="Audio file not found")
 
-    return FileResponse(
-        path=file_path,
+    audio_storage.touch(str(file_path))
+    return await serve_audio_file(request, file_path)
+
+
+@router.get("/audio/stream/{session_id}/{question_number}")
+async def stream_question_audio(session_id: str, question_number: int, request: Request):
+    """
+    Stream a question's audio while it is being synthesized.
+    Serves the stored file directly once it exists.
+    """
+    session = await cache_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Interview session not found or expired")
+
+    questions = session.get("questions", [])
+    if not 1 <= question_number <= len(questions):
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    question_text = audio_service.format_question_text(question_number, questions[question_number - 1])
+
+    if settings.tts_cache_enabled:
+        file_path = audio_service.get_tts_cache_path(audio_service.get_tts_cache_key(question_text))
+    else:
+        file_path = audio_service.get_question_audio_path(session_id, question_number)
+
+    # Another request is already synthesizing this audio without streaming it; wait for it
+    # instead of paying twice. A streamed synthesis (such as the background pre-generation)
+    # is followed from its first chunk by stream_speech_to_file below.
+    if (not file_path.exists() and audio_service.is_tts_in_flight(file_path)
+            and not audio_service.is_tts_streaming(file_path)):
+        await audio_service.synthesize_to_file(question_text, file_path)
+
+    if file_path.exists():
+        audio_storage.touch(str(file_path))
+        return await serve_audio_file(request, file_path)
+
+    return StreamingResponse(
+        audio_service.stream_speech_to_file(question_text, file_path),
         media_type="audio/mpeg",
-        filename=filename
+        headers={"Cache-Control": "no-store"}
     )
+
+
+@router.get("/audio/storage")
+async def get_audio_storage_stats():
+    """Get audio disk usage and garbage collection metrics"""
+    return await audio_storage.get_stats()
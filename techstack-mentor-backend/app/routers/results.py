@@ -1,22 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 
 from app.schemas.results import ResultResponse, ResultListResponse
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user_results import UserResult
 
 router = APIRouter(prefix="/api/results", tags=["results"])
 
 
 @router.get("/{user_id}", response_model=ResultListResponse)
-async def get_user_results(user_id: str, limit: int = 10, db: Session = Depends(get_db)):
+async def get_user_results(user_id: str, limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     """Get all results for a specific user"""
-    results = db.query(UserResult).filter(
-        UserResult.user_id == user_id
-    ).order_by(
-        desc(UserResult.created_at)
-    ).limit(limit).all()
+    results = (await db.execute(
+        select(UserResult).where(
+            UserResult.user_id == user_id
+        ).order_by(
+            desc(UserResult.created_at)
+        ).limit(limit)
+    )).scalars().all()
 
     return ResultListResponse(
         results=[ResultResponse.model_validate(r) for r in results],
@@ -25,11 +27,13 @@ async def get_user_results(user_id: str, limit: int = 10, db: Session = Depends(
 
 
 @router.get("/session/{session_id}", response_model=ResultResponse)
-async def get_session_result(session_id: str, db: Session = Depends(get_db)):
+async def get_session_result(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get result for a specific session"""
-    result = db.query(UserResult).filter(
-        UserResult.session_id == session_id
-    ).first()
+    result = (await db.execute(
+        select(UserResult).where(
+            UserResult.session_id == session_id
+        )
+    )).scalars().first()
 
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
@@ -38,13 +42,15 @@ async def get_session_result(session_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/latest/{user_id}", response_model=ResultResponse)
-async def get_latest_result(user_id: str, db: Session = Depends(get_db)):
+async def get_latest_result(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get the most recent result for a user"""
-    result = db.query(UserResult).filter(
-        UserResult.user_id == user_id
-    ).order_by(
-        desc(UserResult.created_at)
-    ).first()
+    result = (await db.execute(
+        select(UserResult).where(
+            UserResult.user_id == user_id
+        ).order_by(
+            desc(UserResult.created_at)
+        ).limit(1)
+    )).scalars().first()
 
     if not result:
         raise HTTPException(status_code=404, detail="No results found for this user")
@@ -57,15 +63,17 @@ async def get_results_by_tech_stack(
     user_id: str,
     tech_stack: str,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get results for a specific user and tech stack"""
-    results = db.query(UserResult).filter(
-        UserResult.user_id == user_id,
-        UserResult.tech_stack == tech_stack
-    ).order_by(
-        desc(UserResult.created_at)
-    ).limit(limit).all()
+    results = (await db.execute(
+        select(UserResult).where(
+            UserResult.user_id == user_id,
+            UserResult.tech_stack == tech_stack
+        ).order_by(
+            desc(UserResult.created_at)
+        ).limit(limit)
+    )).scalars().all()
 
     return ResultListResponse(
         results=[ResultResponse.model_validate(r) for r in results],
@@ -8,6 +8,7 @@ from app.schemas.interview import (
 )
 from app.schemas.results import ResultResponse, ResultListResponse
 from app.schemas.suggestions import SuggestionResponse
+from app.schemas.evaluation import GeneratedQuestions, InterviewEvaluation, AnswerEvaluation
 
 __all__ = [
     "StartInterviewRequest",
@@ -18,5 +19,8 @@ __all__ = [
     "InterviewStatus",
     "ResultResponse",
     "ResultListResponse",
-    "SuggestionResponse"
+    "SuggestionResponse",
+    "GeneratedQuestions",
+    "InterviewEvaluation",
+    "AnswerEvaluation"
 ]
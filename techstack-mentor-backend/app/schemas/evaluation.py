@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+QuestionDifficulty = Literal["beginner", "intermediate", "advanced"]
+QuestionTopic = Literal["fundamentals", "best_practices", "real_world", "performance_security", "advanced_ecosystem"]
+
+
+class GeneratedQuestion(BaseModel):
+    """One generated question with the difficulty and topic it was written for"""
+    question: str = Field(..., description="Interview question text")
+    difficulty: QuestionDifficulty = Field(..., description="Difficulty level of the question")
+    topic: QuestionTopic = Field(..., description="Topic area the question covers")
+
+
+class GeneratedQuestions(BaseModel):
+    """Structured output of question generation"""
+    questions: List[GeneratedQuestion] = Field(..., min_length=1, description="Tagged interview questions")
+
+
+class InterviewEvaluation(BaseModel):
+    """Structured output of the full-interview evaluation"""
+    score: float = Field(..., ge=0, le=10, description="Overall score 0-10 with one decimal")
+    feedback: str = Field(..., min_length=1, description="3-5 sentence specific feedback")
+    missed_topics: List[str] = Field(..., description="Specific topics the candidate missed")
+    improvement_areas: str = Field(..., description="Actionable advice on what to study/practice")
+    strengths: List[str] = Field(..., description="Specific strengths shown")
+    correct_count: int = Field(..., ge=0, description="Number of questions answered well")
+
+
+class AnswerEvaluation(BaseModel):
+    """Structured output of a single-answer evaluation"""
+    score: float = Field(..., ge=0, le=10, description="Score 0-10 with one decimal")
+    correct: bool = Field(..., description="Whether the answer is substantially correct")
+    feedback: str = Field(..., description="1-2 sentences of specific feedback")
+    strengths: List[str] = Field(..., description="Specific strengths of the answer")
+    missed_topics: List[str] = Field(..., description="Topics the answer missed or got wrong")
+    improvement_areas: str = Field(..., description="One sentence of actionable advice")
@@ -27,6 +27,9 @@ class StartInterviewResponse(BaseModel):
 class SendMessageRequest(BaseModel):
     session_id: str = Field(..., description="Interview session ID")
     user_message: str = Field(..., description="User's answer to the question")
+    bypass_cache: bool = Field(
+        False, description="Always ask the model for the next question instead of using the response cache"
+    )
 
 
 class SendMessageResponse(BaseModel):
@@ -43,7 +46,9 @@ class InterviewStatus(BaseModel):
     total_questions: int
     is_complete: bool
     questions: List[str]
-    answers: List[str]
+    answers: List[Optional[str]]
+    audio_urls: List[Optional[str]] = []
+    audio_status: List[str] = []
 
 
 class EndInterviewResponse(BaseModel):
@@ -0,0 +1,122 @@
+"""
+Background processing of interview answers.
+
+Runs outside the request: audio answers are transcribed by the transcription
+queue workers, and every answer can be scored as soon as it is stored (by
+the evaluation queue, or a background task for typed answers) so /end only
+has to aggregate. All of them write into the session and notify waiters.
+"""
+
+from typing import Any, Dict
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+from app.utils.llm_service import llm_service
+from app.utils.audio_service import audio_service
+from app.utils.session_events import session_events
+
+settings = get_settings()
+
+
+async def transcribe_answer(file_path: str, session_id: str, answer_index: int) -> None:
+    """
+    Transcribe an uploaded answer and store it in its reserved slot.
+    Scoring it is a separate job (see transcription_queue).
+
+    Safe to run more than once for the same answer: a slot that is already
+    complete is neither transcribed again nor overwritten.
+
+    Raises:
+        Exception: If transcription fails (the queue retries the job)
+    """
+    if await cache_manager.is_transcription_complete(session_id, answer_index):
+        print(f"Transcription for session {session_id}, answer {answer_index} already stored; skipping")
+        return
+
+    transcribed_text = await audio_service.transcribe_audio(file_path)
+
+    try:
+        # Atomic, so transcriptions finishing out of order still pair with the right question
+        stored = await cache_manager.set_answer_once(session_id, answer_index, transcribed_text)
+    finally:
+        # Wake /end if it is waiting on this session
+        await session_events.notify(session_id)
+
+    if stored:
+        print(f"Transcription complete for session {session_id}, answer {answer_index}: {transcribed_text[:50]}...")
+
+
+async def fail_transcription(session_id: str, answer_index: int) -> None:
+    """Give up on an answer: mark it complete without text so evaluation is not blocked."""
+    try:
+        await cache_manager.mark_transcription_complete(session_id, answer_index)
+    finally:
+        await session_events.notify(session_id)
+
+
+async def evaluate_answer(session_id: str, answer_index: int) -> None:
+    """
+    Score a stored answer and store its evaluation.
+
+    Safe to run more than once for the same answer: an answer that already
+    has an evaluation is not scored again.
+
+    Raises:
+        Exception: If the evaluation fails (the queue retries the job)
+    """
+    session = await cache_manager.get_session(session_id)
+    if not session or answer_index >= min(len(session["questions"]), len(session["answers"])):
+        return
+
+    answer = session["answers"][answer_index]
+    evaluations = session["answer_evaluations"]
+    existing = evaluations[answer_index] if answer_index < len(evaluations) else None
+    if answer is None or (existing is not None and "error" not in existing):
+        return
+
+    evaluation = await llm_service.aevaluate_answer(
+        tech_stack=session["tech_stack"],
+        question=session["questions"][answer_index],
+        answer=answer
+    )
+    print(f"Evaluation complete for session {session_id}, answer {answer_index}: {evaluation['score']}")
+
+    try:
+        await cache_manager.set_answer_evaluation(session_id, answer_index, evaluation)
+    finally:
+        await session_events.notify(session_id)
+
+
+async def fail_evaluation(session_id: str, answer_index: int, error: str) -> None:
+    """Give up on scoring an answer: store the error so /end scores it inline instead of waiting."""
+    try:
+        await cache_manager.set_answer_evaluation(session_id, answer_index, {"error": error})
+    finally:
+        await session_events.notify(session_id)
+
+
+async def evaluate_answer_background(session_id: str, answer_index: int, answer: str) -> None:
+    """
+    Background task to score one answer as soon as it is available, so /end
+    only has to aggregate the stored per-answer evaluations.
+    A failed evaluation is stored as {"error": ...} and redone by /end.
+    """
+    evaluation: Dict[str, Any]
+    try:
+        session = await cache_manager.get_session(session_id)
+        if not session or answer_index >= len(session["questions"]):
+            return
+
+        evaluation = await llm_service.aevaluate_answer(
+            tech_stack=session["tech_stack"],
+            question=session["questions"][answer_index],
+            answer=answer
+        )
+        print(f"Background evaluation complete for session {session_id}, answer {answer_index}: {evaluation['score']}")
+    except Exception as e:
+        print(f"Background evaluation failed for session {session_id}, answer {answer_index}: {str(e)}")
+        evaluation = {"error": str(e) or type(e).__name__}
+
+    try:
+        await cache_manager.set_answer_evaluation(session_id, answer_index, evaluation)
+    finally:
+        await session_events.notify(session_id)
@@ -0,0 +1,250 @@
+"""
+Audio preprocessing before transcription.
+
+Browser recordings are usually stereo 44.1/48kHz webm or wav with silence at
+both ends. Whisper works at 16kHz mono, so before upload each recording is:
+- trimmed of leading and trailing silence,
+- downmixed to mono and resampled to 16kHz,
+- re-encoded to a compact codec (Opus in Ogg by default).
+
+Long recordings can also be split at silences into segments of roughly
+`transcription_segment_seconds`, so the segments can be transcribed in
+parallel and the text stitched back together in order. With preprocessing
+disabled, segments keep the recording's own channels, rate and format, and
+recordings that fit in one segment are not decoded at all.
+
+Decoding and encoding are CPU-bound (pydub/ffmpeg), so they run in a process
+pool instead of on the event loop.
+"""
+
+import asyncio
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional
+from pydub import AudioSegment
+from pydub.silence import detect_leading_silence, detect_silence
+from pydub.utils import mediainfo
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def _trim_silence(audio: AudioSegment, threshold_db: float, padding_ms: int) -> AudioSegment:
+    """Strip leading and trailing silence, keeping a little padding around speech."""
+    start = detect_leading_silence(audio, silence_threshold=threshold_db)
+    end = len(audio) - detect_leading_silence(audio.reverse(), silence_threshold=threshold_db)
+
+    if end <= start:
+        # Nothing above the threshold: keep the audio rather than sending an empty file
+        return audio
+
+    return audio[max(0, start - padding_ms):min(len(audio), end + padding_ms)]
+
+
+def _find_cut_points(audio: AudioSegment, segment_ms: int, threshold_db: float, min_silence_ms: int) -> List[int]:
+    """
+    Positions (ms) to split audio at, preferring the middle of a silence.
+
+    Each segment aims for segment_ms and is cut at the silence closest to that
+    length; if there is no pause between half and 1.5x the target, it is cut
+    hard at 1.5x so no segment grows unbounded.
+    """
+    max_ms = segment_ms * 3 // 2
+    if len(audio) <= max_ms:
+        return []
+
+    silences = detect_silence(audio, min_silence_len=min_silence_ms, silence_thresh=threshold_db)
+    pauses = [(start + end) // 2 for start, end in silences]
+
+    cuts = []
+    start = 0
+    while len(audio) - start > max_ms:
+        target = start + segment_ms
+        candidates = [p for p in pauses if start + segment_ms // 2 < p <= start + max_ms]
+        cut = min(candidates, key=lambda p: abs(p - target)) if candidates else start + max_ms
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def preprocess_file(
+    source_path: str,
+    output_prefix: str,
+    sample_rate: int,
+    output_format: str,
+    codec: Optional[str],
+    bitrate: Optional[str],
+    threshold_db: float,
+    padding_ms: int,
+    segment_ms: int = 0,
+    min_silence_ms: int = 500,
+    transform: bool = True
+) -> List[str]:
+    """
+    Trim, downmix, resample and re-encode one audio file, optionally split at silences.
+
+    Runs in a worker process, so it only takes plain arguments. With transform
+    off the audio is only split: segments keep the source's channels and rate
+    and are written in the source format (output_format, codec and bitrate
+    are ignored).
+
+    Returns:
+        Paths of the written segments in order (one path when not splitting)
+    """
+    audio = AudioSegment.from_file(source_path)
+    if transform:
+        audio = _trim_silence(audio, threshold_db, padding_ms)
+        audio = audio.set_channels(1).set_frame_rate(sample_rate)
+    else:
+        output_format = Path(source_path).suffix.lstrip(".") or output_format
+        codec = bitrate = None
+
+    cuts = _find_cut_points(audio, segment_ms, threshold_db, min_silence_ms) if segment_ms else []
+    bounds = [0, *cuts, len(audio)]
+
+    output_paths = []
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        output_path = f"{output_prefix}.{index}.{output_format}"
+        audio[start:end].export(output_path, format=output_format, codec=codec, bitrate=bitrate)
+        output_paths.append(output_path)
+    return output_paths
+
+
+class AudioPreprocessor:
+    """Runs recording preprocessing in a process pool."""
+
+    def __init__(self):
+        self.enabled = settings.audio_preprocess_enabled
+        self.workers = settings.audio_preprocess_workers
+        self.sample_rate = settings.audio_preprocess_sample_rate
+        self.output_format = settings.audio_preprocess_format
+        self.codec = settings.audio_preprocess_codec or None
+        self.bitrate = settings.audio_preprocess_bitrate or None
+        self.threshold_db = settings.audio_silence_threshold_db
+        self.padding_ms = settings.audio_silence_padding_ms
+        self.segment_ms = int(settings.transcription_segment_seconds * 1000)
+        self.min_silence_ms = settings.transcription_min_silence_ms
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def get_output_prefix(self, file_path: str) -> Path:
+        """Hidden temp path prefix next to the recording (ignored by the storage index)."""
+        source = Path(file_path)
+        return source.with_name(f".{source.stem}.{uuid.uuid4().hex}")
+
+    async def _run(self, file_path: str, segment_ms: int) -> List[str]:
+        output_prefix = self.get_output_prefix(file_path)
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(
+                executor,
+                preprocess_file,
+                str(file_path),
+                str(output_prefix),
+                self.sample_rate,
+                self.output_format,
+                self.codec,
+                self.bitrate,
+                self.threshold_db,
+                self.padding_ms,
+                segment_ms,
+                self.min_silence_ms,
+                self.enabled
+            )
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); replace the pool so later recordings are processed again
+            print(f"Audio preprocessing pool broke on {file_path}, restarting it and using original: {e}")
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            return []
+        except Exception as e:
+            print(f"Audio preprocessing failed for {file_path}, using original: {e}")
+            for partial in output_prefix.parent.glob(f"{output_prefix.name}.*"):
+                self.discard(str(partial))
+            return []
+
+    async def preprocess(self, file_path: str) -> Optional[str]:
+        """
+        Prepare a recording for transcription.
+
+        Args:
+            file_path: Path to the uploaded recording
+
+        Returns:
+            Path of the preprocessed file (the caller deletes it), or None if
+            preprocessing is disabled, failed, or did not make the file smaller
+        """
+        if not self.enabled:
+            return None
+
+        output_paths = await self._run(file_path, segment_ms=0)
+        return self._keep_if_smaller(file_path, output_paths[0]) if output_paths else None
+
+    async def _fits_in_one_segment(self, file_path: str) -> bool:
+        """Whether a recording is too short to split, read from its header (ffprobe) without decoding it."""
+        try:
+            info = await asyncio.to_thread(mediainfo, file_path)
+            return float(info["duration"]) * 1000 <= self.segment_ms * 3 // 2
+        except (KeyError, ValueError, OSError):
+            # Unknown duration; let the split decide
+            return False
+
+    async def split(self, file_path: str) -> List[str]:
+        """
+        Preprocess a recording and split it at silences for parallel transcription.
+
+        With preprocessing disabled, short recordings are left alone and long
+        ones are only cut into segments (no trimming, downmixing or resampling).
+
+        Args:
+            file_path: Path to the uploaded recording
+
+        Returns:
+            Segment paths in order (the caller deletes them); empty if
+            processing failed, or if the recording fits in one segment and
+            preprocess() would not have used the processed file
+        """
+        if not self.enabled and await self._fits_in_one_segment(file_path):
+            return []
+
+        output_paths = await self._run(file_path, segment_ms=self.segment_ms)
+        if len(output_paths) == 1:
+            if not self.enabled:
+                self.discard(output_paths[0])
+                return []
+            output_path = self._keep_if_smaller(file_path, output_paths[0])
+            return [output_path] if output_path else []
+        return output_paths
+
+    def _keep_if_smaller(self, file_path: str, output_path: str) -> Optional[str]:
+        """Drop a processed file that is not smaller than the original upload."""
+        if os.path.getsize(output_path) >= os.path.getsize(file_path):
+            self.discard(output_path)
+            return None
+        return output_path
+
+    @staticmethod
+    def discard(file_path: Optional[str]) -> None:
+        """Remove a preprocessed temp file if it exists."""
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+audio_preprocessor = AudioPreprocessor()
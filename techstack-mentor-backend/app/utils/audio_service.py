@@ -5,24 +5,160 @@ Uses OpenAI Whisper for transcription and OpenAI TTS for speech synthesis.
 
 import os
 import uuid
+import asyncio
+import hashlib
 import aiofiles
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import UploadFile
 from openai import AsyncOpenAI
 from app.config import get_settings
+from app.utils.audio_storage import audio_storage
+from app.utils.audio_preprocessing import audio_preprocessor
+from app.utils.hedging import transcription_hedger
+from app.utils.rate_limiter import openai_governor
 
 settings = get_settings()
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+# Retries are left to openai_governor, so they count against the endpoint quotas
+client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+
+# In-flight syntheses (or streams) by target file path, so concurrent requests for the same audio
+# share one TTS call. Each task resolves to the file path once the file is complete.
+_tts_in_flight: Dict[str, asyncio.Task] = {}
+
+
+class SpeechBroadcast:
+    """
+    Chunks of a streamed synthesis, kept until it ends so listeners that join
+    late can replay them from the first chunk and then follow the live stream.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.done = False
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        # A fresh event per change, so one listener clearing it cannot hide it from another
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def publish(self, chunk: bytes) -> None:
+        """Add the next chunk and wake the listeners."""
+        self.chunks.append(chunk)
+        self._notify()
+
+    def close(self) -> None:
+        """Mark the stream as ended (completed or failed)."""
+        self.done = True
+        self._notify()
+
+    async def listen(self) -> AsyncIterator[bytes]:
+        """Yield every chunk from the start, waiting for new ones until the stream ends."""
+        position = 0
+        while True:
+            changed = self._changed
+            while position < len(self.chunks):
+                yield self.chunks[position]
+                position += 1
+            if self.done:
+                return
+            await changed.wait()
+
+
+# Broadcasts of the in-flight syntheses that are streamed, by target file path
+_tts_broadcasts: Dict[str, SpeechBroadcast] = {}
+
+
+class AudioFileTooLargeError(Exception):
+    """Raised when an upload exceeds max_audio_file_size_mb."""
+
+
+@asynccontextmanager
+async def atomic_write(file_path: Path) -> AsyncIterator[Any]:
+    """
+    Open a temp file next to file_path and move it into place when the block completes.
+
+    Readers only ever see a complete file. If the block fails (or a generator
+    writing the file is closed early), the temp file is removed instead.
+
+    Args:
+        file_path: Final location of the file
+
+    Yields:
+        Async binary file object to write to
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    # Dot-prefixed so storage GC skips writes in progress
+    temp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            yield f
+        os.replace(temp_path, file_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
 
 
 class AudioService:
     """Service for handling audio transcription and speech synthesis."""
 
+    @staticmethod
+    async def _request_transcription(file_path: str):
+        """One Whisper request for a file, within the Whisper rate limit."""
+        async def request():
+            with open(file_path, "rb") as audio_file:
+                return await client.audio.transcriptions.create(
+                    model=settings.openai_whisper_model,
+                    file=audio_file,
+                    response_format="text"
+                )
+
+        return await openai_governor.call("whisper", request)
+
+    @staticmethod
+    async def _transcribe_file(file_path: str) -> str:
+        """
+        Send one audio file to Whisper and return the text.
+
+        When transcription hedging is enabled, a slow request is hedged with a
+        second one. Latency grows with file length, so hedge delays are tracked
+        per power-of-two size bucket.
+        """
+        size_bucket = (os.path.getsize(file_path) // 1024).bit_length()
+        transcript = await transcription_hedger.run(
+            f"whisper:{size_bucket}",
+            lambda: AudioService._request_transcription(file_path)
+        )
+
+        # Whisper returns a string when response_format="text"
+        transcription_text = transcript if isinstance(transcript, str) else transcript.text
+
+        return transcription_text.strip()
+
+    @staticmethod
+    async def _transcribe_segments(segment_paths: List[str]) -> str:
+        """Transcribe segments concurrently (bounded) and join the text in order."""
+        semaphore = asyncio.Semaphore(settings.transcription_max_parallel_segments)
+
+        async def transcribe_segment(segment_path: str) -> str:
+            async with semaphore:
+                return await AudioService._transcribe_file(segment_path)
+
+        texts = await asyncio.gather(*[transcribe_segment(path) for path in segment_paths])
+        return " ".join(text for text in texts if text)
+
     @staticmethod
     async def transcribe_audio(file_path: str) -> str:
         """
         Transcribe audio file to text using OpenAI Whisper API.
 
+        The recording is trimmed, downmixed and compressed first when
+        preprocessing is enabled; the original is sent if that fails. With
+        chunking enabled, long recordings are split at silences and the
+        segments are transcribed in parallel.
+
         Args:
             file_path: Path to the audio file to transcribe
 
@@ -32,21 +168,22 @@ class AudioService:
         Raises:
             Exception: If transcription fails
         """
-        try:
-            with open(file_path, "rb") as audio_file:
-                transcript = await client.audio.transcriptions.create(
-                    model=settings.openai_whisper_model,
-                    file=audio_file,
-                    response_format="text"
-                )
-
-            # Whisper returns a string when response_format="text"
-            transcription_text = transcript if isinstance(transcript, str) else transcript.text
+        if settings.transcription_chunking_enabled:
+            processed_paths = await audio_preprocessor.split(file_path)
+        else:
+            processed_path = await audio_preprocessor.preprocess(file_path)
+            processed_paths = [processed_path] if processed_path else []
 
-            return transcription_text.strip()
+        try:
+            if len(processed_paths) > 1:
+                return await AudioService._transcribe_segments(processed_paths)
+            return await AudioService._transcribe_file(processed_paths[0] if processed_paths else file_path)
 
         except Exception as e:
             raise Exception(f"Failed to transcribe audio: {str(e)}")
+        finally:
+            for processed_path in processed_paths:
+                audio_preprocessor.discard(processed_path)
 
     @staticmethod
     async def text_to_speech(text: str, voice: Optional[str] = None) -> bytes:
@@ -67,12 +204,12 @@ class AudioService:
         try:
             selected_voice = voice or settings.openai_tts_voice
 
-            response = await client.audio.speech.create(
+            response = await openai_governor.call("tts", lambda: client.audio.speech.create(
                 model=settings.openai_tts_model,
                 voice=selected_voice,
                 input=text,
                 response_format="mp3"
-            )
+            ))
 
             # Get the audio content directly
             audio_data = response.content
@@ -119,9 +256,10 @@ class AudioService:
             # Create full file path
             file_path = dir_path / f"{filename}{extension}"
 
-            # Save file asynchronously
-            async with aiofiles.open(file_path, "wb") as f:
+            # Save file asynchronously; readers (and ETags) only ever see the complete file
+            async with atomic_write(file_path) as f:
                 await f.write(audio_data)
+            audio_storage.track(str(file_path))
 
             # Return relative path
             return str(file_path)
@@ -154,6 +292,50 @@ class AudioService:
             extension=extension
         )
 
+    @staticmethod
+    async def save_uploaded_stream(
+        upload_file: UploadFile,
+        session_id: str,
+        extension: str = ".webm"
+    ) -> str:
+        """
+        Copy an uploaded recording to disk chunk by chunk.
+
+        Starlette has already spooled the upload (to disk above 1MB) before the
+        handler runs, so oversize bodies are rejected earlier, by
+        UploadSizeLimitMiddleware. The limit is checked again here because the
+        middleware allows for multipart overhead.
+
+        Args:
+            upload_file: Uploaded file from the request
+            session_id: Session ID for organizing files
+            extension: File extension based on upload type
+
+        Returns:
+            Relative file path to the saved recording
+
+        Raises:
+            AudioFileTooLargeError: If the upload exceeds the size limit
+        """
+        max_size_bytes = settings.max_audio_file_size_mb * 1024 * 1024
+
+        # Reject up front when the size is already known
+        if upload_file.size is not None and upload_file.size > max_size_bytes:
+            raise AudioFileTooLargeError(f"Audio file exceeds {settings.max_audio_file_size_mb}MB")
+
+        file_path = Path(settings.audio_recordings_dir) / f"{session_id}_{uuid.uuid4()}{extension}"
+
+        written = 0
+        async with atomic_write(file_path) as f:
+            while chunk := await upload_file.read(settings.audio_upload_chunk_size):
+                written += len(chunk)
+                if written > max_size_bytes:
+                    raise AudioFileTooLargeError(f"Audio file exceeds {settings.max_audio_file_size_mb}MB")
+                await f.write(chunk)
+
+        audio_storage.track(str(file_path))
+        return str(file_path)
+
     @staticmethod
     async def save_ai_response_audio(
         audio_data: bytes,
@@ -179,6 +361,313 @@ class AudioService:
             extension=".mp3"
         )
 
+    @staticmethod
+    def get_tts_cache_key(text: str, voice: Optional[str] = None) -> str:
+        """
+        Content address for synthesized speech.
+
+        Args:
+            text: Text to be spoken
+            voice: Voice to use. Defaults to config setting.
+
+        Returns:
+            SHA-256 hex digest of (model, voice, text)
+        """
+        selected_voice = voice or settings.openai_tts_voice
+        content = f"{settings.openai_tts_model}\n{selected_voice}\n{text}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_tts_cache_path(cache_key: str) -> Path:
+        """
+        Location of a cached TTS file.
+
+        Args:
+            cache_key: Key from get_tts_cache_key
+
+        Returns:
+            Path of the shared audio file for that key
+        """
+        return Path(settings.audio_responses_dir) / f"tts_{cache_key}.mp3"
+
+    @staticmethod
+    def get_question_audio_path(session_id: str, question_number: int) -> Path:
+        """
+        Location of a question's per-session audio (used when the TTS cache is disabled).
+
+        Args:
+            session_id: Session ID
+            question_number: 1-based question number
+
+        Returns:
+            Path of the session's audio file for that question
+        """
+        return Path(settings.audio_responses_dir) / f"{session_id}_q{question_number}.mp3"
+
+    @staticmethod
+    def _track_in_flight(
+        file_path: Path,
+        task: asyncio.Task,
+        broadcast: Optional[SpeechBroadcast] = None
+    ) -> asyncio.Task:
+        """Register a synthesis writing file_path (and the broadcast of its chunks, if streamed) until it finishes."""
+        key = str(file_path)
+        _tts_in_flight[key] = task
+        if broadcast is not None:
+            _tts_broadcasts[key] = broadcast
+
+        def untrack(done: asyncio.Task) -> None:
+            if _tts_in_flight.get(key) is done:
+                _tts_in_flight.pop(key)
+                _tts_broadcasts.pop(key, None)
+
+        task.add_done_callback(untrack)
+        return task
+
+    @staticmethod
+    async def _synthesize_file(text: str, voice: Optional[str], file_path: Path) -> str:
+        """Synthesize text and write it to file_path atomically."""
+        audio_data = await AudioService.text_to_speech(text, voice)
+
+        async with atomic_write(file_path) as f:
+            await f.write(audio_data)
+
+        audio_storage.track(str(file_path))
+        return str(file_path)
+
+    @staticmethod
+    async def synthesize_to_file(
+        text: str,
+        file_path: Path,
+        voice: Optional[str] = None,
+        stream: bool = False
+    ) -> str:
+        """
+        Get speech for text stored at file_path, synthesizing it unless it exists.
+
+        Concurrent callers for the same file (including a stream that is
+        writing it) share one TTS call and all get the path of the file.
+
+        Args:
+            text: Text to convert to speech
+            file_path: Where the audio is stored
+            voice: Voice to use. Defaults to config setting.
+            stream: Synthesize through the streaming API and broadcast the chunks, so
+                    a client asking to stream this audio meanwhile can follow along
+                    instead of waiting for the file. Streamed synthesis is not retried.
+
+        Returns:
+            Relative file path to the audio
+
+        Raises:
+            Exception: If speech synthesis fails
+        """
+        if file_path.exists():
+            audio_storage.touch(str(file_path))
+            return str(file_path)
+
+        task = _tts_in_flight.get(str(file_path))
+        if task is None and stream:
+            task, _ = AudioService._start_stream(text, voice, file_path)
+        elif task is None:
+            task = AudioService._track_in_flight(
+                file_path, asyncio.ensure_future(AudioService._synthesize_file(text, voice, file_path))
+            )
+
+        # Shield so one cancelled caller does not cancel the synthesis for the others
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def synthesize_cached(text: str, voice: Optional[str] = None, stream: bool = False) -> str:
+        """
+        Get speech for text from the content-addressed cache, synthesizing it on a miss.
+
+        Identical text with the same voice and model is synthesized and stored once;
+        every caller gets the path of the shared file.
+
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use. Defaults to config setting.
+            stream: Synthesize a miss through the streaming API (see synthesize_to_file)
+
+        Returns:
+            Relative file path to the cached audio
+
+        Raises:
+            Exception: If speech synthesis fails
+        """
+        file_path = AudioService.get_tts_cache_path(AudioService.get_tts_cache_key(text, voice))
+        return await AudioService.synthesize_to_file(text, file_path, voice, stream)
+
+    @staticmethod
+    def is_tts_in_flight(file_path: Path) -> bool:
+        """Whether a synthesis or stream writing this file is currently running."""
+        return str(file_path) in _tts_in_flight
+
+    @staticmethod
+    def is_tts_streaming(file_path: Path) -> bool:
+        """Whether the synthesis writing this file is streamed, so its chunks can be followed."""
+        return str(file_path) in _tts_broadcasts
+
+    @staticmethod
+    async def stream_text_to_speech(text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream speech from OpenAI TTS as it is synthesized.
+
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use. Defaults to config setting.
+
+        Yields:
+            MP3 audio chunks in order
+        """
+        selected_voice = voice or settings.openai_tts_voice
+
+        async with openai_governor.slot("tts"):
+            async with client.audio.speech.with_streaming_response.create(
+                model=settings.openai_tts_model,
+                voice=selected_voice,
+                input=text,
+                response_format="mp3"
+            ) as response:
+                async for chunk in response.iter_bytes(settings.tts_stream_chunk_size):
+                    yield chunk
+
+    @staticmethod
+    async def _stream_to_file(text: str, voice: Optional[str], file_path: Path, broadcast: SpeechBroadcast) -> str:
+        """Write streamed speech to file_path, publishing each chunk to the broadcast."""
+        try:
+            async with atomic_write(file_path) as f:
+                async for chunk in AudioService.stream_text_to_speech(text, voice):
+                    await f.write(chunk)
+                    broadcast.publish(chunk)
+        finally:
+            broadcast.close()
+
+        audio_storage.track(str(file_path))
+        return str(file_path)
+
+    @staticmethod
+    def _start_stream(text: str, voice: Optional[str], file_path: Path) -> Tuple[asyncio.Task, SpeechBroadcast]:
+        """Start a streamed synthesis of file_path and register it as in flight."""
+        broadcast = SpeechBroadcast()
+        task = AudioService._track_in_flight(
+            file_path,
+            asyncio.ensure_future(AudioService._stream_to_file(text, voice, file_path, broadcast)),
+            broadcast
+        )
+        return task, broadcast
+
+    @staticmethod
+    async def _relay(broadcast: SpeechBroadcast, task: asyncio.Task) -> AsyncIterator[bytes]:
+        async for chunk in broadcast.listen():
+            yield chunk
+        # Surface a synthesis error to the response instead of ending the audio early
+        await asyncio.shield(task)
+
+    @staticmethod
+    def stream_speech_to_file(text: str, file_path: Path, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream speech to the caller while writing it to disk.
+
+        The TTS response is read by a background task, which writes each chunk
+        to a temp file and queues it for the caller. The TTS slot is therefore
+        released as soon as the upstream response ends, however slowly the
+        client downloads, and the file is completed even if the client leaves.
+        The synthesis is registered as in flight right away, so other requests
+        for the same file wait for it instead of paying for a second one. If a
+        streamed synthesis of the file is already running (a background
+        pre-generation or another client), the caller follows that one,
+        starting from its first chunk.
+
+        Args:
+            text: Text to convert to speech
+            file_path: Where the complete audio is stored
+            voice: Voice to use. Defaults to config setting.
+
+        Returns:
+            Iterator of MP3 audio chunks in order
+        """
+        key = str(file_path)
+        if key in _tts_broadcasts:
+            return AudioService._relay(_tts_broadcasts[key], _tts_in_flight[key])
+
+        task, broadcast = AudioService._start_stream(text, voice, file_path)
+        return AudioService._relay(broadcast, task)
+
+    @staticmethod
+    def format_question_text(question_number: int, question: str) -> str:
+        """
+        Build the spoken text for a question.
+
+        Args:
+            question_number: 1-based question number
+            question: Question text
+
+        Returns:
+            Text to pass to TTS
+        """
+        return f"Question {question_number}: {question}"
+
+    @staticmethod
+    async def generate_question_audio(
+        question_text: str,
+        session_id: str,
+        question_number: int,
+        stream: bool = False
+    ) -> Optional[str]:
+        """
+        Synthesize and save the audio for a single question.
+
+        Uses the shared TTS cache when `tts_cache_enabled` is set, otherwise
+        writes a per-session file.
+
+        Args:
+            question_text: Text to be spoken
+            session_id: Session ID for organizing files
+            question_number: Question number for naming
+            stream: Synthesize through the streaming API, so the question can be
+                    streamed to the client while this runs (see synthesize_to_file)
+
+        Returns:
+            URL path for the audio file, or None if synthesis failed
+        """
+        try:
+            if settings.tts_cache_enabled:
+                audio_file_path = await AudioService.synthesize_cached(question_text, stream=stream)
+            else:
+                audio_file_path = await AudioService.synthesize_to_file(
+                    question_text, AudioService.get_question_audio_path(session_id, question_number), stream=stream
+                )
+            return AudioService.get_audio_url(audio_file_path)
+        except Exception as e:
+            print(f"TTS generation failed for question {question_number}: {str(e)}")
+            return None
+
+    @staticmethod
+    async def generate_questions_audio(questions: List[str], session_id: str) -> List[Optional[str]]:
+        """
+        Synthesize audio for all questions concurrently.
+
+        Concurrency is bounded by the TTS quota of openai_governor. The result keeps the
+        question order, with None for any question whose synthesis failed.
+
+        Args:
+            questions: Question texts in interview order
+            session_id: Session ID for organizing files
+
+        Returns:
+            Audio URLs aligned with the questions list
+        """
+        return list(await asyncio.gather(*[
+            AudioService.generate_question_audio(
+                question_text=AudioService.format_question_text(idx, question),
+                session_id=session_id,
+                question_number=idx
+            )
+            for idx, question in enumerate(questions, start=1)
+        ]))
+
     @staticmethod
     def get_audio_url(file_path: str) -> str:
         """
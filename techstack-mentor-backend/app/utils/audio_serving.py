@@ -0,0 +1,139 @@
+"""
+HTTP serving for audio files.
+
+Adds what the audio player needs for fast seeking and repeat playback on top of
+Starlette's FileResponse (which handles byte ranges / 206 Partial Content):
+- strong ETags and Last-Modified, with 304 responses for conditional requests
+- If-Range validated against the same ETag
+- MIME type per audio extension
+- immutable caching for content-addressed TTS files, revalidation for the rest
+"""
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+from app.config import get_settings
+from app.utils.audio_storage import SHARED_PREFIX
+
+settings = get_settings()
+
+AUDIO_MEDIA_TYPES: Dict[str, str] = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".webm": "audio/webm",
+    ".m4a": "audio/mp4",
+    ".ogg": "audio/ogg",
+}
+
+
+def get_audio_media_type(file_path: Path) -> str:
+    """MIME type for an audio file based on its extension."""
+    extension = file_path.suffix.lower()
+    return AUDIO_MEDIA_TYPES.get(extension) or mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+
+
+def is_content_addressed(file_path: Path) -> bool:
+    """Whether the file name is derived from its content (shared TTS cache)."""
+    return file_path.name.startswith(SHARED_PREFIX)
+
+
+def compute_etag(file_path: Path, stat_result: os.stat_result) -> str:
+    """
+    Strong ETag for an audio file.
+
+    Content-addressed files use their content hash. Every other audio file is
+    written through audio_service.atomic_write (temp file + rename) and never
+    modified in place, so size and mtime identify their bytes exactly.
+    """
+    if is_content_addressed(file_path):
+        return f'"{file_path.stem[len(SHARED_PREFIX):]}"'
+
+    base = f"{file_path.name}-{stat_result.st_size}-{stat_result.st_mtime_ns}"
+    return f'"{hashlib.sha1(base.encode("utf-8")).hexdigest()}"'
+
+
+def _etag_matches(header_value: str, etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, as required by RFC 9110)."""
+    if header_value.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header_value.split(",")]
+    return etag in candidates
+
+
+def _not_modified_since(header_value: str, stat_result: os.stat_result) -> bool:
+    try:
+        since = parsedate_to_datetime(header_value)
+    except (TypeError, ValueError):
+        return False
+    return int(stat_result.st_mtime) <= since.timestamp()
+
+
+class AudioFileResponse(FileResponse):
+    """FileResponse whose If-Range check uses our ETag instead of Starlette's."""
+
+    def __init__(self, *args, etag: str, **kwargs):
+        self.etag = etag
+        super().__init__(*args, **kwargs)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if_range = Headers(scope=scope).get("if-range")
+        if if_range is not None:
+            # Resolve If-Range here and hand FileResponse a request without it: keep the
+            # Range only if the client's validator still matches (strong comparison)
+            current = if_range in (self.etag, self.headers.get("last-modified"))
+            dropped = {b"if-range"} if current else {b"if-range", b"range"}
+            scope = {**scope, "headers": [(name, value) for name, value in scope["headers"] if name not in dropped]}
+        await super().__call__(scope, receive, send)
+
+
+async def serve_audio_file(request: Request, file_path: Path) -> Response:
+    """
+    Serve an audio file with range, conditional-request and caching support.
+
+    Args:
+        request: Incoming request (for Range / If-* headers)
+        file_path: Existing audio file to serve
+
+    Returns:
+        304 if the client's copy is current, otherwise a 200/206 file response
+    """
+    stat_result = await asyncio.to_thread(os.stat, file_path)
+    etag = compute_etag(file_path, stat_result)
+
+    if is_content_addressed(file_path):
+        cache_control = f"public, max-age={settings.audio_cache_max_age}, immutable"
+    else:
+        cache_control = "private, no-cache"
+
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+    }
+
+    # If-None-Match takes precedence over If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since is not None and _not_modified_since(if_modified_since, stat_result):
+        return Response(status_code=304, headers=headers)
+
+    return AudioFileResponse(
+        path=file_path,
+        media_type=get_audio_media_type(file_path),
+        headers=headers,
+        filename=file_path.name,
+        stat_result=stat_result,
+        content_disposition_type="inline",
+        etag=etag
+    )
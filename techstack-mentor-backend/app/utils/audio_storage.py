@@ -0,0 +1,356 @@
+"""
+Audio storage manager for the recordings and responses directories.
+
+Runs an incremental garbage collector in the background that:
+- deletes files not accessed within their TTL, and
+- evicts least recently used files while total usage is above the disk quota.
+Each pass deletes at most `audio_gc_batch_size` files so it never stalls the loop.
+
+Every process records when it writes or serves a file and flushes those
+times to a Redis sorted set, so all workers share one view of recency. Only
+the process holding the GC lock collects. Each pass lists the directories
+(so it sees files written by any process) and never deletes recordings that
+still have a transcription job, files of live sessions, or shared TTS files
+that live sessions reference. If Redis is unavailable, nothing is collected.
+
+Dot-prefixed files are writes in progress (atomic writes, preprocessing
+output) and are not indexed. Ones older than `audio_temp_file_grace_seconds`
+were left behind by a crashed worker and are deleted on every pass.
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+
+settings = get_settings()
+
+# Shared content-addressed TTS files are named tts_<hash>.mp3 and belong to no session
+SHARED_PREFIX = "tts_"
+
+ACCESS_KEY = "audio_storage:access"
+LOCK_KEY = "audio_storage:gc_lock"
+STATS_KEY = "audio_storage:stats"
+
+# How often each process flushes its access times (and the GC owner renews its lock)
+_FLUSH_SECONDS = 5
+# The GC lock outlives a few missed renewals before another process takes over
+_LOCK_TTL_SECONDS = 30
+
+# Take or renew the GC lock. KEYS[1] = lock; ARGV[1] = owner token, ARGV[2] = ttl. Returns 1 if held.
+_HOLD_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+# Release the GC lock if this process still holds it. KEYS[1] = lock; ARGV[1] = owner token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class AudioStorageManager:
+    """Tracks audio file access and reclaims space by TTL and LRU under a quota."""
+
+    def __init__(self):
+        self.directories = [settings.audio_recordings_path, settings.audio_responses_path]
+        self.quota_bytes = settings.audio_storage_quota_mb * 1024 * 1024
+        self.file_ttl = settings.audio_file_ttl
+        self.shared_file_ttl = settings.audio_shared_file_ttl
+        self.min_age = settings.audio_gc_min_age_seconds
+        self.temp_grace = settings.audio_temp_file_grace_seconds
+        self.interval = settings.audio_gc_interval_seconds
+        self.batch_size = settings.audio_gc_batch_size
+
+        # path -> last access, recorded by this process and not yet flushed to Redis
+        self._accesses: Dict[str, float] = {}
+        self._token = uuid.uuid4().hex
+        self.is_gc_owner = False
+        self.metrics = {
+            "gc_runs": 0,
+            "reclaimed_bytes": 0,
+            "reclaimed_files": 0,
+            "expired_files": 0,
+            "evicted_files": 0,
+            "stale_temp_files": 0
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._scripts: Optional[Dict[str, Any]] = None
+
+    @property
+    def redis(self):
+        return cache_manager.redis_client
+
+    @property
+    def scripts(self) -> Dict[str, Any]:
+        if self._scripts is None:
+            self._scripts = {
+                "hold_lock": self.redis.register_script(_HOLD_LOCK_SCRIPT),
+                "release_lock": self.redis.register_script(_RELEASE_LOCK_SCRIPT)
+            }
+        return self._scripts
+
+    @staticmethod
+    def get_session_id(file_path: str) -> Optional[str]:
+        """
+        Owning session of an audio file, from its name.
+
+        Args:
+            file_path: Path of the audio file
+
+        Returns:
+            Session ID, or None for shared (content-addressed) files
+        """
+        name = Path(file_path).name
+        if name.startswith(SHARED_PREFIX):
+            return None
+        return name.split("_", 1)[0]
+
+    def track(self, file_path: str) -> None:
+        """
+        Record a file that was just written.
+
+        Args:
+            file_path: Path of the new file
+        """
+        self.touch(file_path)
+
+    def touch(self, file_path: str) -> None:
+        """
+        Record a read so LRU eviction keeps recently used files.
+
+        Args:
+            file_path: Path of the file that was served
+        """
+        self._accesses[str(file_path)] = time.time()
+
+    async def flush(self) -> None:
+        """Publish the access times recorded by this process to the shared index."""
+        if not self._accesses:
+            return
+
+        accesses, self._accesses = self._accesses, {}
+        try:
+            await self.redis.zadd(ACCESS_KEY, accesses, gt=True)
+        except Exception as e:
+            print(f"Failed to flush audio access times: {e}")
+            # Keep them for the next flush
+            for file_path, accessed in accesses.items():
+                self._accesses[file_path] = max(accessed, self._accesses.get(file_path, 0))
+
+    def scan(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+        """
+        Audio files on disk.
+
+        Returns:
+            path -> {"size", "created", "session_id"} for indexed files, and
+            path -> size for temp (dot) files older than the grace period
+        """
+        files: Dict[str, Dict[str, Any]] = {}
+        stale_temp: Dict[str, int] = {}
+        now = time.time()
+        for directory in self.directories:
+            if not directory.exists():
+                continue
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    # Dot files are writes in progress (temp file before the atomic rename)
+                    if entry.name.startswith("."):
+                        if now - stat.st_mtime > self.temp_grace:
+                            stale_temp[entry.path] = stat.st_size
+                        continue
+                    files[entry.path] = {
+                        "size": stat.st_size,
+                        "created": stat.st_mtime,
+                        "session_id": self.get_session_id(entry.path)
+                    }
+        return files, stale_temp
+
+    async def _protected(self, files: Dict[str, Dict[str, Any]]) -> Set[str]:
+        """Files GC must keep: recordings with unfinished transcription jobs, and files live sessions use."""
+        # Imported here: the queue imports audio_service, which imports this module
+        from app.utils.transcription_queue import transcription_queue
+
+        protected = set(await transcription_queue.active_files())
+        live_sessions = await cache_manager.get_live_session_audio()
+        referenced = {Path(url).name for urls in live_sessions.values() for url in urls}
+
+        for file_path, entry in files.items():
+            if entry["session_id"] in live_sessions or Path(file_path).name in referenced:
+                protected.add(file_path)
+        return protected
+
+    async def _delete(self, file_path: str) -> bool:
+        """Delete a file and drop it from the access index."""
+        try:
+            await asyncio.to_thread(os.remove, file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Failed to delete audio file {file_path}: {e}")
+            return False
+
+        await self.redis.zrem(ACCESS_KEY, file_path)
+        return True
+
+    async def collect(self) -> int:
+        """
+        Run one incremental GC pass over the files of all processes.
+
+        Returns:
+            Bytes reclaimed by this pass
+        """
+        await self.flush()
+        files, stale_temp = await asyncio.to_thread(self.scan)
+        accesses = dict(await self.redis.zrange(ACCESS_KEY, 0, -1, withscores=True))
+        protected = await self._protected(files)
+
+        # Forget access times of files that are gone (deleted by hand or by an earlier pass)
+        gone = [file_path for file_path in accesses if file_path not in files]
+        if gone:
+            await self.redis.zrem(ACCESS_KEY, *gone)
+
+        now = time.time()
+        total_bytes = sum(entry["size"] for entry in files.values())
+        reclaimed = 0
+        deleted = 0
+
+        # Outside the batch limit: these are never served and only appear after a crash
+        for file_path, size in stale_temp.items():
+            try:
+                await asyncio.to_thread(os.remove, file_path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"Failed to delete stale temp file {file_path}: {e}")
+                continue
+            reclaimed += size
+            self.metrics["stale_temp_files"] += 1
+
+        def last_access(file_path: str) -> float:
+            return max(files[file_path]["created"], accesses.get(file_path, 0))
+
+        for file_path, entry in list(files.items()):
+            if deleted >= self.batch_size:
+                break
+            ttl = self.file_ttl if entry["session_id"] else self.shared_file_ttl
+            if file_path in protected or now - last_access(file_path) <= ttl:
+                continue
+            if await self._delete(file_path):
+                total_bytes -= entry["size"]
+                reclaimed += entry["size"]
+                deleted += 1
+                self.metrics["expired_files"] += 1
+                del files[file_path]
+
+        if total_bytes > self.quota_bytes and deleted < self.batch_size:
+            # Never evict very new files, even unprotected ones
+            candidates = [
+                (last_access(file_path), file_path)
+                for file_path, entry in files.items()
+                if file_path not in protected and now - entry["created"] > self.min_age
+            ]
+            for _, file_path in heapq.nsmallest(self.batch_size - deleted, candidates):
+                if total_bytes <= self.quota_bytes:
+                    break
+                size = files[file_path]["size"]
+                if await self._delete(file_path):
+                    total_bytes -= size
+                    reclaimed += size
+                    deleted += 1
+                    self.metrics["evicted_files"] += 1
+                    del files[file_path]
+
+        self.metrics["gc_runs"] += 1
+        self.metrics["reclaimed_bytes"] += reclaimed
+        self.metrics["reclaimed_files"] += deleted
+        await self._publish_usage(files, total_bytes, len(protected))
+        return reclaimed
+
+    async def _publish_usage(self, files: Dict[str, Dict[str, Any]], total_bytes: int, protected: int) -> None:
+        """Store the usage seen by the last pass, so any process can report it."""
+        usage = {
+            "total_bytes": total_bytes,
+            "total_files": len(files),
+            "protected_files": protected,
+            "sessions": len({entry["session_id"] for entry in files.values() if entry["session_id"]}),
+            "updated_at": time.time()
+        }
+        await self.redis.set(STATS_KEY, json.dumps(usage), ex=max(self.interval * 3, _LOCK_TTL_SECONDS))
+
+    async def _hold_lock(self) -> bool:
+        held = await self.scripts["hold_lock"](keys=[LOCK_KEY], args=[self._token, _LOCK_TTL_SECONDS])
+        if bool(held) != self.is_gc_owner:
+            print(f"Audio GC {'acquired' if held else 'lost'} by this process")
+        self.is_gc_owner = bool(held)
+        return self.is_gc_owner
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_collect = loop.time()
+        while True:
+            try:
+                await self.flush()
+                if await self._hold_lock() and loop.time() >= next_collect:
+                    next_collect = loop.time() + self.interval
+                    reclaimed = await self.collect()
+                    if reclaimed:
+                        print(f"Audio GC reclaimed {reclaimed} bytes")
+            except Exception as e:
+                print(f"Audio GC pass failed: {e}")
+            await asyncio.sleep(_FLUSH_SECONDS)
+
+    def start(self) -> None:
+        """Start flushing access times and, when this process holds the lock, collecting."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task, flush pending access times and hand the GC lock over."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+        if self.is_gc_owner:
+            try:
+                await self.scripts["release_lock"](keys=[LOCK_KEY], args=[self._token])
+            except Exception as e:
+                print(f"Failed to release audio GC lock: {e}")
+            self.is_gc_owner = False
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Usage seen by the last GC pass (from whichever process ran it) and this process's GC metrics."""
+        try:
+            usage = json.loads(await self.redis.get(STATS_KEY) or "{}")
+        except Exception as e:
+            usage = {"error": str(e)}
+        return {
+            **usage,
+            "quota_bytes": self.quota_bytes,
+            "gc_owner": self.is_gc_owner,
+            **self.metrics
+        }
+
+
+# Singleton instance
+audio_storage = AudioStorageManager()
@@ -1,247 +1,582 @@
-import redis
+import redis.asyncio as redis
+from redis.asyncio.connection import HIREDIS_AVAILABLE
 import json
 from typing import Optional, Dict, Any, List
 from app.config import get_settings
 
 settings = get_settings()
 
+# A session is stored as one hash for scalar fields plus one list per
+# sequence, so every mutation touches only the field it changes.
+# KEYS order used by all scripts below:
+#   1 session hash, 2 questions, 3 answers, 4 audio_urls, 5 audio_status, 6 transcription_status,
+#   7 answer_evaluations
+SESSION_LISTS = ["questions", "answers", "audio_urls", "audio_status", "transcription_status", "answer_evaluations"]
+
+# Shared Lua prelude: bail out if the session is gone, refresh TTL on every key
+_LUA_PRELUDE = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+local function touch()
+    for i = 1, #KEYS do redis.call('EXPIRE', KEYS[i], ARGV[1]) end
+end
+"""
+
+# ARGV: ttl, list position (index into KEYS), value
+_PUSH_SCRIPT = _LUA_PRELUDE + """
+redis.call('RPUSH', KEYS[tonumber(ARGV[2])], ARGV[3])
+touch()
+return 1
+"""
+
+# ARGV: ttl, list position, value; also advances current_index
+_PUSH_AND_INCREMENT_SCRIPT = _LUA_PRELUDE + """
+redis.call('RPUSH', KEYS[tonumber(ARGV[2])], ARGV[3])
+redis.call('HINCRBY', KEYS[1], 'current_index', 1)
+touch()
+return 1
+"""
+
+# ARGV: ttl, field, value
+_HSET_SCRIPT = _LUA_PRELUDE + """
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+touch()
+return 1
+"""
+
+# ARGV: ttl; returns the new current_index + 1 so 0 always means "missing session"
+_INCREMENT_INDEX_SCRIPT = _LUA_PRELUDE + """
+local value = redis.call('HINCRBY', KEYS[1], 'current_index', 1)
+touch()
+return value + 1
+"""
+
+# ARGV: ttl, count, then count x (list position, index, pad value, value).
+# Pads each list up to the index before LSET so writes can land out of order.
+_SET_ITEMS_SCRIPT = _LUA_PRELUDE + """
+local count = tonumber(ARGV[2])
+for i = 0, count - 1 do
+    local base = 3 + i * 4
+    local key = KEYS[tonumber(ARGV[base])]
+    local index = tonumber(ARGV[base + 1])
+    local length = redis.call('LLEN', key)
+    while length <= index do
+        redis.call('RPUSH', key, ARGV[base + 2])
+        length = length + 1
+    end
+    redis.call('LSET', key, index, ARGV[base + 3])
+end
+touch()
+return 1
+"""
+
+# ARGV: ttl, count, then count urls followed by count statuses
+_SET_AUDIO_SCRIPT = _LUA_PRELUDE + """
+local count = tonumber(ARGV[2])
+redis.call('DEL', KEYS[4], KEYS[5])
+for i = 1, count do
+    redis.call('RPUSH', KEYS[4], ARGV[2 + i])
+    redis.call('RPUSH', KEYS[5], ARGV[2 + count + i])
+end
+touch()
+return 1
+"""
+
+# ARGV: ttl; claims the slot at current_index for an uploaded answer by
+# advancing the index and marking that slot's transcription pending.
+# Returns the claimed index + 1 so 0 always means "missing session".
+_RESERVE_ANSWER_SCRIPT = _LUA_PRELUDE + """
+local index = redis.call('HINCRBY', KEYS[1], 'current_index', 1) - 1
+local length = redis.call('LLEN', KEYS[6])
+while length <= index do
+    redis.call('RPUSH', KEYS[6], '0')
+    length = length + 1
+end
+redis.call('LSET', KEYS[6], index, '0')
+touch()
+return index + 1
+"""
+
+# ARGV: ttl, index, answer. Stores a transcribed answer and marks it complete,
+# unless that slot is already complete (a redelivered transcription job).
+# Returns 1 if stored, 2 if it was already complete.
+_SET_ANSWER_ONCE_SCRIPT = _LUA_PRELUDE + """
+local index = tonumber(ARGV[2])
+if redis.call('LINDEX', KEYS[6], index) == '1' then
+    touch()
+    return 2
+end
+for _, key in ipairs({KEYS[3], KEYS[6]}) do
+    local pad = key == KEYS[3] and 'null' or '0'
+    local length = redis.call('LLEN', key)
+    while length <= index do
+        redis.call('RPUSH', key, pad)
+        length = length + 1
+    end
+end
+redis.call('LSET', KEYS[3], index, ARGV[3])
+redis.call('LSET', KEYS[6], index, '1')
+touch()
+return 1
+"""
+
+# Returns {current_index, question, audio_url, audio_status} at current_index
+_CURRENT_ITEM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return nil end
+local index = tonumber(redis.call('HGET', KEYS[1], 'current_index') or '0')
+return {
+    index,
+    redis.call('LINDEX', KEYS[2], index),
+    redis.call('LINDEX', KEYS[4], index),
+    redis.call('LINDEX', KEYS[5], index)
+}
+"""
+
+
+def _encode_answer(answer: Optional[str]) -> str:
+    # Answers are JSON-encoded so unfilled slots ("null") differ from empty answers
+    return json.dumps(answer)
+
+
+def _decode_answer(value: str) -> Optional[str]:
+    return json.loads(value)
+
+
+def _encode_evaluation(evaluation: Optional[Dict[str, Any]]) -> str:
+    # Same as answers: "null" marks an answer that has not been evaluated yet
+    return json.dumps(evaluation)
+
+
+def _decode_evaluation(value: str) -> Optional[Dict[str, Any]]:
+    return json.loads(value)
+
+
+def _encode_url(url: Optional[str]) -> str:
+    return url or ""
+
+
+def _decode_url(value: Optional[str]) -> Optional[str]:
+    return value or None
+
 
 class CacheManager:
     def __init__(self):
-        self.redis_client = redis.Redis(
+        # One shared pool per process; callers wait for a free connection
+        # (up to redis_pool_timeout) instead of failing when it is exhausted
+        self.pool = redis.BlockingConnectionPool(
             host=settings.redis_host,
             port=settings.redis_port,
             password=settings.redis_password if settings.redis_password else None,
             db=settings.redis_db,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_connect_timeout,
+            health_check_interval=settings.redis_health_check_interval,
             decode_responses=True
         )
+        self.redis_client = redis.Redis(connection_pool=self.pool)
         self.ttl = settings.session_ttl
 
-    def create_session(self, session_id: str, user_id: str, tech_stack: str) -> bool:
+        if not HIREDIS_AVAILABLE:
+            print("hiredis is not installed; Redis replies will use the slower pure-Python parser")
+
+        self._push = self.redis_client.register_script(_PUSH_SCRIPT)
+        self._push_and_increment = self.redis_client.register_script(_PUSH_AND_INCREMENT_SCRIPT)
+        self._hset = self.redis_client.register_script(_HSET_SCRIPT)
+        self._increment_index = self.redis_client.register_script(_INCREMENT_INDEX_SCRIPT)
+        self._set_items = self.redis_client.register_script(_SET_ITEMS_SCRIPT)
+        self._set_audio = self.redis_client.register_script(_SET_AUDIO_SCRIPT)
+        self._reserve_answer = self.redis_client.register_script(_RESERVE_ANSWER_SCRIPT)
+        self._set_answer_once = self.redis_client.register_script(_SET_ANSWER_ONCE_SCRIPT)
+        self._current_item = self.redis_client.register_script(_CURRENT_ITEM_SCRIPT)
+
+    @staticmethod
+    def _keys(session_id: str) -> List[str]:
+        """All Redis keys that make up a session, in script KEYS order"""
+        base = f"session:{session_id}"
+        return [base] + [f"{base}:{name}" for name in SESSION_LISTS]
+
+    @staticmethod
+    def _list_position(name: str) -> int:
+        """1-based position of a session list in the KEYS array"""
+        return SESSION_LISTS.index(name) + 2
+
+    async def create_session(self, session_id: str, user_id: str, tech_stack: str) -> bool:
         """Create a new interview session in cache"""
         session_data = {
             "user_id": user_id,
             "tech_stack": tech_stack,
             "questions": [],
-            "answers": [],
+            "answers": [],  # Indexed by question; None until that answer is transcribed
             "audio_urls": [],  # Store pre-generated audio URLs for questions
+            "audio_status": [],  # Track question audio state ["ready"/"pending"/"failed"]
             "transcription_status": [],  # Track which answers are transcribed [True/False]
+            "answer_evaluations": [],  # Per-answer evaluation dicts by question index; None until scored
             "current_index": 0,
             "is_complete": False
         }
-        return self.set_session(session_id, session_data)
+        return await self.set_session(session_id, session_data)
 
-    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve session data from cache"""
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve session data from cache (single round-trip snapshot)"""
         try:
-            data = self.redis_client.get(f"session:{session_id}")
-            if data:
-                return json.loads(data)
-            return None
+            keys = self._keys(session_id)
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hgetall(keys[0])
+                for key in keys[1:]:
+                    pipe.lrange(key, 0, -1)
+                (fields, questions, answers, audio_urls, audio_status,
+                 transcription_status, answer_evaluations) = await pipe.execute()
+
+            if not fields:
+                return None
+
+            return {
+                "user_id": fields.get("user_id"),
+                "tech_stack": fields.get("tech_stack"),
+                "questions": questions,
+                "answers": [_decode_answer(answer) for answer in answers],
+                "audio_urls": [_decode_url(url) for url in audio_urls],
+                "audio_status": audio_status,
+                "transcription_status": [status == "1" for status in transcription_status],
+                "answer_evaluations": [_decode_evaluation(evaluation) for evaluation in answer_evaluations],
+                "current_index": int(fields.get("current_index", 0)),
+                "is_complete": fields.get("is_complete") == "1"
+            }
         except Exception as e:
             print(f"Error getting session: {e}")
             return None
 
-    def set_session(self, session_id: str, data: Dict[str, Any]) -> bool:
-        """Save session data to cache with TTL"""
+    async def set_session(self, session_id: str, data: Dict[str, Any]) -> bool:
+        """Replace the whole session in cache with TTL"""
         try:
-            self.redis_client.setex(
-                f"session:{session_id}",
-                self.ttl,
-                json.dumps(data)
-            )
+            keys = self._keys(session_id)
+            encoded_lists = {
+                "questions": list(data.get("questions", [])),
+                "answers": [_encode_answer(answer) for answer in data.get("answers", [])],
+                "audio_urls": [_encode_url(url) for url in data.get("audio_urls", [])],
+                "audio_status": list(data.get("audio_status", [])),
+                "transcription_status": ["1" if status else "0" for status in data.get("transcription_status", [])],
+                "answer_evaluations": [
+                    _encode_evaluation(evaluation) for evaluation in data.get("answer_evaluations", [])
+                ]
+            }
+
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(*keys)
+                pipe.hset(keys[0], mapping={
+                    "user_id": data["user_id"],
+                    "tech_stack": data["tech_stack"],
+                    "current_index": data.get("current_index", 0),
+                    "is_complete": "1" if data.get("is_complete") else "0"
+                })
+                for name, key in zip(SESSION_LISTS, keys[1:]):
+                    if encoded_lists[name]:
+                        pipe.rpush(key, *encoded_lists[name])
+                for key in keys:
+                    pipe.expire(key, self.ttl)
+                await pipe.execute()
             return True
         except Exception as e:
             print(f"Error setting session: {e}")
             return False
 
-    def add_question(self, session_id: str, question: str) -> bool:
-        """Add a question to the session"""
-        session = self.get_session(session_id)
-        if not session:
-            return False
+    async def _run(self, script, session_id: str, *args) -> int:
+        """Run a session script, returning 0 if the session is missing or Redis fails"""
+        try:
+            return await script(keys=self._keys(session_id), args=[self.ttl, *args]) or 0
+        except Exception as e:
+            print(f"Error updating session: {e}")
+            return 0
 
-        session["questions"].append(question)
-        return self.set_session(session_id, session)
+    async def add_question(self, session_id: str, question: str) -> bool:
+        """Add a question to the session"""
+        return bool(await self._run(self._push, session_id, self._list_position("questions"), question))
 
-    def add_answer(self, session_id: str, answer: str) -> bool:
+    async def add_answer(self, session_id: str, answer: str) -> bool:
         """Add an answer to the session"""
-        session = self.get_session(session_id)
-        if not session:
-            return False
+        return bool(await self._run(
+            self._push_and_increment, session_id, self._list_position("answers"), _encode_answer(answer)
+        ))
 
-        session["answers"].append(answer)
-        session["current_index"] += 1
-        return self.set_session(session_id, session)
-
-    def add_answer_no_increment(self, session_id: str, answer: str) -> bool:
+    async def add_answer_no_increment(self, session_id: str, answer: str) -> bool:
         """Add an answer to the session without incrementing index (for background tasks)"""
-        session = self.get_session(session_id)
-        if not session:
+        return bool(await self._run(self._push, session_id, self._list_position("answers"), _encode_answer(answer)))
+
+    async def reserve_answer_slot(self, session_id: str) -> Optional[int]:
+        """
+        Atomically claim the current question's answer slot: advances the index and
+        marks that slot's transcription pending. Returns the claimed answer index.
+        """
+        result = await self._run(self._reserve_answer, session_id)
+        return result - 1 if result else None
+
+    async def set_answer(self, session_id: str, answer_index: int, answer: str) -> bool:
+        """Store an answer at its question's index and mark its transcription complete"""
+        return bool(await self._run(
+            self._set_items, session_id, 2,
+            self._list_position("answers"), answer_index, _encode_answer(None), _encode_answer(answer),
+            self._list_position("transcription_status"), answer_index, "0", "1"
+        ))
+
+    async def set_answer_once(self, session_id: str, answer_index: int, answer: str) -> Optional[bool]:
+        """
+        Store a transcribed answer and mark it complete, unless the slot is already
+        complete. Safe to repeat when a transcription job is delivered more than once.
+        Returns True if stored, False if it was already complete, None if the session is missing.
+        """
+        result = await self._run(self._set_answer_once, session_id, answer_index, _encode_answer(answer))
+        if not result:
+            return None
+        return result == 1
+
+    async def set_answer_evaluation(self, session_id: str, answer_index: int,
+                                    evaluation: Dict[str, Any]) -> bool:
+        """Store the evaluation of one answer at its question's index"""
+        return bool(await self._run(
+            self._set_items, session_id, 1,
+            self._list_position("answer_evaluations"), answer_index,
+            _encode_evaluation(None), _encode_evaluation(evaluation)
+        ))
+
+    async def are_all_evaluations_complete(self, session_id: str) -> bool:
+        """Check that every answer is transcribed and every stored answer (even an empty one) has an evaluation"""
+        try:
+            keys = self._keys(session_id)
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.lrange(keys[2], 0, -1)
+                pipe.lrange(keys[5], 0, -1)
+                pipe.lrange(keys[6], 0, -1)
+                answers, transcription_status, answer_evaluations = await pipe.execute()
+        except Exception as e:
+            print(f"Error getting session: {e}")
             return False
 
-        session["answers"].append(answer)
-        return self.set_session(session_id, session)
-
-    def increment_index(self, session_id: str) -> bool:
-        """Increment the current question index"""
-        session = self.get_session(session_id)
-        if not session:
+        if not all(status == "1" for status in transcription_status):
             return False
 
-        session["current_index"] += 1
-        return self.set_session(session_id, session)
+        answers = [_decode_answer(answer) for answer in answers]
+        evaluations = [_decode_evaluation(evaluation) for evaluation in answer_evaluations]
+        return all(
+            i < len(evaluations) and evaluations[i] is not None
+            for i, answer in enumerate(answers)
+            if answer is not None
+        )
+
+    async def increment_index(self, session_id: str) -> bool:
+        """Increment the current question index"""
+        return bool(await self._run(self._increment_index, session_id))
 
-    def get_qa_pairs(self, session_id: str) -> List[Dict[str, str]]:
-        """Get all Q&A pairs from the session"""
-        session = self.get_session(session_id)
-        if not session:
+    async def get_qa_pairs(self, session_id: str) -> List[Dict[str, str]]:
+        """Get all answered Q&A pairs, matching each answer to its question by index"""
+        try:
+            keys = self._keys(session_id)
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.lrange(keys[1], 0, -1)
+                pipe.lrange(keys[2], 0, -1)
+                questions, answers = await pipe.execute()
+        except Exception as e:
+            print(f"Error getting Q&A pairs: {e}")
             return []
 
-        questions = session.get("questions", [])
-        answers = session.get("answers", [])
+        answers = [_decode_answer(answer) for answer in answers]
 
+        # Slots may be unfilled while transcriptions are in flight or after a failure
         return [
-            {"question": q, "answer": a}
-            for q, a in zip(questions, answers)
+            {"question": q, "answer": answers[i]}
+            for i, q in enumerate(questions)
+            if i < len(answers) and answers[i] is not None
         ]
 
-    def mark_complete(self, session_id: str) -> bool:
+    async def mark_complete(self, session_id: str) -> bool:
         """Mark the interview session as complete"""
-        session = self.get_session(session_id)
-        if not session:
-            return False
-
-        session["is_complete"] = True
-        return self.set_session(session_id, session)
+        return bool(await self._run(self._hset, session_id, "is_complete", "1"))
 
-    def delete_session(self, session_id: str) -> bool:
+    async def delete_session(self, session_id: str) -> bool:
         """Delete a session from cache"""
         try:
-            self.redis_client.delete(f"session:{session_id}")
+            await self.redis_client.delete(*self._keys(session_id))
             return True
         except Exception as e:
             print(f"Error deleting session: {e}")
             return False
 
-    def is_session_complete(self, session_id: str) -> bool:
+    async def is_session_complete(self, session_id: str) -> bool:
         """Check if the interview is complete"""
-        session = self.get_session(session_id)
-        if not session:
+        try:
+            return await self.redis_client.hget(self._keys(session_id)[0], "is_complete") == "1"
+        except Exception as e:
+            print(f"Error getting session: {e}")
             return False
-        return session.get("is_complete", False)
 
-    def get_current_question_count(self, session_id: str) -> int:
+    async def get_current_question_count(self, session_id: str) -> int:
         """Get the current question count"""
-        session = self.get_session(session_id)
-        if not session:
+        try:
+            return await self.redis_client.llen(self._keys(session_id)[1])
+        except Exception as e:
+            print(f"Error getting session: {e}")
             return 0
-        return len(session.get("questions", []))
 
-    def set_audio_urls(self, session_id: str, audio_urls: List[str]) -> bool:
+    async def set_audio_urls(self, session_id: str, audio_urls: List[Optional[str]],
+                             audio_status: Optional[List[str]] = None) -> bool:
         """Set all pre-generated audio URLs for questions"""
-        session = self.get_session(session_id)
-        if not session:
-            return False
-
-        session["audio_urls"] = audio_urls
-        return self.set_session(session_id, session)
+        if audio_status is None:
+            audio_status = ["ready" if url else "failed" for url in audio_urls]
+
+        return bool(await self._run(
+            self._set_audio, session_id, len(audio_urls),
+            *[_encode_url(url) for url in audio_urls], *audio_status
+        ))
+
+    async def set_question_audio(self, session_id: str, question_index: int, audio_url: Optional[str]) -> bool:
+        """Store the audio URL for a single question once its TTS finishes (None marks it failed)"""
+        return bool(await self._run(
+            self._set_items, session_id, 2,
+            self._list_position("audio_urls"), question_index, "", _encode_url(audio_url),
+            self._list_position("audio_status"), question_index, "pending", "ready" if audio_url else "failed"
+        ))
+
+    async def _get_current_item(self, session_id: str) -> Optional[List[Any]]:
+        """Fetch [current_index, question, audio_url, audio_status] in one round-trip"""
+        try:
+            return await self._current_item(keys=self._keys(session_id))
+        except Exception as e:
+            print(f"Error getting session: {e}")
+            return None
 
-    def get_current_audio_url(self, session_id: str) -> Optional[str]:
+    async def get_current_audio_url(self, session_id: str) -> Optional[str]:
         """Get the audio URL for the current question"""
-        session = self.get_session(session_id)
-        if not session:
+        item = await self._get_current_item(session_id)
+        if not item:
             return None
+        return _decode_url(item[2])
 
-        current_index = session.get("current_index", 0)
-        audio_urls = session.get("audio_urls", [])
-
-        if current_index < len(audio_urls):
-            return audio_urls[current_index]
-        return None
+    async def get_next_question_data(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the next question, its audio URL and audio status (ready/pending/failed)"""
+        item = await self._get_current_item(session_id)
+        if not item:
+            return None
 
-    def get_next_question_data(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get the next question and its audio URL"""
-        session = self.get_session(session_id)
-        if not session:
+        current_index, question, audio_url, status = item
+        if question is None:
             return None
 
-        current_index = session.get("current_index", 0)
-        questions = session.get("questions", [])
-        audio_urls = session.get("audio_urls", [])
+        audio_url = _decode_url(audio_url)
+        if status is None:
+            status = "ready" if audio_url else "pending"
 
-        if current_index < len(questions):
-            return {
-                "question": questions[current_index],
-                "audio_url": audio_urls[current_index] if current_index < len(audio_urls) else None,
-                "question_number": current_index + 1
-            }
-        return None
+        return {
+            "question": question,
+            "audio_url": audio_url,
+            "audio_status": status,
+            "question_number": current_index + 1
+        }
 
-    def mark_transcription_pending(self, session_id: str) -> bool:
-        """Mark that a new transcription is pending"""
-        session = self.get_session(session_id)
-        if not session:
-            return False
+    async def mark_transcription_pending(self, session_id: str, answer_index: Optional[int] = None) -> bool:
+        """Mark that a new transcription (or the one for answer_index) is pending"""
+        if answer_index is None:
+            return bool(await self._run(self._push, session_id, self._list_position("transcription_status"), "0"))
 
-        # Add False to indicate pending transcription
-        if "transcription_status" not in session:
-            session["transcription_status"] = []
-        session["transcription_status"].append(False)
-        return self.set_session(session_id, session)
+        return bool(await self._run(
+            self._set_items, session_id, 1,
+            self._list_position("transcription_status"), answer_index, "0", "0"
+        ))
 
-    def mark_transcription_complete(self, session_id: str, answer_index: int) -> bool:
+    async def mark_transcription_complete(self, session_id: str, answer_index: int) -> bool:
         """Mark that a specific answer's transcription is complete"""
-        session = self.get_session(session_id)
-        if not session:
-            return False
+        return bool(await self._run(
+            self._set_items, session_id, 1,
+            self._list_position("transcription_status"), answer_index, "0", "1"
+        ))
 
-        if "transcription_status" not in session:
-            session["transcription_status"] = []
-
-        # Ensure the list is long enough
-        while len(session["transcription_status"]) <= answer_index:
-            session["transcription_status"].append(False)
+    async def is_transcription_complete(self, session_id: str, answer_index: int) -> bool:
+        """Check whether one answer's transcription is complete"""
+        try:
+            return await self.redis_client.lindex(self._keys(session_id)[5], answer_index) == "1"
+        except Exception as e:
+            print(f"Error getting session: {e}")
+            return False
 
-        session["transcription_status"][answer_index] = True
-        return self.set_session(session_id, session)
+    async def needs_evaluation(self, session_id: str, answer_index: int) -> bool:
+        """Check whether a stored answer has no evaluation yet (or only a failed one)"""
+        try:
+            keys = self._keys(session_id)
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.lindex(keys[2], answer_index)
+                pipe.lindex(keys[6], answer_index)
+                answer, evaluation = await pipe.execute()
+        except Exception as e:
+            print(f"Error getting session: {e}")
+            return False
 
-    def are_all_transcriptions_complete(self, session_id: str) -> bool:
-        """Check if all transcriptions are complete"""
-        session = self.get_session(session_id)
-        if not session:
+        if answer is None or _decode_answer(answer) is None:
             return False
+        evaluation = _decode_evaluation(evaluation) if evaluation is not None else None
+        return evaluation is None or "error" in evaluation
 
-        answers = session.get("answers", [])
-        transcription_status = session.get("transcription_status", [])
+    async def _get_transcription_status(self, session_id: str) -> Optional[List[str]]:
+        """Fetch the per-answer transcription statuses"""
+        try:
+            return await self.redis_client.lrange(self._keys(session_id)[5], 0, -1)
+        except Exception as e:
+            print(f"Error getting session: {e}")
+            return None
 
-        # All answers should have corresponding transcription status
-        if len(transcription_status) != len(answers):
+    async def are_all_transcriptions_complete(self, session_id: str) -> bool:
+        """Check if all transcriptions are complete"""
+        transcription_status = await self._get_transcription_status(session_id)
+        if transcription_status is None:
             return False
 
-        # All should be True
-        return all(transcription_status)
+        # Every reserved answer slot has its own status, so all should be True
+        return all(status == "1" for status in transcription_status)
 
-    def get_transcription_progress(self, session_id: str) -> Dict[str, int]:
+    async def get_transcription_progress(self, session_id: str) -> Dict[str, int]:
         """Get transcription progress"""
-        session = self.get_session(session_id)
-        if not session:
+        transcription_status = await self._get_transcription_status(session_id)
+        if not transcription_status:
             return {"total": 0, "completed": 0}
 
-        transcription_status = session.get("transcription_status", [])
         return {
             "total": len(transcription_status),
-            "completed": sum(1 for status in transcription_status if status)
+            "completed": sum(1 for status in transcription_status if status == "1")
         }
 
-    def ping(self) -> bool:
+    async def ping(self) -> bool:
         """Check if Redis connection is alive"""
         try:
-            return self.redis_client.ping()
+            return await self.redis_client.ping()
         except Exception as e:
             print(f"Redis connection error: {e}")
             return False
 
+    async def get_live_session_audio(self) -> Dict[str, List[str]]:
+        """
+        Audio URLs of every live session (session_id -> urls), so storage GC can keep their files.
+        Unlike the other getters this raises on Redis errors: an empty answer would let GC delete files in use.
+        """
+        sessions: Dict[str, List[str]] = {}
+        audio_keys = []
+        async for key in self.redis_client.scan_iter(match="session:*", count=1000):
+            parts = key.split(":")
+            sessions.setdefault(parts[1], [])
+            if len(parts) == 3 and parts[2] == "audio_urls":
+                audio_keys.append(key)
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key in audio_keys:
+                pipe.lrange(key, 0, -1)
+            url_lists = await pipe.execute()
+
+        for key, urls in zip(audio_keys, url_lists):
+            sessions[key.split(":")[1]].extend(url for url in map(_decode_url, urls) if url)
+        return sessions
+
+    async def close(self) -> None:
+        """Close the client and release all pooled connections"""
+        await self.redis_client.aclose()
+        await self.pool.aclose()
+
 
 # Singleton instance
 cache_manager = CacheManager()
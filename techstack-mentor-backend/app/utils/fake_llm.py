@@ -0,0 +1,121 @@
+"""
+Offline chat model for development and tests.
+
+Select it with a "fake:<name>" entry in an LLM chain. It never calls a
+network service and replies with canned output that passes the same schema
+validation as real replies: the schema is taken from the bound
+response_format, or recognised from the JSON keys the prompt asks for.
+Latency and failures can be simulated to exercise routing and failover.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Tags cycled through by fake question sets: 20/60/20 difficulty, topics weighted like the prompt asks
+_FAKE_DIFFICULTIES = ["beginner", "intermediate", "intermediate", "intermediate", "advanced"]
+_FAKE_TOPICS = ["fundamentals", "best_practices", "real_world", "fundamentals", "best_practices",
+                "real_world", "performance_security", "fundamentals", "advanced_ecosystem", "real_world"]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning canned, schema-valid replies without network calls."""
+
+    model_name: str = "fake"
+    latency: float = 0.0  # Seconds to wait before replying
+    error_rate: float = 0.0  # Fraction of calls that raise
+
+    _counter: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @staticmethod
+    def _schema_name(text: str, response_format: Optional[Dict[str, Any]]) -> Optional[str]:
+        if response_format:
+            return response_format.get("json_schema", {}).get("name")
+        if "correct_count" in text:
+            return "InterviewEvaluation"
+        if '"correct"' in text:
+            return "AnswerEvaluation"
+        if '"questions"' in text:
+            return "GeneratedQuestions"
+        return None
+
+    def _reply(self, messages: List[BaseMessage], response_format: Optional[Dict[str, Any]]) -> str:
+        if self._counter is None:
+            self._counter = itertools.count(1)
+
+        text = "\n".join(str(message.content) for message in messages)
+        schema_name = self._schema_name(text, response_format)
+
+        if schema_name == "GeneratedQuestions":
+            match = re.search(r"with (\d+) questions", text)
+            count = int(match.group(1)) if match else 5
+            return json.dumps({"questions": [
+                {
+                    "question": f"Fake question {next(self._counter)}: explain a core concept and when to use it.",
+                    "difficulty": _FAKE_DIFFICULTIES[i % len(_FAKE_DIFFICULTIES)],
+                    "topic": _FAKE_TOPICS[i % len(_FAKE_TOPICS)]
+                }
+                for i in range(count)
+            ]})
+
+        if schema_name == "InterviewEvaluation":
+            return json.dumps({
+                "score": 7.0,
+                "feedback": "Fake evaluation: answers covered the fundamentals with room for more depth.",
+                "missed_topics": ["Testing strategies"],
+                "improvement_areas": "Practice explaining trade-offs with concrete examples.",
+                "strengths": ["Clear explanations"],
+                "correct_count": 0
+            })
+
+        if schema_name == "AnswerEvaluation":
+            return json.dumps({
+                "score": 7.0,
+                "correct": True,
+                "feedback": "Fake evaluation: solid answer.",
+                "strengths": ["Clear explanation"],
+                "missed_topics": [],
+                "improvement_areas": "Add a real-world example."
+            })
+
+        return f"Fake follow-up question {next(self._counter)}: how would you test this in production?"
+
+    def _result(self, messages: List[BaseMessage], **kwargs: Any) -> ChatResult:
+        if self.error_rate and random.random() < self.error_rate:
+            raise RuntimeError(f"Simulated failure from fake model {self.model_name}")
+
+        content = self._reply(messages, kwargs.get("response_format"))
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4
+        output_tokens = len(content) // 4
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages, **kwargs)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages, **kwargs)
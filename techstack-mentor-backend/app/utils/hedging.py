@@ -0,0 +1,147 @@
+"""
+Hedged requests.
+
+A hedged call starts one request and, if it has not finished after the hedge
+delay, starts a second identical request. Whichever succeeds first wins and
+the other is cancelled. The delay adapts per kind of call: it is the
+`hedge_percentile` of recent latencies (and at least
+`hedge_min_delay_seconds`), so only the slow tail gets a second request.
+The latencies are those of first requests: when a hedge wins, the time the
+first request had been running is recorded as a lower bound on its latency,
+so cutting off the slow tail does not pull the percentile (and the delay) down.
+Hedges are capped by a per-minute budget shared by all hedged calls in the
+process, so a general slowdown cannot double the request rate.
+"""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from app.config import get_settings
+from app.utils.latency_tracker import LatencyTracker
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class HedgeBudget:
+    """Sliding one-minute cap on the number of hedge requests."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._sent: Deque[float] = deque()
+
+    def try_acquire(self) -> bool:
+        """Take one hedge from the budget; False if this minute's budget is spent."""
+        now = time.monotonic()
+        while self._sent and now - self._sent[0] >= 60:
+            self._sent.popleft()
+        if len(self._sent) >= self.per_minute:
+            return False
+        self._sent.append(now)
+        return True
+
+    @property
+    def used(self) -> int:
+        now = time.monotonic()
+        return sum(1 for sent in self._sent if now - sent < 60)
+
+
+class Hedger:
+    """Runs calls with an adaptive hedge delay, tracking latency per key."""
+
+    def __init__(self, enabled: bool, budget: HedgeBudget):
+        self.enabled = enabled
+        self.budget = budget
+        self.percentile = settings.hedge_percentile
+        self.min_delay = settings.hedge_min_delay_seconds
+        self.min_samples = settings.hedge_min_samples
+
+        self.trackers: Dict[str, LatencyTracker] = defaultdict(
+            lambda: LatencyTracker(settings.hedge_window, settings.hedge_max_sample_age)
+        )
+        # key -> counters
+        self.metrics: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "hedged": 0, "hedge_wins": 0, "budget_exhausted": 0}
+        )
+
+    def delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None while there is too little data."""
+        tracker = self.trackers[key]
+        threshold = tracker.percentile(self.percentile)
+        if len(tracker) < self.min_samples or threshold is None:
+            return None
+        return max(self.min_delay, threshold)
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await call(), hedging it with a second call() if it is slow.
+
+        Args:
+            key: Kind of call whose latencies set the hedge delay (e.g. a model spec)
+            call: Function starting one request; it is called again for the hedge
+
+        Returns:
+            The result of whichever request succeeded first
+
+        Raises:
+            Exception: The error of the last request to fail, if none succeeded
+        """
+        metrics = self.metrics[key]
+        metrics["calls"] += 1
+        delay = self.delay(key) if self.enabled else None
+
+        started = hedge_started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        tasks = [primary]
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not primary.done():
+                    if self.budget.try_acquire():
+                        metrics["hedged"] += 1
+                        hedge_started = time.monotonic()
+                        tasks.append(asyncio.ensure_future(call()))
+                    else:
+                        metrics["budget_exhausted"] += 1
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is not primary:
+                        metrics["hedge_wins"] += 1
+                    if primary.done() and primary.exception() is not None:
+                        # The primary failed; the hedge stands in as an ordinary request
+                        self.trackers[key].record(time.monotonic() - hedge_started, ok=True)
+                    else:
+                        # The primary took at least this long, even if the hedge finished first
+                        self.trackers[key].record(time.monotonic() - started, ok=True)
+                    return task.result()
+            raise error
+        finally:
+            # Cancel the loser (or both, if the caller was cancelled)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hedge counters and current hedge delay per key."""
+        return {
+            "enabled": self.enabled,
+            "keys": {
+                key: {**metrics, "hedge_delay_seconds": self.delay(key)}
+                for key, metrics in self.metrics.items()
+            }
+        }
+
+
+# Singleton instances: one budget shared by all hedged calls in this process
+hedge_budget = HedgeBudget(settings.hedge_budget_per_minute)
+llm_hedger = Hedger(settings.llm_hedging_enabled, hedge_budget)
+transcription_hedger = Hedger(settings.transcription_hedging_enabled, hedge_budget)
@@ -0,0 +1,54 @@
+"""
+Rolling latency statistics.
+
+Used by the LLM router (failover thresholds, model health) and by request
+hedging (adaptive hedge delay).
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies and outcomes for one kind of call."""
+
+    def __init__(self, window: int, max_age: float):
+        self.samples: Deque[Tuple[float, float, bool]] = deque(maxlen=window)  # (recorded at, latency, ok)
+        self.max_age = max_age
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.samples.append((time.monotonic(), latency, ok))
+
+    def recent(self) -> List[Tuple[float, bool]]:
+        """(latency, ok) of samples younger than max_age."""
+        cutoff = time.monotonic() - self.max_age
+        return [(latency, ok) for recorded_at, latency, ok in self.samples if recorded_at >= cutoff]
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile of successful call latencies, or None without data."""
+        latencies = sorted(latency for latency, ok in self.recent() if ok)
+        if not latencies:
+            return None
+        return latencies[max(0, math.ceil(q / 100 * len(latencies)) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        samples = self.recent()
+        if not samples:
+            return 0.0
+        return sum(1 for _, ok in samples if not ok) / len(samples)
+
+    def __len__(self) -> int:
+        return len(self.recent())
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "samples": len(self),
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3)
+        }
@@ -0,0 +1,230 @@
+"""
+LLM response cache.
+
+Responses are cached in Redis per call site (e.g. "next_question"):
+- exact match on a hash of the model name and the full prompt, and
+- optionally, a semantic match: the prompt is embedded and compared by cosine
+  similarity with the prompts already cached for that call site, so
+  near-identical contexts reuse a response.
+
+Entries expire after `llm_cache_ttl`, and each call site keeps at most
+`llm_cache_max_entries`, evicting the least recently used. The semantic
+lookup only compares the `llm_cache_semantic_candidates` most recently used
+entries, so its cost does not grow with the cache. Embedding requests go
+through `openai_governor` like every other OpenAI call.
+"""
+
+import base64
+import hashlib
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+from app.utils.rate_limiter import openai_governor
+
+settings = get_settings()
+
+
+class LLMResponseCache:
+    """Redis-backed exact and semantic cache for LLM responses, with LRU and TTL."""
+
+    def __init__(self):
+        self.enabled = settings.llm_cache_enabled
+        self.ttl = settings.llm_cache_ttl
+        self.max_entries = settings.llm_cache_max_entries
+        self.semantic_enabled = settings.llm_cache_semantic_enabled
+        self.similarity_threshold = settings.llm_cache_similarity_threshold
+        self.semantic_candidates = settings.llm_cache_semantic_candidates
+        self._embeddings: Optional[OpenAIEmbeddings] = None
+
+        # call site -> counters
+        self.metrics: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "semantic_hits": 0, "misses": 0, "bypassed": 0, "errors": 0}
+        )
+
+    @property
+    def redis(self):
+        return cache_manager.redis_client
+
+    @property
+    def embeddings(self) -> OpenAIEmbeddings:
+        if self._embeddings is None:
+            self._embeddings = OpenAIEmbeddings(
+                model=settings.llm_cache_embedding_model,
+                dimensions=settings.llm_cache_embedding_dimensions,
+                openai_api_key=settings.openai_api_key,
+                max_retries=0  # Retried by openai_governor, within the embeddings quota
+            )
+        return self._embeddings
+
+    @staticmethod
+    def prompt_hash(prompt: str, model: str = "") -> str:
+        """Exact-match key for a prompt sent to a given model."""
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _entry_key(call_site: str, prompt_hash: str) -> str:
+        return f"llm_cache:{call_site}:{prompt_hash}"
+
+    @staticmethod
+    def _lru_key(call_site: str) -> str:
+        return f"llm_cache:{call_site}:lru"
+
+    @staticmethod
+    def _vectors_key(call_site: str) -> str:
+        return f"llm_cache:{call_site}:vectors"
+
+    @staticmethod
+    def _encode_vector(vector: np.ndarray) -> str:
+        return base64.b64encode(vector.astype(np.float32).tobytes()).decode("ascii")
+
+    @staticmethod
+    def _decode_vector(value: str) -> np.ndarray:
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+
+    async def _embed(self, text: str) -> np.ndarray:
+        """Unit-length embedding, so a dot product is the cosine similarity."""
+        embedding = await openai_governor.call("embeddings", lambda: self.embeddings.aembed_query(text))
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def _get_entry(self, call_site: str, prompt_hash: str) -> Optional[str]:
+        """Cached response for an exact prompt hash, marking it recently used."""
+        response = await self.redis.get(self._entry_key(call_site, prompt_hash))
+        if response is not None:
+            await self.redis.zadd(self._lru_key(call_site), {prompt_hash: time.time()})
+        return response
+
+    async def _get_similar(self, call_site: str, vector: np.ndarray) -> Optional[str]:
+        """Cached response for the most similar recent prompt above the similarity threshold."""
+        recent = await self.redis.zrevrange(self._lru_key(call_site), 0, self.semantic_candidates - 1)
+        if not recent:
+            return None
+
+        stored = await self.redis.hmget(self._vectors_key(call_site), recent)
+        hashes = [h for h, value in zip(recent, stored) if value is not None]
+        if not hashes:
+            return None
+
+        matrix = np.stack([self._decode_vector(value) for value in stored if value is not None])
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        response = await self._get_entry(call_site, hashes[best])
+        if response is None:
+            # Entry expired by TTL; drop it from the indexes
+            await self._forget(call_site, [hashes[best]])
+        return response
+
+    async def _forget(self, call_site: str, prompt_hashes: list) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*[self._entry_key(call_site, h) for h in prompt_hashes])
+            pipe.zrem(self._lru_key(call_site), *prompt_hashes)
+            pipe.hdel(self._vectors_key(call_site), *prompt_hashes)
+            await pipe.execute()
+
+    async def _store(self, call_site: str, prompt_hash: str, response: str,
+                     vector: Optional[np.ndarray]) -> None:
+        """Store a response, then evict least recently used entries above max_entries."""
+        lru_key = self._lru_key(call_site)
+        vectors_key = self._vectors_key(call_site)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._entry_key(call_site, prompt_hash), response, ex=self.ttl)
+            pipe.zadd(lru_key, {prompt_hash: time.time()})
+            pipe.expire(lru_key, self.ttl)
+            if vector is not None:
+                pipe.hset(vectors_key, prompt_hash, self._encode_vector(vector))
+                pipe.expire(vectors_key, self.ttl)
+            pipe.zcard(lru_key)
+            results = await pipe.execute()
+
+        excess = results[-1] - self.max_entries
+        if excess > 0:
+            evicted = await self.redis.zpopmin(lru_key, excess)
+            await self._forget(call_site, [prompt_hash for prompt_hash, _ in evicted])
+
+    async def get_or_compute(
+        self,
+        call_site: str,
+        prompt: str,
+        compute: Callable[[], Awaitable[str]],
+        model: str = "",
+        bypass: bool = False
+    ) -> str:
+        """
+        Return the cached response for a prompt, or compute and cache it.
+
+        Redis errors never fail the call; the response is computed instead.
+
+        Args:
+            call_site: Name of the calling feature, used for keys and metrics
+            prompt: Full prompt sent to the model
+            compute: Coroutine function that calls the model on a miss
+            model: Model name, so different models never share entries
+            bypass: Skip the lookup for this request (the fresh response is still stored)
+
+        Returns:
+            The model response
+        """
+        metrics = self.metrics[call_site]
+        if not self.enabled:
+            return await compute()
+
+        prompt_hash = self.prompt_hash(prompt, model)
+        vector = None
+        cached = None
+
+        if bypass:
+            metrics["bypassed"] += 1
+        else:
+            try:
+                cached = await self._get_entry(call_site, prompt_hash)
+                if cached is not None:
+                    metrics["hits"] += 1
+                elif self.semantic_enabled:
+                    vector = await self._embed(prompt)
+                    cached = await self._get_similar(call_site, vector)
+                    if cached is not None:
+                        metrics["semantic_hits"] += 1
+            except Exception as e:
+                print(f"LLM cache lookup failed for {call_site}: {e}")
+                metrics["errors"] += 1
+
+        if cached is not None:
+            return cached
+
+        if not bypass:
+            metrics["misses"] += 1
+        response = await compute()
+
+        try:
+            if self.semantic_enabled and vector is None:
+                vector = await self._embed(prompt)
+            await self._store(call_site, prompt_hash, response, vector)
+        except Exception as e:
+            print(f"LLM cache store failed for {call_site}: {e}")
+            metrics["errors"] += 1
+
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per call site."""
+        stats = {}
+        for call_site, metrics in self.metrics.items():
+            lookups = metrics["hits"] + metrics["semantic_hits"] + metrics["misses"]
+            stats[call_site] = {
+                **metrics,
+                "hit_rate": round((metrics["hits"] + metrics["semantic_hits"]) / lookups, 3) if lookups else 0.0
+            }
+        return {"enabled": self.enabled, "semantic_enabled": self.semantic_enabled, "call_sites": stats}
+
+
+# Singleton instance
+llm_cache = LLMResponseCache()
@@ -0,0 +1,263 @@
+"""
+LLM provider router.
+
+Each call type (question generation, follow-up questions, evaluation) has a
+chain of models, e.g. "openai:gpt-4o-mini,anthropic:claude-3-5-haiku-latest".
+A call goes to the first model in its chain and fails over to the next one
+when that model errors or is slow. "Slow" means running longer than
+`llm_failover_p95_multiplier` x the model's rolling p95 latency (and at least
+`llm_failover_min_seconds`). Models whose rolling error rate exceeds
+`llm_router_max_error_rate` are moved to the end of the chain; samples older
+than `llm_router_max_sample_age` are ignored, so such models get retried.
+With `llm_hedging_enabled`, each attempt is also hedged against the same
+model (see hedging) before the slow threshold is reached.
+
+Providers: "openai", "anthropic" and "fake" (offline canned replies, see fake_llm).
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+from app.config import get_settings
+from app.utils.hedging import llm_hedger
+from app.utils.latency_tracker import LatencyTracker
+from app.utils.rate_limiter import openai_governor
+
+settings = get_settings()
+
+# Call site (as used in LLMService) -> call type that selects the model chain
+CALL_TYPES = {
+    "questions": "questions",
+    "next_question": "followup",
+    "evaluation": "evaluation",
+    "answer_evaluation": "evaluation"
+}
+
+# Providers that accept an OpenAI-style response_format
+RESPONSE_FORMAT_PROVIDERS = {"openai", "fake"}
+
+# Turns a model into the runnable actually invoked (e.g. binding response_format)
+Prepare = Callable[[str, BaseChatModel], Runnable]
+
+
+class LLMRouter:
+    """Routes each LLM call type to a chain of provider models with latency-aware failover."""
+
+    def __init__(self):
+        self.chains: Dict[str, List[str]] = {
+            "questions": self.parse_chain(settings.llm_questions_chain or settings.llm_default_chain),
+            "followup": self.parse_chain(settings.llm_followup_chain or settings.llm_default_chain),
+            "evaluation": self.parse_chain(settings.llm_evaluation_chain or settings.llm_default_chain)
+        }
+        self.min_samples = settings.llm_router_min_samples
+        self.max_error_rate = settings.llm_router_max_error_rate
+        self.p95_multiplier = settings.llm_failover_p95_multiplier
+        self.min_failover_seconds = settings.llm_failover_min_seconds
+
+        self._models: Dict[str, BaseChatModel] = {}
+        self.trackers: Dict[str, LatencyTracker] = defaultdict(
+            lambda: LatencyTracker(settings.llm_router_window, settings.llm_router_max_sample_age)
+        )
+
+    @staticmethod
+    def parse_chain(value: str) -> List[str]:
+        """Parse "provider:model,provider:model" into a list of model specs."""
+        chain = [spec.strip() for spec in value.split(",") if spec.strip()]
+        if not chain:
+            raise ValueError("LLM chain must contain at least one provider:model")
+        for spec in chain:
+            LLMRouter.split_spec(spec)
+        return chain
+
+    @staticmethod
+    def split_spec(spec: str) -> Tuple[str, str]:
+        """Split "provider:model" (a bare model name means OpenAI)."""
+        provider, _, model = spec.partition(":")
+        if not model:
+            provider, model = "openai", provider
+        if provider not in ("openai", "anthropic", "fake"):
+            raise ValueError(f"Unknown LLM provider in {spec!r}")
+        return provider, model
+
+    def _create_model(self, spec: str) -> BaseChatModel:
+        provider, model = self.split_spec(spec)
+
+        if provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+            return ChatAnthropic(
+                model=model,
+                temperature=settings.llm_temperature,
+                anthropic_api_key=settings.anthropic_api_key
+            )
+
+        if provider == "fake":
+            from app.utils.fake_llm import FakeChatModel
+            return FakeChatModel(
+                model_name=model,
+                latency=settings.llm_fake_latency_ms / 1000,
+                error_rate=settings.llm_fake_error_rate
+            )
+
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=model,
+            temperature=settings.llm_temperature,
+            openai_api_key=settings.openai_api_key,
+            max_retries=0  # Retried by openai_governor, within the chat quota
+        )
+
+    def get_model(self, spec: str) -> BaseChatModel:
+        """Chat model for a spec, created on first use."""
+        if spec not in self._models:
+            self._models[spec] = self._create_model(spec)
+        return self._models[spec]
+
+    def supports_response_format(self, spec: str) -> bool:
+        return self.split_spec(spec)[0] in RESPONSE_FORMAT_PROVIDERS
+
+    def _request(self, spec: str, runnable: Runnable, prompt: Any) -> Awaitable[AIMessage]:
+        """One request to a model; OpenAI requests go through the shared rate limiter."""
+        if self.split_spec(spec)[0] == "openai":
+            return openai_governor.call("chat", lambda: runnable.ainvoke(prompt))
+        return runnable.ainvoke(prompt)
+
+    @asynccontextmanager
+    async def stream_slot(self, spec: str) -> AsyncIterator[None]:
+        """Hold a rate-limited request slot for a streamed response from a model."""
+        if self.split_spec(spec)[0] == "openai":
+            async with openai_governor.slot("chat"):
+                yield
+        else:
+            yield
+
+    def configured_chain(self, call_site: str) -> List[str]:
+        """Models configured for a call site, in configured order ("evaluation:repair" routes as "evaluation")."""
+        return self.chains[CALL_TYPES.get(call_site.split(":")[0], "followup")]
+
+    def chain_key(self, call_site: str) -> str:
+        """Stable identifier of a call site's chain, e.g. for cache keys."""
+        return ",".join(self.configured_chain(call_site))
+
+    def chain(self, call_site: str) -> List[str]:
+        """Models to try for a call site: configured order, unhealthy models last."""
+        return sorted(self.configured_chain(call_site), key=lambda spec: not self.is_healthy(spec))
+
+    def primary_model_name(self, call_site: str) -> str:
+        """Model name (without provider) that a call site normally uses."""
+        return self.split_spec(self.configured_chain(call_site)[0])[1]
+
+    def is_healthy(self, spec: str) -> bool:
+        tracker = self.trackers[spec]
+        return len(tracker) < self.min_samples or tracker.error_rate <= self.max_error_rate
+
+    def slow_threshold(self, spec: str) -> Optional[float]:
+        """Seconds after which a call to this model is abandoned for the next model."""
+        tracker = self.trackers[spec]
+        p95 = tracker.percentile(95)
+        if len(tracker) < self.min_samples or p95 is None:
+            return None
+        return max(self.min_failover_seconds, p95 * self.p95_multiplier)
+
+    def record(self, spec: str, latency: float, ok: bool) -> None:
+        self.trackers[spec].record(latency, ok)
+
+    async def ainvoke(self, call_site: str, prompt: Any, timeout: float,
+                      prepare: Optional[Prepare] = None) -> Tuple[AIMessage, str]:
+        """
+        Invoke the chain for a call site, failing over on errors and slow models.
+
+        Args:
+            call_site: LLMService call site (selects the chain)
+            prompt: Prompt text or messages
+            timeout: Overall time budget in seconds across all attempts
+            prepare: Optional per-model wrapper (e.g. to bind response_format)
+
+        Returns:
+            The response message and the spec of the model that produced it
+
+        Raises:
+            asyncio.TimeoutError: If the time budget runs out
+            Exception: The last model's error if every model failed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        chain = self.chain(call_site)
+        last_error: Optional[Exception] = None
+
+        for position, spec in enumerate(chain):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            # The last model gets whatever time is left; earlier ones only their slow threshold
+            attempt_timeout = remaining
+            threshold = self.slow_threshold(spec)
+            is_last = position == len(chain) - 1
+            if not is_last and threshold is not None:
+                attempt_timeout = min(remaining, threshold)
+
+            model = self.get_model(spec)
+            runnable = prepare(spec, model) if prepare else model
+            started = loop.time()
+            try:
+                response = await asyncio.wait_for(
+                    llm_hedger.run(spec, lambda: self._request(spec, runnable, prompt)),
+                    timeout=attempt_timeout
+                )
+            except asyncio.TimeoutError as e:
+                self.record(spec, loop.time() - started, ok=False)
+                last_error = e
+                if not is_last:
+                    print(f"LLM {spec} slow for {call_site} (>{attempt_timeout:.1f}s), failing over")
+                continue
+            except Exception as e:
+                self.record(spec, loop.time() - started, ok=False)
+                last_error = e
+                print(f"LLM {spec} failed for {call_site}: {e}")
+                continue
+
+            self.record(spec, loop.time() - started, ok=True)
+            return response, spec
+
+        if last_error is None or isinstance(last_error, asyncio.TimeoutError):
+            raise asyncio.TimeoutError()
+        raise last_error
+
+    def invoke(self, call_site: str, prompt: Any, prepare: Optional[Prepare] = None) -> Tuple[AIMessage, str]:
+        """Blocking version of ainvoke: fails over on errors only."""
+        last_error: Optional[Exception] = None
+        for spec in self.chain(call_site):
+            model = self.get_model(spec)
+            runnable = prepare(spec, model) if prepare else model
+            started = time.monotonic()
+            try:
+                response = runnable.invoke(prompt)
+            except Exception as e:
+                self.record(spec, time.monotonic() - started, ok=False)
+                last_error = e
+                print(f"LLM {spec} failed for {call_site}: {e}")
+                continue
+
+            self.record(spec, time.monotonic() - started, ok=True)
+            return response, spec
+
+        raise last_error
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Chains per call type and rolling latency/error stats per model."""
+        return {
+            "chains": self.chains,
+            "models": {
+                spec: {**tracker.snapshot(), "healthy": self.is_healthy(spec)}
+                for spec, tracker in self.trackers.items()
+            }
+        }
+
+
+# Singleton instance
+llm_router = LLMRouter()
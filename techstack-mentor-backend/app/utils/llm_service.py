@@ -1,29 +1,220 @@
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.chains import ConversationChain
-from typing import Dict, List, Tuple
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, Union
+import asyncio
 import json
+import time
 from app.config import get_settings
+from app.schemas.evaluation import GeneratedQuestions, InterviewEvaluation, AnswerEvaluation
+from app.utils.llm_cache import llm_cache
+from app.utils.llm_router import Prepare, llm_router
+from app.utils.prompt_budget import count_tokens, fit_to_budget
 
 settings = get_settings()
 
+# A prompt is either plain text or a list of chat messages
+Prompt = Union[str, List[BaseMessage]]
+
+# Static evaluation instructions, kept free of per-interview values and sent as the
+# first message. At about 700 tokens it is below the providers' minimum cacheable
+# prefix, so it is not prompt-cached on its own.
+EVALUATION_RUBRIC = """You are an expert technical interviewer evaluating mock interviews. The user message gives the tech stack and the interview transcript.
+
+EVALUATION INSTRUCTIONS:
+
+1. VALIDATION CHECK:
+   - Verify each answer contains actual content (not just "Audio response" or empty)
+   - If any answers appear incomplete, note this in feedback
+   - Only evaluate based on actual provided responses
+
+2. SCORING RUBRIC (0-10 scale):
+
+   9-10 (Expert): Deep technical understanding, correct use of best practices, handles edge cases,
+                  provides real-world examples, demonstrates senior-level knowledge
+
+   7-8 (Strong): Solid fundamentals, good technical accuracy, understands core concepts,
+                 minor gaps in advanced topics or best practices
+
+   5-6 (Intermediate): Basic understanding, some correct answers, missing depth or detail,
+                       gaps in best practices or architecture knowledge
+
+   3-4 (Beginner): Superficial knowledge, significant gaps, incorrect concepts,
+                   lacks practical application understanding
+
+   0-2 (Insufficient): Major misunderstandings, mostly incorrect, incomplete responses,
+                       fundamental concept confusion
+
+3. EVALUATION CRITERIA (Per Answer):
+
+   For EACH question, assess:
+   - Technical Accuracy (0-3 points): Is the answer factually correct?
+   - Depth & Detail (0-3 points): Does it show deep understanding vs surface knowledge?
+   - Practical Application (0-2 points): Real-world usage, examples, scenarios
+   - Best Practices (0-2 points): Follows industry standards, security, performance
+
+4. TECH STACK SPECIFIC EVALUATION:
+
+   For the interview's tech stack, specifically check:
+   - Core concepts and fundamentals understanding
+   - Common patterns and anti-patterns knowledge
+   - Performance and optimization awareness
+   - Security best practices
+   - Real-world application experience
+   - Ecosystem and tooling familiarity
+
+5. FEEDBACK REQUIREMENTS:
+   - Be specific with examples from their answers
+   - Point out what was good AND what needs improvement
+   - Provide actionable next steps
+   - Mention specific resources or topics to study
+   - Be encouraging but honest
+
+6. MISSED TOPICS:
+   - List specific topics of the interview's tech stack that should have been covered but weren't
+   - Include fundamentals, intermediate, and advanced topics
+   - Be specific (e.g., "React Hooks lifecycle" not just "React")
+
+Provide your evaluation in EXACT JSON format:
+{
+    "score": <number 0-10 with one decimal, e.g., 7.5>,
+    "feedback": "<3-5 sentence detailed, specific feedback with examples>",
+    "missed_topics": ["specific topic 1", "specific topic 2", ...],
+    "improvement_areas": "<specific actionable advice on what to study/practice>",
+    "strengths": ["specific strength 1", "specific strength 2", ...],
+    "correct_count": <number of questions answered well>
+}
+
+IMPORTANT: Return ONLY valid JSON, no markdown, no explanations, just the JSON object."""
+
+EVALUATION_RUBRIC_MESSAGE = SystemMessage(content=EVALUATION_RUBRIC)
+
+
+class LLMOutputError(Exception):
+    """Raised when the model's output still fails schema validation after the repair retry."""
+
 
 class LLMService:
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7,
-            openai_api_key=settings.openai_api_key
-        )
+        self.router = llm_router
         self.max_questions = settings.max_questions_per_interview
+        self.timeout = settings.llm_timeout_seconds
+        self.structured_output = settings.llm_structured_output
+        self._rubric_token_counts: Dict[str, int] = {}
+
+    def _log_usage(self, call_site: str, spec: str, response: AIMessage, started: float) -> None:
+        """Log token usage and latency of one LLM call"""
+        if not settings.llm_log_token_usage:
+            return
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        print(
+            f"LLM usage [{call_site}] {spec}: input={usage.get('input_tokens', '?')} (cached={cached}) "
+            f"output={usage.get('output_tokens', '?')} latency={time.monotonic() - started:.2f}s"
+        )
 
-    def generate_questions(self, tech_stack: str, num_questions: int = None) -> List[str]:
-        """Generate interview questions based on tech stack"""
-        if num_questions is None:
-            num_questions = self.max_questions
+    async def _ainvoke(self, prompt: Prompt, timeout: Optional[float] = None, call_site: str = "llm",
+                       prepare: Optional[Prepare] = None) -> str:
+        """
+        Invoke the call site's model chain without blocking the event loop.
+        Slow or failing models are abandoned for the next one in the chain;
+        the whole call is cancelled once the timeout is spent.
+        """
+        started = time.monotonic()
+        response, spec = await self.router.ainvoke(
+            call_site,
+            prompt,
+            timeout=timeout if timeout is not None else self.timeout,
+            prepare=prepare
+        )
+        self._log_usage(call_site, spec, response, started)
+        return response.content
+
+    def _invoke(self, prompt: Prompt, call_site: str = "llm", prepare: Optional[Prepare] = None) -> str:
+        """Blocking version of _ainvoke"""
+        started = time.monotonic()
+        response, spec = self.router.invoke(call_site, prompt, prepare=prepare)
+        self._log_usage(call_site, spec, response, started)
+        return response.content
+
+    def _structured(self, schema: Type[BaseModel]) -> Prepare:
+        """Constrain replies to JSON matching `schema` on models that support response_format"""
+        def prepare(spec: str, model: BaseChatModel) -> Runnable:
+            if not self.structured_output or not self.router.supports_response_format(spec):
+                return model
+            return model.bind(response_format={
+                "type": "json_schema",
+                "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema()}
+            })
+        return prepare
+
+    @staticmethod
+    def _validate(content: str, schema: Type[BaseModel]) -> BaseModel:
+        """Parse and validate a JSON reply in one pass (raises ValidationError)"""
+        text = content.strip()
+        if text.startswith("```"):
+            # Unconstrained replies sometimes come wrapped in a markdown code fence
+            text = text.strip("`").removeprefix("json").strip()
+        return schema.model_validate_json(text)
+
+    def _build_repair_prompt(self, prompt: Prompt, raw_output: str, error: Exception) -> List[BaseMessage]:
+        """Continue the conversation with the invalid reply and the validation error, so it can be fixed"""
+        messages = [HumanMessage(content=prompt)] if isinstance(prompt, str) else list(prompt)
+        return messages + [
+            AIMessage(content=raw_output),
+            HumanMessage(content=f"""That response failed validation with this error:
+{error}
+
+Return the corrected JSON object only. Keep everything that was valid and fix only what the error describes.""")
+        ]
+
+    def _invoke_structured(self, prompt: Prompt, schema: Type[BaseModel], call_site: str = "llm") -> BaseModel:
+        """Invoke the LLM for a schema-validated object, with one repair retry on invalid output"""
+        prepare = self._structured(schema)
+        content = self._invoke(prompt, call_site, prepare)
+        try:
+            return self._validate(content, schema)
+        except ValidationError as e:
+            print(f"Invalid {schema.__name__} from LLM, retrying with repair prompt: {e}")
+            repair_prompt = self._build_repair_prompt(prompt, content, e)
+
+        content = self._invoke(repair_prompt, f"{call_site}:repair", prepare)
+        try:
+            return self._validate(content, schema)
+        except ValidationError as e:
+            raise LLMOutputError(f"Invalid {schema.__name__} after repair: {e}") from e
+
+    async def _ainvoke_structured(self, prompt: Prompt, schema: Type[BaseModel],
+                                  timeout: Optional[float] = None, call_site: str = "llm") -> BaseModel:
+        """Async version of _invoke_structured; each attempt is cancelled on timeout"""
+        content = await self._ainvoke(prompt, timeout, call_site, self._structured(schema))
+        try:
+            return self._validate(content, schema)
+        except ValidationError as e:
+            return await self._arepair(prompt, schema, content, e, timeout, call_site)
+
+    async def _arepair(self, prompt: Prompt, schema: Type[BaseModel], raw_output: str, error: Exception,
+                       timeout: Optional[float] = None, call_site: str = "llm") -> BaseModel:
+        """Single targeted retry: show the model its invalid output and the validation error"""
+        print(f"Invalid {schema.__name__} from LLM, retrying with repair prompt: {error}")
+        content = await self._ainvoke(
+            self._build_repair_prompt(prompt, raw_output, error), timeout,
+            f"{call_site}:repair", self._structured(schema)
+        )
+        try:
+            return self._validate(content, schema)
+        except ValidationError as e:
+            raise LLMOutputError(f"Invalid {schema.__name__} after repair: {e}") from e
 
-        prompt = f"""You are an expert technical interviewer creating a {tech_stack} assessment with {num_questions} questions.
+    def _build_questions_prompt(self, tech_stack: str, num_questions: int) -> str:
+        """Build the prompt for generating a full question set"""
+        return f"""You are an expert technical interviewer creating a {tech_stack} assessment with {num_questions} questions.
 
 QUESTION GENERATION REQUIREMENTS:
 
@@ -75,28 +266,55 @@ Bad: "What are the variable types in JavaScript?" (too basic)
 
 Generate {num_questions} high-quality {tech_stack} interview questions following these guidelines.
 
-Return ONLY a JSON array of question strings, no explanations:
-["question 1", "question 2", "question 3", ...]
+Tag each question with its difficulty ("beginner", "intermediate" or "advanced") and its topic:
+"fundamentals", "best_practices", "real_world", "performance_security" or "advanced_ecosystem"
+(the five topic areas above, in order).
+
+Return ONLY a JSON object with the tagged questions, no explanations:
+{{"questions": [{{"question": "question 1", "difficulty": "beginner", "topic": "fundamentals"}}, ...]}}
 """
 
-        response = self.llm.invoke(prompt)
-        try:
-            questions = json.loads(response.content)
-            return questions[:num_questions]
-        except json.JSONDecodeError:
-            # Fallback: split by newlines and clean
-            lines = response.content.strip().split('\n')
-            questions = [line.strip('- ').strip('"').strip("'").strip() for line in lines if line.strip()]
-            return [q for q in questions if q and not q.startswith('[') and not q.startswith('{')][:num_questions]
+    def _clean_questions(self, generated: GeneratedQuestions, num_questions: int) -> List[Dict[str, str]]:
+        """Drop blank entries and cap the list at num_questions, keeping each question's tags"""
+        return [
+            {"question": q.question.strip(), "difficulty": q.difficulty, "topic": q.topic}
+            for q in generated.questions if q.question.strip()
+        ][:num_questions]
 
-    def get_next_question(self, tech_stack: str, current_index: int, total_questions: int,
-                         previous_qa: List[Dict[str, str]] = None) -> str:
-        """Get the next question based on context"""
-        if previous_qa and len(previous_qa) > 0:
-            # Generate follow-up or next contextual question
-            context = "\n".join([f"Q: {qa['question']}\nA: {qa['answer']}" for qa in previous_qa[-3:]])
+    def generate_questions(self, tech_stack: str, num_questions: int = None) -> List[str]:
+        """Generate interview questions based on tech stack"""
+        if num_questions is None:
+            num_questions = self.max_questions
 
-            prompt = f"""You are conducting a {tech_stack} technical interview.
+        generated = self._invoke_structured(
+            self._build_questions_prompt(tech_stack, num_questions), GeneratedQuestions, call_site="questions"
+        )
+        return [q["question"] for q in self._clean_questions(generated, num_questions)]
+
+    async def agenerate_questions(self, tech_stack: str, num_questions: int = None,
+                                  timeout: Optional[float] = None) -> List[str]:
+        """Async version of generate_questions that does not block the event loop"""
+        tagged = await self.agenerate_tagged_questions(tech_stack, num_questions, timeout)
+        return [q["question"] for q in tagged]
+
+    async def agenerate_tagged_questions(self, tech_stack: str, num_questions: int = None,
+                                         timeout: Optional[float] = None) -> List[Dict[str, str]]:
+        """Generate questions as {"question", "difficulty", "topic"} dicts (e.g. for the question bank)"""
+        if num_questions is None:
+            num_questions = self.max_questions
+
+        generated = await self._ainvoke_structured(
+            self._build_questions_prompt(tech_stack, num_questions), GeneratedQuestions, timeout,
+            call_site="questions"
+        )
+        return self._clean_questions(generated, num_questions)
+
+    def _build_next_question_prompt(self, tech_stack: str, current_index: int, total_questions: int,
+                                    previous_qa: List[Dict[str, str]]) -> str:
+        """Build the prompt for a follow-up question from the last few Q&A pairs"""
+        context = "\n".join([f"Q: {qa['question']}\nA: {qa['answer']}" for qa in previous_qa[-3:]])
+
+        return f"""You are conducting a {tech_stack} technical interview.
 
 Previous conversation:
 {context}
@@ -108,121 +326,225 @@ Generate the next question (question {current_index + 1} of {total_questions}) t
 
 Return ONLY the question text, nothing else."""
 
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
+    def get_next_question(self, tech_stack: str, current_index: int, total_questions: int,
+                         previous_qa: List[Dict[str, str]] = None) -> str:
+        """Get the next question based on context"""
+        if previous_qa and len(previous_qa) > 0:
+            # Generate follow-up or next contextual question
+            prompt = self._build_next_question_prompt(tech_stack, current_index, total_questions, previous_qa)
+            return self._invoke(prompt, call_site="next_question").strip()
         else:
             # Generate first question
             questions = self.generate_questions(tech_stack, 1)
             return questions[0] if questions else f"What are the key concepts in {tech_stack}?"
 
-    def evaluate_interview(self, tech_stack: str, qa_pairs: List[Dict[str, str]]) -> Dict[str, any]:
-        """Evaluate the entire interview and provide feedback"""
+    async def aget_next_question(self, tech_stack: str, current_index: int, total_questions: int,
+                                 previous_qa: List[Dict[str, str]] = None,
+                                 timeout: Optional[float] = None, bypass_cache: bool = False) -> str:
+        """
+        Async version of get_next_question that does not block the event loop.
+        Follow-up questions are served from the LLM response cache when the same
+        (or, with semantic caching, a near-identical) context was seen before.
+        """
+        if previous_qa and len(previous_qa) > 0:
+            prompt = self._build_next_question_prompt(tech_stack, current_index, total_questions, previous_qa)
+            content = await llm_cache.get_or_compute(
+                "next_question",
+                prompt,
+                lambda: self._ainvoke(prompt, timeout, call_site="next_question"),
+                model=self.router.chain_key("next_question"),
+                bypass=bypass_cache
+            )
+            return content.strip()
+        else:
+            questions = await self.agenerate_questions(tech_stack, 1, timeout)
+            return questions[0] if questions else f"What are the key concepts in {tech_stack}?"
+
+    def _build_evaluation_prompt(self, tech_stack: str, qa_pairs: List[Dict[str, str]]) -> List[BaseMessage]:
+        """
+        Build the messages for evaluating the full interview transcript.
+
+        The rubric is a static system message sent first on every call, followed
+        by the transcript. Answers are trimmed so the transcript fits
+        evaluation_transcript_token_budget.
+        """
+        model = self.router.primary_model_name("evaluation")
+        answers = fit_to_budget(
+            [qa["answer"] for qa in qa_pairs],
+            budget=settings.evaluation_transcript_token_budget,
+            model=model,
+            min_tokens=settings.evaluation_answer_min_tokens
+        )
         qa_text = "\n\n".join([
-            f"Q{i+1}: {qa['question']}\nA{i+1}: {qa['answer']}"
-            for i, qa in enumerate(qa_pairs)
+            f"Q{i+1}: {qa['question']}\nA{i+1}: {answer}"
+            for i, (qa, answer) in enumerate(zip(qa_pairs, answers))
         ])
 
-        prompt = f"""You are an expert technical interviewer evaluating a {tech_stack} mock interview with {len(qa_pairs)} questions.
+        interview = f"""Evaluate this {tech_stack} mock interview with {len(qa_pairs)} questions.
+Answers marked [...] were shortened to fit; do not penalize the cut itself.
 
 INTERVIEW TRANSCRIPT:
 {qa_text}
 
-EVALUATION INSTRUCTIONS:
-
-1. VALIDATION CHECK:
-   - Verify each answer contains actual content (not just "Audio response" or empty)
-   - If any answers appear incomplete, note this in feedback
-   - Only evaluate based on actual provided responses
+"correct_count" must be between 0 and {len(qa_pairs)}."""
 
-2. SCORING RUBRIC (0-10 scale):
+        if settings.llm_log_token_usage:
+            trimmed = sum(1 for qa, answer in zip(qa_pairs, answers) if answer != qa["answer"])
+            print(
+                f"Evaluation prompt tokens: rubric={self._rubric_tokens()} "
+                f"transcript={count_tokens(interview, model)} ({trimmed}/{len(qa_pairs)} answers trimmed)"
+            )
 
-   9-10 (Expert): Deep technical understanding, correct use of best practices, handles edge cases,
-                  provides real-world examples, demonstrates senior-level knowledge
+        return [EVALUATION_RUBRIC_MESSAGE, HumanMessage(content=interview)]
 
-   7-8 (Strong): Solid fundamentals, good technical accuracy, understands core concepts,
-                 minor gaps in advanced topics or best practices
+    def _rubric_tokens(self) -> int:
+        """Token count of the static rubric (computed once per model)"""
+        model = self.router.primary_model_name("evaluation")
+        if model not in self._rubric_token_counts:
+            self._rubric_token_counts[model] = count_tokens(EVALUATION_RUBRIC, model)
+        return self._rubric_token_counts[model]
 
-   5-6 (Intermediate): Basic understanding, some correct answers, missing depth or detail,
-                       gaps in best practices or architecture knowledge
-
-   3-4 (Beginner): Superficial knowledge, significant gaps, incorrect concepts,
-                   lacks practical application understanding
+    def evaluate_interview(self, tech_stack: str, qa_pairs: List[Dict[str, str]]) -> Dict[str, any]:
+        """Evaluate the entire interview and provide feedback"""
+        evaluation = self._invoke_structured(
+            self._build_evaluation_prompt(tech_stack, qa_pairs), InterviewEvaluation, call_site="evaluation"
+        )
+        return evaluation.model_dump()
+
+    async def aevaluate_interview(self, tech_stack: str, qa_pairs: List[Dict[str, str]],
+                                  timeout: Optional[float] = None) -> Dict[str, any]:
+        """Async version of evaluate_interview that does not block the event loop"""
+        evaluation = await self._ainvoke_structured(
+            self._build_evaluation_prompt(tech_stack, qa_pairs), InterviewEvaluation, timeout,
+            call_site="evaluation"
+        )
+        return evaluation.model_dump()
+
+    async def astream_evaluate_interview(self, tech_stack: str, qa_pairs: List[Dict[str, str]],
+                                         timeout: Optional[float] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream the interview evaluation as (field, value) pairs, each yielded as
+        soon as the model has finished generating that field. The complete object
+        is validated at the end; if it is invalid, it is repaired once and any
+        field that changed (or was missing) is yielded again with its final value.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout if timeout is not None else self.timeout)
+        prompt = self._build_evaluation_prompt(tech_stack, qa_pairs)
+        # Streaming cannot fail over mid-answer, so it always uses the healthiest model in the chain
+        spec = self.router.chain("evaluation")[0]
+        chain = self.router.get_model(spec) | JsonOutputParser()
+        stream = chain.astream(prompt)
+
+        emitted = set()
+        latest: Dict[str, Any] = {}
+        completed = False
+        async with self.router.stream_slot(spec):
+            started = loop.time()
+            try:
+                while True:
+                    try:
+                        partial = await asyncio.wait_for(anext(stream), timeout=deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    if not isinstance(partial, dict):
+                        continue
+
+                    latest = partial
+                    # Keys arrive in order, so every key before the last one is complete
+                    for key in list(partial)[:-1]:
+                        if key not in emitted:
+                            emitted.add(key)
+                            yield key, partial[key]
+                completed = True
+            finally:
+                await stream.aclose()
+                self.router.record(spec, loop.time() - started, ok=completed)
 
-   0-2 (Insufficient): Major misunderstandings, mostly incorrect, incomplete responses,
-                       fundamental concept confusion
+        try:
+            evaluation = InterviewEvaluation.model_validate(latest)
+        except ValidationError as e:
+            evaluation = await self._arepair(prompt, InterviewEvaluation, json.dumps(latest), e, timeout, "evaluation")
 
-3. EVALUATION CRITERIA (Per Answer):
+        for key, value in evaluation.model_dump().items():
+            if key not in emitted or latest.get(key) != value:
+                yield key, value
 
-   For EACH question, assess:
-   - Technical Accuracy (0-3 points): Is the answer factually correct?
-   - Depth & Detail (0-3 points): Does it show deep understanding vs surface knowledge?
-   - Practical Application (0-2 points): Real-world usage, examples, scenarios
-   - Best Practices (0-2 points): Follows industry standards, security, performance
+    def _build_answer_evaluation_prompt(self, tech_stack: str, question: str, answer: str) -> str:
+        """Build the prompt for scoring a single answer"""
+        return f"""You are an expert technical interviewer scoring one answer from a {tech_stack} mock interview.
 
-4. TECH STACK SPECIFIC EVALUATION:
+QUESTION:
+{question}
 
-   For {tech_stack}, specifically check:
-   - Core concepts and fundamentals understanding
-   - Common patterns and anti-patterns knowledge
-   - Performance and optimization awareness
-   - Security best practices
-   - Real-world application experience
-   - Ecosystem and tooling familiarity
+CANDIDATE ANSWER (transcribed from speech):
+{answer}
 
-5. FEEDBACK REQUIREMENTS:
-   - Be specific with examples from their answers
-   - Point out what was good AND what needs improvement
-   - Provide actionable next steps
-   - Mention specific resources or topics to study
-   - Be encouraging but honest
+SCORING (0-10 scale):
+- Technical Accuracy (0-3 points): Is the answer factually correct?
+- Depth & Detail (0-3 points): Does it show deep understanding vs surface knowledge?
+- Practical Application (0-2 points): Real-world usage, examples, scenarios
+- Best Practices (0-2 points): Follows industry standards, security, performance
 
-6. MISSED TOPICS:
-   - List specific {tech_stack} topics that should have been covered but weren't
-   - Include fundamentals, intermediate, and advanced topics
-   - Be specific (e.g., "React Hooks lifecycle" not just "React")
+If the answer is empty, off-topic or only filler (e.g. "Audio response"), score it 0-2.
 
 Provide your evaluation in EXACT JSON format:
 {{
     "score": <number 0-10 with one decimal, e.g., 7.5>,
-    "feedback": "<3-5 sentence detailed, specific feedback with examples>",
-    "missed_topics": ["specific topic 1", "specific topic 2", ...],
-    "improvement_areas": "<specific actionable advice on what to study/practice>",
-    "strengths": ["specific strength 1", "specific strength 2", ...],
-    "correct_count": <number of questions answered well (0-{len(qa_pairs)})>
+    "correct": <true if the answer is substantially correct, otherwise false>,
+    "feedback": "<1-2 sentences of specific feedback on this answer>",
+    "strengths": ["specific strength", ...],
+    "missed_topics": ["specific {tech_stack} topic the answer missed or got wrong", ...],
+    "improvement_areas": "<one sentence of actionable advice for this topic>"
 }}
 
 IMPORTANT: Return ONLY valid JSON, no markdown, no explanations, just the JSON object."""
 
-        response = self.llm.invoke(prompt)
-
-        try:
-            evaluation = json.loads(response.content)
-
-            # Validate and set defaults
-            if "score" not in evaluation:
-                evaluation["score"] = 5.0
-            if "feedback" not in evaluation:
-                evaluation["feedback"] = "Interview completed."
-            if "missed_topics" not in evaluation:
-                evaluation["missed_topics"] = []
-            if "improvement_areas" not in evaluation:
-                evaluation["improvement_areas"] = "Continue practicing."
-            if "correct_count" not in evaluation:
-                # Estimate based on score
-                evaluation["correct_count"] = int((evaluation["score"] / 10.0) * len(qa_pairs))
-
-            return evaluation
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            # Return default evaluation
-            return {
-                "score": 5.0,
-                "feedback": "Interview completed. Unable to parse detailed evaluation.",
-                "missed_topics": [],
-                "improvement_areas": "Review all topics covered.",
-                "strengths": [],
-                "correct_count": len(qa_pairs) // 2
-            }
+    async def aevaluate_answer(self, tech_stack: str, question: str, answer: str,
+                               timeout: Optional[float] = None) -> Dict[str, any]:
+        """Score a single answer as soon as it is available (used for incremental evaluation)"""
+        evaluation = await self._ainvoke_structured(
+            self._build_answer_evaluation_prompt(tech_stack, question, answer), AnswerEvaluation, timeout,
+            call_site="answer_evaluation"
+        )
+        return evaluation.model_dump()
+
+    def aggregate_evaluations(self, evaluations: List[Dict[str, any]]) -> Dict[str, any]:
+        """
+        Combine per-answer evaluations into the interview evaluation (no LLM call).
+        Feedback is labelled with each evaluation's "question_index" when present.
+        """
+        def unique(items: List[str]) -> List[str]:
+            seen = set()
+            result = []
+            for item in items:
+                key = item.strip().lower()
+                if key and key not in seen:
+                    seen.add(key)
+                    result.append(item.strip())
+            return result
+
+        scores = [evaluation["score"] for evaluation in evaluations]
+        score = round(sum(scores) / len(scores), 1)
+
+        # Weakest answers first, so their topics and advice lead the suggestions
+        by_score = sorted(evaluations, key=lambda evaluation: evaluation["score"])
+
+        feedback_lines = [f"Overall score {score}/10 across {len(evaluations)} answers."]
+        feedback_lines += [
+            f"Q{evaluation.get('question_index', i) + 1} ({evaluation['score']:.1f}/10): {evaluation['feedback']}"
+            for i, evaluation in enumerate(evaluations)
+            if evaluation["feedback"]
+        ]
+
+        return {
+            "score": score,
+            "feedback": "\n".join(feedback_lines),
+            "missed_topics": unique([topic for e in by_score for topic in e["missed_topics"]])[:10],
+            "improvement_areas": " ".join(unique([e["improvement_areas"] for e in by_score])) or "Continue practicing.",
+            "strengths": unique([strength for e in reversed(by_score) for strength in e["strengths"]])[:5],
+            "correct_count": sum(1 for evaluation in evaluations if evaluation["correct"])
+        }
 
     def get_greeting_message(self) -> str:
         """Get the initial greeting message"""
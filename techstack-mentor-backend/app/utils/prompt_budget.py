@@ -0,0 +1,112 @@
+"""
+Token accounting for LLM prompts.
+
+Counts tokens with tiktoken and trims texts so a prompt section fits a token
+budget. If the tokenizer files cannot be loaded (tiktoken downloads them on
+first use), counts fall back to an estimate of ~4 characters per token.
+"""
+
+import math
+from functools import lru_cache
+from typing import List, Optional
+import tiktoken
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " [...] "
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    """Tokenizer for a model, or None if it cannot be loaded."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Unknown to tiktoken (e.g. a non-OpenAI model): the GPT-4o encoding is a close estimate
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"Tokenizer unavailable for {model}, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Number of tokens in a text.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Token count (estimated from length if the tokenizer is unavailable)
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Shorten a text to about max_tokens, keeping its start and end.
+
+    Answers usually state the main point first and conclude at the end, so the
+    middle is cut and replaced by a marker.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token limit for the result
+        model: Model whose tokenizer to use
+
+    Returns:
+        The text unchanged if it fits, otherwise its head and tail
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        head = max_chars * 2 // 3
+        return text[:head] + TRUNCATION_MARKER + text[len(text) - (max_chars - head):]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    head = max_tokens * 2 // 3
+    tail = tokens[len(tokens) - (max_tokens - head):]
+    return encoding.decode(tokens[:head]) + TRUNCATION_MARKER + encoding.decode(tail)
+
+
+def fit_to_budget(texts: List[str], budget: int, model: str, min_tokens: int = 0) -> List[str]:
+    """
+    Trim texts so their combined length fits a token budget.
+
+    Short texts are kept whole; the budget left over is shared equally among
+    the longer ones, so only the longest texts are cut. No text is cut below
+    min_tokens, so the result can exceed the budget when it is very small.
+
+    Args:
+        texts: Texts in order
+        budget: Total token budget
+        model: Model whose tokenizer to use
+        min_tokens: Smallest size a text is trimmed to
+
+    Returns:
+        Texts in the same order, trimmed where needed
+    """
+    counts = [count_tokens(text, model) for text in texts]
+    if sum(counts) <= budget:
+        return list(texts)
+
+    caps = [0] * len(texts)
+    remaining = budget
+    order = sorted(range(len(texts)), key=lambda i: counts[i])
+    for position, i in enumerate(order):
+        share = remaining // (len(texts) - position)
+        caps[i] = min(counts[i], max(share, min_tokens))
+        remaining = max(0, remaining - caps[i])
+
+    return [
+        truncate_to_tokens(text, caps[i], model) if caps[i] < counts[i] else text
+        for i, text in enumerate(texts)
+    ]
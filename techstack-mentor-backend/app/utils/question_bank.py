@@ -0,0 +1,307 @@
+"""
+Question bank: a per-tech-stack pool of pre-generated interview questions.
+
+Questions are kept in Redis as a hash per tech stack, keyed by a fingerprint of
+the normalized text so near-identical questions are stored once, together with
+the difficulty and topic they were generated for. Draws sample to the same mix
+the generation prompt asks for: difficulty exactly (20/60/20), topics as
+closely as the pool allows. Each user has a "seen" set per tech stack so draws
+never repeat a question for that user; a draw claims its questions atomically,
+so concurrent /start calls cannot hand out the same ones. The pool is topped
+up in the background, which keeps the LLM off the critical path of starting
+an interview.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from typing import Any, Dict, List, Optional
+from app.config import get_settings
+from app.schemas.interview import TechStack
+from app.utils.cache_manager import cache_manager
+from app.utils.llm_service import llm_service
+
+settings = get_settings()
+
+# Mix of a drawn interview, as in the question-generation prompt
+DIFFICULTY_MIX = {"beginner": 0.2, "intermediate": 0.6, "advanced": 0.2}
+TOPIC_MIX = {
+    "fundamentals": 0.3,
+    "best_practices": 0.25,
+    "real_world": 0.25,
+    "performance_security": 0.1,
+    "advanced_ecosystem": 0.1
+}
+
+# Times a draw is retried when a concurrent draw for the same user claimed one of its questions
+_DRAW_ATTEMPTS = 3
+
+# Add all fingerprints to the seen set unless one of them is already there.
+# KEYS[1] = seen set; ARGV[1] = ttl, ARGV[2..] = fingerprints. Returns 1 if claimed.
+_CLAIM_SCRIPT = """
+for i = 2, #ARGV do
+    if redis.call('SISMEMBER', KEYS[1], ARGV[i]) == 1 then return 0 end
+end
+redis.call('SADD', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def apportion(mix: Dict[str, float], total: int) -> Dict[str, int]:
+    """Split total into whole counts per category in proportion to mix (largest remainder)."""
+    exact = {key: share * total for key, share in mix.items()}
+    counts = {key: int(value) for key, value in exact.items()}
+    leftover = total - sum(counts.values())
+    for key in sorted(exact, key=lambda key: exact[key] - counts[key], reverse=True)[:leftover]:
+        counts[key] += 1
+    return counts
+
+
+class QuestionBank:
+    """Redis-backed pool of pre-generated questions per tech stack."""
+
+    def __init__(self):
+        self.target_size = settings.question_bank_target_size
+        self.min_size = settings.question_bank_min_size
+        self.batch_size = settings.question_bank_batch_size
+        self.seen_ttl = settings.question_bank_seen_ttl
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._claim_script = None
+
+    @property
+    def redis(self):
+        return cache_manager.redis_client
+
+    @staticmethod
+    def _pool_key(tech_stack: str) -> str:
+        # v2: entries carry difficulty and topic tags
+        return f"question_bank:v2:{tech_stack}"
+
+    @staticmethod
+    def _seen_key(user_id: str, tech_stack: str) -> str:
+        return f"question_bank:seen:{user_id}:{tech_stack}"
+
+    @staticmethod
+    def _lock_key(tech_stack: str) -> str:
+        return f"question_bank:refill:{tech_stack}"
+
+    @staticmethod
+    def fingerprint(question: str) -> str:
+        """
+        Identify a question independently of case, punctuation and spacing.
+
+        Args:
+            question: Question text
+
+        Returns:
+            Stable hash of the normalized question
+        """
+        normalized = " ".join(re.sub(r"[^a-z0-9]+", " ", question.lower()).split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    async def size(self, tech_stack: str) -> int:
+        """Number of questions currently in the pool."""
+        return await self.redis.hlen(self._pool_key(tech_stack))
+
+    async def add_questions(self, tech_stack: str, questions: List[Dict[str, str]]) -> int:
+        """
+        Add questions to the pool, skipping duplicates.
+
+        Args:
+            tech_stack: Tech stack the questions belong to
+            questions: {"question", "difficulty", "topic"} dicts, as generated
+
+        Returns:
+            Number of questions that were new to the pool
+        """
+        questions = [q for q in questions if q["question"].strip()]
+        if not questions:
+            return 0
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for question in questions:
+                pipe.hsetnx(self._pool_key(tech_stack), self.fingerprint(question["question"]), json.dumps(question))
+            added = await pipe.execute()
+        return sum(added)
+
+    async def mark_seen(self, user_id: str, tech_stack: str, questions: List[str]) -> None:
+        """Record questions as asked to this user."""
+        if not questions:
+            return
+
+        seen_key = self._seen_key(user_id, tech_stack)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(seen_key, *[self.fingerprint(q) for q in questions])
+            pipe.expire(seen_key, self.seen_ttl)
+            await pipe.execute()
+
+    @staticmethod
+    def select(candidates: Dict[str, Dict[str, Any]], num_questions: int) -> Optional[List[str]]:
+        """
+        Pick questions matching DIFFICULTY_MIX exactly and TOPIC_MIX as closely as possible.
+
+        Args:
+            candidates: Fingerprint -> tagged question, for questions the user has not seen
+            num_questions: Number of questions needed
+
+        Returns:
+            Fingerprints ordered from beginner to advanced, or None if a difficulty runs short
+        """
+        topics_needed = apportion(TOPIC_MIX, num_questions)
+        picked: List[str] = []
+
+        for difficulty, count in apportion(DIFFICULTY_MIX, num_questions).items():
+            available = [fp for fp, q in candidates.items() if q["difficulty"] == difficulty]
+            if len(available) < count:
+                return None
+            random.shuffle(available)
+            for _ in range(count):
+                # The topic furthest below its share; ties go to the shuffled order
+                fp = max(available, key=lambda fp: topics_needed.get(candidates[fp]["topic"], 0))
+                available.remove(fp)
+                picked.append(fp)
+                topics_needed[candidates[fp]["topic"]] = topics_needed.get(candidates[fp]["topic"], 0) - 1
+
+        return picked
+
+    async def _claim(self, user_id: str, tech_stack: str, fingerprints: List[str]) -> bool:
+        """Mark questions as seen unless a concurrent draw already did; True if this draw got them all."""
+        if self._claim_script is None:
+            self._claim_script = self.redis.register_script(_CLAIM_SCRIPT)
+        claimed = await self._claim_script(
+            keys=[self._seen_key(user_id, tech_stack)], args=[self.seen_ttl, *fingerprints]
+        )
+        return bool(claimed)
+
+    async def draw(self, user_id: str, tech_stack: str, num_questions: int) -> List[str]:
+        """
+        Draw questions this user has not been asked before, in the interview's difficulty and topic mix.
+
+        Args:
+            user_id: User identifier
+            tech_stack: Tech stack to draw from
+            num_questions: Number of questions needed
+
+        Returns:
+            num_questions questions, or an empty list if the pool cannot supply them
+        """
+        for _ in range(_DRAW_ATTEMPTS):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hgetall(self._pool_key(tech_stack))
+                pipe.smembers(self._seen_key(user_id, tech_stack))
+                pool, seen = await pipe.execute()
+
+            candidates = {fp: json.loads(entry) for fp, entry in pool.items() if fp not in seen}
+            picked = self.select(candidates, num_questions)
+
+            # Refill early so the next draw (by this or another user) is served from the pool
+            if picked is None or len(pool) < self.min_size or len(candidates) - num_questions < self.min_size:
+                self.schedule_top_up(tech_stack)
+
+            if picked is None:
+                return []
+            if await self._claim(user_id, tech_stack, picked):
+                return [candidates[fp]["question"] for fp in picked]
+
+        return []
+
+    async def get_questions(self, user_id: str, tech_stack: str, num_questions: int) -> List[str]:
+        """
+        Get questions for a new interview, from the pool when possible.
+
+        Falls back to generating questions with the LLM (and adding them to the
+        pool) when the pool cannot supply enough unseen questions.
+
+        Args:
+            user_id: User identifier
+            tech_stack: Tech stack for the interview
+            num_questions: Number of questions needed
+
+        Returns:
+            Question texts
+        """
+        try:
+            questions = await self.draw(user_id, tech_stack, num_questions)
+            if questions:
+                return questions
+        except Exception as e:
+            print(f"Question bank draw failed for {tech_stack}: {e}")
+
+        generated = await llm_service.agenerate_tagged_questions(tech_stack=tech_stack, num_questions=num_questions)
+        questions = [q["question"] for q in generated]
+
+        try:
+            await self.add_questions(tech_stack, generated)
+            await self.mark_seen(user_id, tech_stack, questions)
+        except Exception as e:
+            print(f"Failed to store generated questions in bank for {tech_stack}: {e}")
+
+        return questions
+
+    async def top_up(self, tech_stack: str) -> int:
+        """
+        Generate questions until the pool reaches its target size.
+
+        A short Redis lock ensures only one worker refills a tech stack at a time.
+
+        Args:
+            tech_stack: Tech stack to refill
+
+        Returns:
+            Number of questions added
+        """
+        lock_key = self._lock_key(tech_stack)
+        lock_ttl = int(settings.llm_timeout_seconds * 2)
+        if not await self.redis.set(lock_key, "1", nx=True, ex=lock_ttl):
+            return 0
+
+        added_total = 0
+        try:
+            # Bounded number of rounds in case the model keeps returning duplicates
+            for _ in range(max(1, self.target_size // self.batch_size) * 2):
+                if await self.size(tech_stack) >= self.target_size:
+                    break
+                questions = await llm_service.agenerate_tagged_questions(
+                    tech_stack=tech_stack, num_questions=self.batch_size
+                )
+                added_total += await self.add_questions(tech_stack, questions)
+                await self.redis.expire(lock_key, lock_ttl)
+        finally:
+            await self.redis.delete(lock_key)
+
+        print(f"Question bank for {tech_stack} topped up with {added_total} questions")
+        return added_total
+
+    def schedule_top_up(self, tech_stack: str) -> None:
+        """Start a background refill for a tech stack unless one is already running."""
+        task = self._refills.get(tech_stack)
+        if task and not task.done():
+            return
+
+        task = asyncio.create_task(self._safe_top_up(tech_stack))
+        self._refills[tech_stack] = task
+
+    async def _safe_top_up(self, tech_stack: str) -> None:
+        try:
+            await self.top_up(tech_stack)
+        except Exception as e:
+            print(f"Question bank top-up failed for {tech_stack}: {e}")
+
+    def warm(self) -> None:
+        """Top up the pool for every tech stack in the background."""
+        for tech_stack in TechStack:
+            self.schedule_top_up(tech_stack.value)
+
+    async def close(self) -> None:
+        """Cancel any refills still running."""
+        for task in self._refills.values():
+            task.cancel()
+        await asyncio.gather(*self._refills.values(), return_exceptions=True)
+        self._refills.clear()
+
+
+# Singleton instance
+question_bank = QuestionBank()
@@ -0,0 +1,396 @@
+"""
+Rate limiting and concurrency control for OpenAI calls.
+
+Every OpenAI request goes through `openai_governor` under its endpoint
+("chat", "tts", "whisper" or "embeddings"). Each endpoint has its own quota:
+- a token bucket of `openai_<endpoint>_rpm` requests per minute (bursts of up
+  to `openai_rate_limit_burst`), and
+- a cap of `openai_<endpoint>_max_concurrency` requests in flight.
+
+Rate-limited (429) and transient failures are retried with exponential
+backoff. A Retry-After from OpenAI pauses the whole endpoint, so other
+callers wait too instead of adding to the 429 storm.
+
+The "local" backend limits each process on its own. The "redis" backend
+shares the quotas across all workers: the bucket lives in a Lua-updated hash
+and in-flight requests are leases in a sorted set. Leases expire after
+`openai_governor_lease_seconds`, so a crashed worker cannot hold slots forever.
+Redis errors never fail a call; it proceeds unthrottled.
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+import openai
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+from app.utils.latency_tracker import LatencyTracker
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+ENDPOINTS = ("chat", "tts", "whisper", "embeddings")
+
+# Statuses worth retrying; only 429 pauses the whole endpoint
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+# Polling interval while waiting for a Redis concurrency slot
+_SLOT_POLL_SECONDS = 0.05
+
+# Queue times kept per endpoint for the p50/p95 metrics
+_QUEUE_TIME_WINDOW = 500
+_QUEUE_TIME_MAX_AGE = 600
+
+# Take one token from the bucket, or return the milliseconds to wait for one.
+# KEYS[1] = bucket hash, KEYS[2] = pause key (paused-until, set on Retry-After)
+# ARGV[1] = tokens per millisecond, ARGV[2] = bucket capacity
+_TAKE_TOKEN_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+
+local paused_until = tonumber(redis.call('GET', KEYS[2]) or '0')
+if paused_until > now then
+    return paused_until - now
+end
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+return wait
+"""
+
+# Pause an endpoint for ARGV[1] milliseconds (extends, never shortens, a pause)
+# KEYS[1] = pause key
+_PAUSE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local until_ms = now + tonumber(ARGV[1])
+if until_ms > tonumber(redis.call('GET', KEYS[1]) or '0') then
+    redis.call('SET', KEYS[1], until_ms, 'PX', ARGV[1])
+end
+return until_ms
+"""
+
+# Take a concurrency lease if fewer than ARGV[2] are held; returns 1 if taken.
+# KEYS[1] = lease zset (member = lease id, score = expiry ms)
+# ARGV[1] = lease id, ARGV[2] = max concurrency, ARGV[3] = lease ttl ms
+_ACQUIRE_LEASE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+redis.call('PEXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 1
+"""
+
+
+class TokenBucket:
+    """In-process token bucket; waiters are served in arrival order."""
+
+    def __init__(self, requests_per_minute: int, capacity: int):
+        self.rate = requests_per_minute / 60
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def take(self) -> None:
+        """Wait for and take one token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.paused_until > now:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class OpenAIGovernor:
+    """Per-endpoint request rate, concurrency and retry policy for OpenAI calls."""
+
+    def __init__(self, backend: str = "local"):
+        self.backend = backend
+        self.quotas: Dict[str, Dict[str, int]] = {
+            "chat": {"rpm": settings.openai_chat_rpm, "max_concurrency": settings.openai_chat_max_concurrency},
+            "tts": {"rpm": settings.openai_tts_rpm, "max_concurrency": settings.tts_max_concurrency},
+            "whisper": {"rpm": settings.openai_whisper_rpm, "max_concurrency": settings.openai_whisper_max_concurrency},
+            "embeddings": {
+                "rpm": settings.openai_embeddings_rpm,
+                "max_concurrency": settings.openai_embeddings_max_concurrency
+            }
+        }
+        self.burst = settings.openai_rate_limit_burst
+        self.max_retries = settings.openai_max_retries
+        self.retry_base = settings.openai_retry_base_seconds
+        self.retry_max = settings.openai_retry_max_seconds
+        self.lease_ms = settings.openai_governor_lease_seconds * 1000
+
+        self._buckets: Dict[str, TokenBucket] = {
+            endpoint: TokenBucket(quota["rpm"], self._capacity(endpoint))
+            for endpoint, quota in self.quotas.items() if quota["rpm"] > 0
+        }
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            endpoint: asyncio.Semaphore(quota["max_concurrency"]) for endpoint, quota in self.quotas.items()
+        }
+        self._scripts: Optional[Dict[str, Any]] = None
+
+        # endpoint -> counters, and queue times for percentiles
+        self.metrics: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"requests": 0, "in_flight": 0, "rate_limited": 0, "retries": 0, "failed": 0,
+                     "queue_seconds_total": 0.0, "queue_seconds_max": 0.0}
+        )
+        self.queue_times: Dict[str, LatencyTracker] = defaultdict(
+            lambda: LatencyTracker(_QUEUE_TIME_WINDOW, _QUEUE_TIME_MAX_AGE)
+        )
+
+    def _capacity(self, endpoint: str) -> int:
+        return max(1, min(self.burst, self.quotas[endpoint]["rpm"]))
+
+    @property
+    def scripts(self) -> Dict[str, Any]:
+        """Lua scripts, registered on first use of the Redis backend."""
+        if self._scripts is None:
+            redis = cache_manager.redis_client
+            self._scripts = {
+                "take_token": redis.register_script(_TAKE_TOKEN_SCRIPT),
+                "pause": redis.register_script(_PAUSE_SCRIPT),
+                "acquire_lease": redis.register_script(_ACQUIRE_LEASE_SCRIPT)
+            }
+        return self._scripts
+
+    @staticmethod
+    def _key(endpoint: str, name: str) -> str:
+        return f"openai_governor:{endpoint}:{name}"
+
+    async def _take_token(self, endpoint: str) -> None:
+        rpm = self.quotas[endpoint]["rpm"]
+        if rpm <= 0:
+            return
+
+        if self.backend != "redis":
+            await self._buckets[endpoint].take()
+            return
+
+        rate_per_ms = rpm / 60000
+        while True:
+            wait_ms = await self.scripts["take_token"](
+                keys=[self._key(endpoint, "bucket"), self._key(endpoint, "pause")],
+                args=[rate_per_ms, self._capacity(endpoint)]
+            )
+            if not wait_ms:
+                return
+            await asyncio.sleep(wait_ms / 1000)
+
+    async def _acquire_lease(self, endpoint: str) -> str:
+        lease_id = uuid.uuid4().hex
+        while not await self.scripts["acquire_lease"](
+            keys=[self._key(endpoint, "leases")],
+            args=[lease_id, self.quotas[endpoint]["max_concurrency"], self.lease_ms]
+        ):
+            await asyncio.sleep(_SLOT_POLL_SECONDS)
+        return lease_id
+
+    async def _release_lease(self, endpoint: str, lease_id: str) -> None:
+        try:
+            await cache_manager.redis_client.zrem(self._key(endpoint, "leases"), lease_id)
+        except Exception as e:
+            print(f"Error releasing OpenAI {endpoint} slot: {e}")
+
+    async def pause(self, endpoint: str, seconds: float) -> None:
+        """Hold back every new request to an endpoint for `seconds`."""
+        if self.backend != "redis":
+            if endpoint in self._buckets:
+                self._buckets[endpoint].pause(seconds)
+            return
+        try:
+            await self.scripts["pause"](keys=[self._key(endpoint, "pause")], args=[max(1, int(seconds * 1000))])
+        except Exception as e:
+            print(f"Error pausing OpenAI {endpoint} requests: {e}")
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str) -> AsyncIterator[None]:
+        """
+        Hold one request slot for an endpoint: a concurrency slot, then a rate token.
+
+        Use directly for streamed responses; use `call` for plain requests so
+        they are also retried.
+
+        Args:
+            endpoint: "chat", "tts", "whisper" or "embeddings"
+        """
+        metrics = self.metrics[endpoint]
+        queued_at = time.monotonic()
+        lease_id = None
+        semaphore = None
+
+        try:
+            if self.backend == "redis":
+                lease_id = await self._acquire_lease(endpoint)
+            await self._take_token(endpoint)
+        except asyncio.CancelledError:
+            if lease_id:
+                await self._release_lease(endpoint, lease_id)
+            raise
+        except Exception as e:
+            # Redis trouble must not take OpenAI calls down with it
+            print(f"OpenAI {endpoint} rate limiter unavailable, proceeding unthrottled: {e}")
+            if lease_id:
+                await self._release_lease(endpoint, lease_id)
+                lease_id = None
+
+        if self.backend != "redis":
+            semaphore = self._semaphores[endpoint]
+            await semaphore.acquire()
+
+        queue_seconds = time.monotonic() - queued_at
+        metrics["requests"] += 1
+        metrics["queue_seconds_total"] += queue_seconds
+        metrics["queue_seconds_max"] = max(metrics["queue_seconds_max"], queue_seconds)
+        self.queue_times[endpoint].record(queue_seconds, ok=True)
+
+        metrics["in_flight"] += 1
+        try:
+            yield
+        finally:
+            metrics["in_flight"] -= 1
+            if semaphore:
+                semaphore.release()
+            if lease_id:
+                await self._release_lease(endpoint, lease_id)
+
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[int]:
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code
+        return None
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds the server asked us to wait (retry-after-ms or Retry-After), if any."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+            return True
+        return self._status_code(error) in RETRYABLE_STATUSES
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+
+    async def call(self, endpoint: str, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an OpenAI request within the endpoint's quota, retrying transient failures.
+
+        Args:
+            endpoint: "chat", "tts", "whisper" or "embeddings"
+            request: Function that sends the request; called again for each retry
+
+        Returns:
+            The request's result
+
+        Raises:
+            Exception: The last error, once it is not retryable or retries are spent
+        """
+        metrics = self.metrics[endpoint]
+        attempt = 0
+        while True:
+            async with self.slot(endpoint):
+                try:
+                    return await request()
+                except Exception as e:
+                    if attempt >= self.max_retries or not self._is_retryable(e):
+                        metrics["failed"] += 1
+                        raise
+                    error = e
+
+            retry_after = self._retry_after(error)
+            if retry_after is not None and retry_after > self.retry_max:
+                # Retrying sooner than the server allows would only earn another 429
+                metrics["failed"] += 1
+                raise error
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+
+            if self._status_code(error) == 429:
+                metrics["rate_limited"] += 1
+                await self.pause(endpoint, delay)
+
+            metrics["retries"] += 1
+            attempt += 1
+            print(f"OpenAI {endpoint} request failed ({error}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Quotas, counters and queue-time percentiles per endpoint (this process)."""
+        stats = {}
+        for endpoint in ENDPOINTS:
+            metrics = self.metrics[endpoint]
+            queue_times = self.queue_times[endpoint]
+            p50 = queue_times.percentile(50)
+            p95 = queue_times.percentile(95)
+            stats[endpoint] = {
+                **self.quotas[endpoint],
+                **metrics,
+                "queue_seconds_total": round(metrics["queue_seconds_total"], 3),
+                "queue_seconds_max": round(metrics["queue_seconds_max"], 3),
+                "queue_p50_seconds": round(p50, 3) if p50 is not None else None,
+                "queue_p95_seconds": round(p95, 3) if p95 is not None else None
+            }
+        return {"backend": self.backend, "endpoints": stats}
+
+
+# Singleton instance
+openai_governor = OpenAIGovernor(backend=settings.openai_governor_backend)
@@ -0,0 +1,180 @@
+"""
+Completion signalling for background session work.
+
+Background tasks call `notify` after they change a session (e.g. a transcription
+finishes) and request handlers `wait_for` a condition (or iterate `changes` to
+report progress) instead of polling Redis.
+Waiters always wait on an in-process asyncio.Event per session. The "local"
+backend is enough when the background work runs in the same process. The
+"redis" backend also publishes notifications, and one pattern subscriber per
+process fans them out to the local events, so waiters on any worker are woken
+without each holding a pooled connection.
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+
+settings = get_settings()
+
+# Pause before the subscriber reconnects after losing Redis
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+# Longest a waiter holds off its first check while the subscriber connects
+_SUBSCRIBE_WAIT_SECONDS = 2.0
+
+# Longest single read on the subscription. An idle read then simply returns nothing;
+# the pool's socket_timeout would instead fail it and force a resubscribe.
+# The connection health check (PING) runs between reads.
+_IDLE_READ_SECONDS = 10.0
+
+
+class SessionEvents:
+    """Registry of per-session wake-ups for code waiting on background work."""
+
+    def __init__(self, backend: str = "local"):
+        self.backend = backend
+        self._events: Dict[str, asyncio.Event] = {}
+        self._waiters: Dict[str, int] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    @staticmethod
+    def _channel(session_id: str) -> str:
+        return f"session:{session_id}:events"
+
+    @staticmethod
+    def _session_id(channel: str) -> str:
+        return channel[len("session:"):-len(":events")]
+
+    def _wake(self, session_id: str) -> None:
+        event = self._events.get(session_id)
+        if event:
+            event.set()
+
+    async def notify(self, session_id: str) -> None:
+        """
+        Wake everyone waiting on this session.
+
+        Args:
+            session_id: Session whose state changed
+        """
+        self._wake(session_id)
+
+        if self.backend == "redis":
+            try:
+                await cache_manager.redis_client.publish(self._channel(session_id), "changed")
+            except Exception as e:
+                print(f"Error publishing session event: {e}")
+
+    async def wait_for(self, session_id: str, predicate: Callable[[], Awaitable[bool]], timeout: float) -> bool:
+        """
+        Wait until predicate() is true, re-checking only when the session is notified.
+
+        Args:
+            session_id: Session to wait on
+            predicate: Async condition to check after each notification
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the condition was met, False on timeout
+        """
+        async with aclosing(self.changes(session_id, timeout)) as changes:
+            async for _ in changes:
+                if await predicate():
+                    return True
+        return await predicate()
+
+    def changes(self, session_id: str, timeout: float, heartbeat: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Yield once immediately and then after every notification for this session.
+
+        Stops when the timeout runs out. Use with contextlib.aclosing so the
+        subscription is released as soon as the caller stops iterating.
+
+        Args:
+            session_id: Session to watch
+            timeout: Maximum time to watch in seconds
+            heartbeat: Also yield after this many seconds without a notification
+                (e.g. to keep an idle stream open)
+        """
+        return self._changes(session_id, timeout, heartbeat)
+
+    async def _changes(self, session_id: str, timeout: float, heartbeat: Optional[float]) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        event = self._events.setdefault(session_id, asyncio.Event())
+        self._waiters[session_id] = self._waiters.get(session_id, 0) + 1
+
+        try:
+            if self.backend == "redis":
+                # Subscribed before the first yield so no notification is missed
+                await self._ensure_subscribed(min(timeout, _SUBSCRIBE_WAIT_SECONDS))
+
+            while True:
+                # Clear before the caller checks so a notify between check and wait is not lost
+                event.clear()
+                yield
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(remaining, heartbeat or remaining))
+                except asyncio.TimeoutError:
+                    if loop.time() >= deadline:
+                        return
+        finally:
+            self._waiters[session_id] -= 1
+            if self._waiters[session_id] == 0:
+                del self._waiters[session_id]
+                del self._events[session_id]
+
+    async def _ensure_subscribed(self, timeout: float) -> None:
+        """Start the process-wide subscriber on first use and wait (up to timeout) until it is subscribed."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Redis is unreachable: waiters still see notifications from this process, and
+            # the subscriber wakes everyone to re-check once it is subscribed
+            pass
+
+    async def _listen(self) -> None:
+        """Single pattern subscription per process, fanning notifications out to local events."""
+        while True:
+            pubsub = cache_manager.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(self._channel("*"))
+                self._subscribed.set()
+                # Notifications published while (re)connecting were missed; make every waiter re-check
+                for session_id in list(self._events):
+                    self._wake(session_id)
+
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_IDLE_READ_SECONDS)
+                    if message:
+                        self._wake(self._session_id(message["channel"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Session event subscriber error: {e}")
+            finally:
+                self._subscribed.clear()
+                await pubsub.aclose()
+            await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+
+    async def close(self) -> None:
+        """Stop the subscriber (if one was started)."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+
+# Singleton instance
+session_events = SessionEvents(backend=settings.session_events_backend)
@@ -0,0 +1,419 @@
+"""
+Durable job queues for answer processing.
+
+Uploads enqueue a transcription job on a Redis stream instead of transcribing
+in the API process. Once a transcription is stored, scoring the answer (with
+incremental evaluation) is a job on a second stream, so slow LLM calls never
+hold up transcription workers. Each stream has a consumer group of workers:
+- At-least-once delivery: a job is acknowledged only after it finished. A
+  job whose worker stopped heartbeating for `transcription_job_visibility_timeout`
+  (crash, restart) is claimed by another worker.
+- Retries: a failed job is re-queued with exponential backoff through a
+  sorted set of delayed jobs, up to the queue's max attempts. A takeover
+  after a worker stopped counts as an attempt too, so a job that kills its
+  worker is not retried forever. After the last attempt the answer is given
+  up on (so /end is not blocked) and the job is kept on the failed-jobs stream.
+- Idempotent writes: see answer_processing.transcribe_answer and evaluate_answer.
+  A redelivered transcription job whose answer is stored but not yet scored
+  queues the evaluation again.
+
+Workers run inside the API process (`transcription_workers_in_api`,
+`evaluation_workers_in_api`) and/or as dedicated processes
+(`python -m app.worker`), which then need the recordings directory and
+SESSION_EVENTS_BACKEND=redis to wake /end.
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from redis.exceptions import ResponseError
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+from app.utils.answer_processing import transcribe_answer, fail_transcription, evaluate_answer, fail_evaluation
+
+settings = get_settings()
+
+STREAM_KEY = "transcription_jobs"
+GROUP_NAME = "transcription_workers"
+DELAYED_KEY = "transcription_jobs:delayed"
+FAILED_KEY = "transcription_jobs:failed"
+
+EVALUATION_STREAM_KEY = "evaluation_jobs"
+EVALUATION_GROUP_NAME = "evaluation_workers"
+EVALUATION_DELAYED_KEY = "evaluation_jobs:delayed"
+EVALUATION_FAILED_KEY = "evaluation_jobs:failed"
+
+# Failed jobs kept for inspection
+FAILED_MAX_LENGTH = 1000
+
+# How long an idle consumer blocks on the stream before checking delayed and stalled jobs
+_READ_BLOCK_MS = 1000
+
+# Move due delayed jobs onto the stream. KEYS[1] = delayed zset, KEYS[2] = stream;
+# ARGV[1] = max jobs to move. Returns the number moved.
+_PROMOTE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, tonumber(ARGV[1]))
+for _, job in ipairs(due) do
+    redis.call('XADD', KEYS[2], '*', 'job', job)
+    redis.call('ZREM', KEYS[1], job)
+end
+return #due
+"""
+
+# Schedule a retry and acknowledge the failed delivery in one step.
+# KEYS[1] = delayed zset, KEYS[2] = stream; ARGV[1] = job, ARGV[2] = delay ms,
+# ARGV[3] = group, ARGV[4] = message id
+_RETRY_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+redis.call('XACK', KEYS[2], ARGV[3], ARGV[4])
+redis.call('XDEL', KEYS[2], ARGV[4])
+return 1
+"""
+
+
+class JobQueue:
+    """
+    Redis-stream job queue and worker pool for per-answer jobs.
+
+    Jobs carry "session_id" and "answer_index". Subclasses set the keys and
+    implement `run` (raise to retry) and `give_up` (after the last attempt).
+    """
+
+    label = "Job"
+    stream_key = ""
+    group_name = ""
+    delayed_key = ""
+    failed_key = ""
+
+    def __init__(self, max_attempts: int):
+        self.max_attempts = max_attempts
+        self.retry_base = settings.transcription_job_retry_base_seconds
+        self.retry_max = settings.transcription_job_retry_max_seconds
+        self.visibility_ms = settings.transcription_job_visibility_timeout * 1000
+
+        self._workers: List[asyncio.Task] = []
+        self._scripts: Optional[Dict[str, Any]] = None
+        self.metrics: Dict[str, int] = defaultdict(int)
+
+    @property
+    def redis(self):
+        return cache_manager.redis_client
+
+    @property
+    def scripts(self) -> Dict[str, Any]:
+        if self._scripts is None:
+            self._scripts = {
+                "promote": self.redis.register_script(_PROMOTE_SCRIPT),
+                "retry": self.redis.register_script(_RETRY_SCRIPT)
+            }
+        return self._scripts
+
+    async def run(self, job: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def give_up(self, job: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def _enqueue(self, job: Dict[str, Any]) -> str:
+        job = {"id": uuid.uuid4().hex, **job, "attempt": 1}
+        await self.redis.xadd(self.stream_key, {"job": json.dumps(job)})
+        self.metrics["enqueued"] += 1
+        return job["id"]
+
+    async def _ensure_group(self) -> None:
+        try:
+            # Start from the beginning so jobs queued before any worker existed are processed
+            await self.redis.xgroup_create(self.stream_key, self.group_name, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _ack(self, message_id: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream_key, self.group_name, message_id)
+            pipe.xdel(self.stream_key, message_id)
+            await pipe.execute()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given (1-based) failed attempt."""
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _retry_later(self, message_id: str, job: Dict[str, Any], delay: float) -> None:
+        """Schedule the next attempt and acknowledge this one, atomically."""
+        retry = {**job, "attempt": job["attempt"] + 1}
+        await self.scripts["retry"](
+            keys=[self.delayed_key, self.stream_key],
+            args=[json.dumps(retry), int(delay * 1000), self.group_name, message_id]
+        )
+
+    async def _give_up(self, message_id: str, job: Dict[str, Any], error: Exception) -> None:
+        """Keep the job on the failed stream and acknowledge it, atomically."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.failed_key,
+                {"job": json.dumps(job), "error": str(error) or type(error).__name__},
+                maxlen=FAILED_MAX_LENGTH,
+                approximate=True
+            )
+            pipe.xack(self.stream_key, self.group_name, message_id)
+            pipe.xdel(self.stream_key, message_id)
+            await pipe.execute()
+
+    async def _heartbeat(self, consumer: str, message_id: str) -> None:
+        """Keep claiming a running job so it never looks stalled to other workers."""
+        while True:
+            await asyncio.sleep(self.visibility_ms / 3000)
+            try:
+                await self.redis.xclaim(
+                    self.stream_key, self.group_name, consumer,
+                    min_idle_time=0, message_ids=[message_id], justid=True
+                )
+            except Exception as e:
+                print(f"{self.label} job heartbeat failed for {message_id}: {e}")
+
+    async def _process(self, consumer: str, message_id: str, fields: Dict[str, str], deliveries: int = 1) -> None:
+        try:
+            job = json.loads(fields["job"])
+        except (KeyError, ValueError) as e:
+            print(f"Dropping malformed {self.label.lower()} job {message_id}: {e}")
+            await self._ack(message_id)
+            return
+
+        # Every earlier delivery of this message ended with its worker stopping mid-job
+        job["attempt"] += deliveries - 1
+        if job["attempt"] > self.max_attempts:
+            print(
+                f"Giving up on {self.label.lower()} for session {job['session_id']}, answer {job['answer_index']}: "
+                f"its worker stopped on each of {deliveries - 1} deliveries"
+            )
+            self.metrics["failed"] += 1
+            await self.give_up(job)
+            await self._give_up(message_id, job, RuntimeError(f"Worker stopped on {deliveries - 1} deliveries"))
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(consumer, message_id))
+        try:
+            await self.run(job)
+        except Exception as e:
+            if job["attempt"] < self.max_attempts:
+                delay = self._backoff(job["attempt"])
+                print(
+                    f"{self.label} failed for session {job['session_id']}, answer {job['answer_index']} "
+                    f"(attempt {job['attempt']}/{self.max_attempts}), retrying in {delay:.1f}s: {e}"
+                )
+                self.metrics["retried"] += 1
+                await self._retry_later(message_id, job, delay)
+            else:
+                print(
+                    f"{self.label} failed for session {job['session_id']}, answer {job['answer_index']} "
+                    f"after {job['attempt']} attempts: {e}"
+                )
+                self.metrics["failed"] += 1
+                await self.give_up(job)
+                await self._give_up(message_id, job, e)
+            return
+        finally:
+            heartbeat.cancel()
+
+        self.metrics["completed"] += 1
+        await self._ack(message_id)
+
+    async def _next_message(self, consumer: str) -> Optional[tuple]:
+        """
+        Next job for this consumer: delayed retries that are due, new jobs, then stalled jobs.
+
+        Returns:
+            (message_id, fields, deliveries), or None if there is nothing to do
+        """
+        await self.scripts["promote"](keys=[self.delayed_key, self.stream_key], args=[100])
+
+        response = await self.redis.xreadgroup(
+            self.group_name, consumer, {self.stream_key: ">"}, count=1, block=_READ_BLOCK_MS
+        )
+        if response:
+            message_id, fields = response[0][1][0]
+            return message_id, fields, 1
+
+        # Nothing new: take over a job whose worker stopped heartbeating.
+        # Redis 7 adds a third element (deleted IDs) to the reply; 6.2 does not.
+        reply = await self.redis.xautoclaim(
+            self.stream_key, self.group_name, consumer, min_idle_time=self.visibility_ms, start_id="0-0", count=1
+        )
+        claimed = reply[1]
+        if not claimed:
+            return None
+
+        message_id, fields = claimed[0]
+        self.metrics["reclaimed"] += 1
+        # Heartbeats claim with JUSTID, which leaves the count alone, so it counts real deliveries
+        pending = await self.redis.xpending_range(
+            self.stream_key, self.group_name, min=message_id, max=message_id, count=1
+        )
+        deliveries = pending[0]["times_delivered"] if pending else 1
+        return message_id, fields, deliveries
+
+    async def _consume(self, consumer: str) -> None:
+        group_ready = False
+        while True:
+            try:
+                if not group_ready:
+                    await self._ensure_group()
+                    group_ready = True
+
+                message = await self._next_message(consumer)
+                if message:
+                    await self._process(consumer, *message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Redis may be down or the stream deleted; recreate the group once it is back
+                group_ready = False
+                print(f"{self.label} worker {consumer} error: {e}")
+                await asyncio.sleep(1)
+
+    async def start(self, concurrency: int) -> None:
+        """Start `concurrency` consumers in this process."""
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        for _ in range(concurrency):
+            self._workers.append(asyncio.create_task(self._consume(f"{prefix}-{len(self._workers)}")))
+        print(f"Started {concurrency} {self.label.lower()} worker(s)")
+
+    async def stop(self) -> None:
+        """
+        Stop the consumers. Jobs they were running are left unacknowledged and
+        are picked up by another worker after the visibility timeout.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, jobs in progress, delayed retries and failures, plus this process's counters."""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.xlen(self.stream_key)
+                pipe.zcard(self.delayed_key)
+                pipe.xlen(self.failed_key)
+                length, delayed, failed = await pipe.execute()
+            try:
+                pending = (await self.redis.xpending(self.stream_key, self.group_name))["pending"]
+            except ResponseError:
+                pending = 0  # No worker has created the group yet
+        except Exception as e:
+            print(f"Error getting {self.label.lower()} queue stats: {e}")
+            return {"error": str(e), "process": dict(self.metrics)}
+
+        return {
+            "queued": length - pending,
+            "in_progress": pending,
+            "delayed_retries": delayed,
+            "failed": failed,
+            "workers_in_this_process": len(self._workers),
+            "process": dict(self.metrics)
+        }
+
+
+class EvaluationQueue(JobQueue):
+    """Scores stored answers for incremental evaluation."""
+
+    label = "Evaluation"
+    stream_key = EVALUATION_STREAM_KEY
+    group_name = EVALUATION_GROUP_NAME
+    delayed_key = EVALUATION_DELAYED_KEY
+    failed_key = EVALUATION_FAILED_KEY
+
+    def __init__(self):
+        super().__init__(settings.evaluation_job_max_attempts)
+
+    async def enqueue(self, session_id: str, answer_index: int) -> str:
+        """
+        Queue a stored answer for evaluation.
+
+        Args:
+            session_id: Session the answer belongs to
+            answer_index: Index of the answer (and its question)
+
+        Returns:
+            Job ID
+        """
+        return await self._enqueue({"session_id": session_id, "answer_index": answer_index})
+
+    async def run(self, job: Dict[str, Any]) -> None:
+        await evaluate_answer(job["session_id"], job["answer_index"])
+
+    async def give_up(self, job: Dict[str, Any]) -> None:
+        # Stored as failed, so /end scores the answer inline instead of waiting for it
+        await fail_evaluation(job["session_id"], job["answer_index"], "Evaluation job failed")
+
+
+class TranscriptionQueue(JobQueue):
+    """Transcribes uploaded answers, then queues their evaluation."""
+
+    label = "Transcription"
+    stream_key = STREAM_KEY
+    group_name = GROUP_NAME
+    delayed_key = DELAYED_KEY
+    failed_key = FAILED_KEY
+
+    def __init__(self, evaluations: EvaluationQueue):
+        super().__init__(settings.transcription_job_max_attempts)
+        self.evaluations = evaluations
+
+    async def enqueue(self, file_path: str, session_id: str, answer_index: int) -> str:
+        """
+        Queue an uploaded answer for transcription.
+
+        Args:
+            file_path: Path of the saved recording
+            session_id: Session the answer belongs to
+            answer_index: Reserved answer slot
+
+        Returns:
+            Job ID
+        """
+        return await self._enqueue({"file_path": file_path, "session_id": session_id, "answer_index": answer_index})
+
+    async def run(self, job: Dict[str, Any]) -> None:
+        await transcribe_answer(job["file_path"], job["session_id"], job["answer_index"])
+        if not settings.incremental_evaluation_enabled:
+            return
+
+        # Checked on every delivery, so an answer stored by a worker that stopped
+        # before queueing its evaluation is still scored
+        if await cache_manager.needs_evaluation(job["session_id"], job["answer_index"]):
+            await self.evaluations.enqueue(job["session_id"], job["answer_index"])
+
+    async def give_up(self, job: Dict[str, Any]) -> None:
+        # Still mark the answer complete (without text) so evaluation is not blocked
+        await fail_transcription(job["session_id"], job["answer_index"])
+
+    async def active_files(self) -> List[str]:
+        """Recordings of jobs that have not finished: queued, running or waiting for a retry."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xrange(self.stream_key)
+            pipe.zrange(self.delayed_key, 0, -1)
+            messages, delayed = await pipe.execute()
+
+        files = []
+        for raw in [fields.get("job") for _, fields in messages] + delayed:
+            try:
+                files.append(json.loads(raw)["file_path"])
+            except (TypeError, ValueError, KeyError):
+                continue
+        return files
+
+
+# Singleton instances
+evaluation_queue = EvaluationQueue()
+transcription_queue = TranscriptionQueue(evaluation_queue)
@@ -0,0 +1,53 @@
+"""
+Request body size limit for upload endpoints.
+
+Starlette reads and spools the whole multipart body before a handler runs,
+so a handler cannot stop an oversize upload. This ASGI middleware does it
+first: it rejects a declared Content-Length over the limit without reading
+the body, and aborts (chunked or mislabelled) bodies as soon as the bytes
+received pass the limit.
+"""
+
+from typing import Iterable
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Allowance for multipart boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Rejects request bodies larger than max_body_bytes on the given paths with 413."""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], max_body_bytes: int, detail: str):
+        self.app = app
+        self.paths = set(paths)
+        self.max_body_bytes = max_body_bytes
+        self.detail = detail
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            response = JSONResponse({"detail": self.detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing, so this becomes the response
+                    raise HTTPException(status_code=413, detail=self.detail, headers={"Connection": "close"})
+            return message
+
+        await self.app(scope, limited_receive, send)
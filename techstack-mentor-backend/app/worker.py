@@ -0,0 +1,52 @@
+"""
+Dedicated transcription and answer evaluation worker.
+
+Consumes the transcription and evaluation job queues outside the API, so
+their throughput scales independently of API workers:
+
+    python -m app.worker
+
+Run from techstack-mentor-backend/ with the same .env as the API. The worker
+needs access to the recordings directory, and refuses to start unless
+SESSION_EVENTS_BACKEND=redis: otherwise /end requests on API workers would
+never be woken when its answers arrive.
+"""
+
+import asyncio
+import signal
+import sys
+
+from app.config import get_settings
+from app.utils.cache_manager import cache_manager
+from app.utils.audio_preprocessing import audio_preprocessor
+from app.utils.transcription_queue import transcription_queue, evaluation_queue
+
+settings = get_settings()
+
+
+async def main():
+    if settings.session_events_backend != "redis":
+        print("Error: set SESSION_EVENTS_BACKEND=redis to run a dedicated worker, "
+              "so API workers are woken when answers are processed")
+        sys.exit(1)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await transcription_queue.start(settings.transcription_worker_concurrency)
+    if settings.incremental_evaluation_enabled:
+        await evaluation_queue.start(settings.evaluation_worker_concurrency)
+    await stop.wait()
+
+    # Unfinished jobs stay unacknowledged and are taken over by another worker
+    print("Shutting down worker...")
+    await transcription_queue.stop()
+    await evaluation_queue.stop()
+    audio_preprocessor.shutdown()
+    await cache_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
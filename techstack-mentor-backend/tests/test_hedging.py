@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.utils.hedging import HedgeBudget, Hedger
+
+
+def fast_hedger() -> Hedger:
+    hedger = Hedger(True, HedgeBudget(10))
+    hedger.min_samples = 3
+    hedger.min_delay = 0.02
+    return hedger
+
+
+@pytest.mark.asyncio
+async def test_hedge_win_records_primary_latency_as_lower_bound():
+    hedger = fast_hedger()
+    for _ in range(3):
+        await hedger.run("k", lambda: asyncio.sleep(0.01, result="warm"))
+    delay = hedger.delay("k")
+
+    calls = []
+
+    async def call():
+        calls.append(None)
+        await asyncio.sleep(1.0 if len(calls) == 1 else 0.01)
+        return len(calls)
+
+    assert await hedger.run("k", call) == 2
+    assert hedger.metrics["k"]["hedge_wins"] == 1
+
+    # The sample is the primary's elapsed time, not the hedge's own (shorter) latency
+    _, latency, ok = hedger.trackers["k"].samples[-1]
+    assert ok and latency >= delay + 0.01
+
+
+@pytest.mark.asyncio
+async def test_hedge_replacing_failed_primary_records_its_own_latency():
+    hedger = fast_hedger()
+    for _ in range(3):
+        await hedger.run("k", lambda: asyncio.sleep(0.01, result="warm"))
+
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            raise RuntimeError("primary failed")
+        await asyncio.sleep(0.2)
+        return "hedge"
+
+    assert await hedger.run("k", call) == "hedge"
+    _, latency, _ = hedger.trackers["k"].samples[-1]
+    assert 0.2 <= latency < 0.25
@@ -0,0 +1,14 @@
+import pytest
+
+from app.main import app, lifespan, settings
+
+
+@pytest.mark.asyncio
+async def test_several_api_workers_with_local_session_events_refuse_to_start(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 2)
+    monkeypatch.setattr(settings, "session_events_backend", "local")
+    monkeypatch.setattr(settings, "transcription_workers_in_api", 2)
+
+    with pytest.raises(RuntimeError, match="SESSION_EVENTS_BACKEND=redis"):
+        async with lifespan(app):
+            pass
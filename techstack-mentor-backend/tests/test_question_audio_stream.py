@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from fastapi.responses import StreamingResponse
+from starlette.requests import Request
+
+from app.routers import interview
+from app.utils.audio_service import AudioService, settings
+from app.utils.cache_manager import cache_manager
+
+SESSION_ID = "stream-session"
+QUESTIONS = ["What is a closure?", "What is the GIL?"]
+
+
+@pytest.fixture
+def fake_tts(monkeypatch, tmp_path):
+    """Streaming TTS that sends one chunk, then holds the rest until released."""
+    monkeypatch.setattr(settings, "audio_responses_dir", str(tmp_path))
+    state = {"calls": 0, "release": asyncio.Event()}
+
+    async def stream_text_to_speech(text, voice=None):
+        state["calls"] += 1
+        yield b"first"
+        await state["release"].wait()
+        yield b"rest"
+
+    monkeypatch.setattr(AudioService, "stream_text_to_speech", staticmethod(stream_text_to_speech))
+    return state
+
+
+def stream_request() -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [], "query_string": b""})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tts_cache_enabled", [True, False])
+async def test_stream_follows_background_synthesis(fake_redis, fake_tts, monkeypatch, tts_cache_enabled):
+    monkeypatch.setattr(settings, "tts_cache_enabled", tts_cache_enabled)
+    await cache_manager.create_session(SESSION_ID, "user", "python")
+    for question in QUESTIONS:
+        await cache_manager.add_question(SESSION_ID, question)
+
+    background = asyncio.create_task(interview.generate_question_audio_background(SESSION_ID, QUESTIONS))
+    await asyncio.sleep(0)
+
+    response = await asyncio.wait_for(interview.stream_question_audio(SESSION_ID, 2, stream_request()), 1)
+    assert isinstance(response, StreamingResponse)
+
+    # The first chunk arrives while the background synthesis is still running
+    chunks = response.body_iterator
+    assert await asyncio.wait_for(chunks.__anext__(), 1) == b"first"
+    assert not background.done()
+
+    fake_tts["release"].set()
+    assert [chunk async for chunk in chunks] == [b"rest"]
+    await background
+
+    assert fake_tts["calls"] == 1
+    session = await cache_manager.get_session(SESSION_ID)
+    assert session["audio_status"][1] == "ready"
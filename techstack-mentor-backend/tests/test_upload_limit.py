@@ -0,0 +1,45 @@
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+
+settings = get_settings()
+
+ORIGIN = "http://localhost:5173"
+UPLOAD_URL = "/api/interview/audio/upload?session_id=missing"
+
+
+def oversize_body() -> bytes:
+    return b"x" * (settings.max_audio_file_size_mb * 1024 * 1024 + 128 * 1024)
+
+
+def test_oversize_content_length_is_rejected_with_cors_headers():
+    # No lifespan: the size limit answers before the handler (or Redis) is reached
+    client = TestClient(app)
+    response = client.post(
+        UPLOAD_URL,
+        content=oversize_body(),
+        headers={"Origin": ORIGIN, "Content-Type": "multipart/form-data; boundary=x"}
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Audio file too large")
+    assert response.headers["access-control-allow-origin"] in (ORIGIN, "*")
+
+
+def test_oversize_chunked_body_is_rejected_with_cors_headers():
+    client = TestClient(app)
+    body = oversize_body()
+
+    def chunks():
+        for start in range(0, len(body), 64 * 1024):
+            yield body[start:start + 64 * 1024]
+
+    response = client.post(
+        UPLOAD_URL,
+        content=chunks(),
+        headers={"Origin": ORIGIN, "Content-Type": "multipart/form-data; boundary=x"}
+    )
+
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] in (ORIGIN, "*")
@@ -58,6 +58,7 @@ export interface StartInterviewResponse {
 export interface SendMessageRequest {
   session_id: string;
   user_message: string;
+  bypass_cache?: boolean;
 }
 
 export interface SendMessageResponse {
@@ -66,6 +67,7 @@ export interface SendMessageResponse {
   question_number?: number;
   total_questions?: number;
   audio_url?: string;
+  audio_status?: 'ready' | 'pending' | 'failed' | null;
   transcribed_text?: string;
 }
 